@@ -3,11 +3,15 @@ import argparse
 import json
 import logging
 import os
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Iterator, IO, Optional
 import re
 
 import gpxpy
+import numpy as np
 from geopy.distance import geodesic
 
 # Logging konfigurieren
@@ -17,6 +21,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Mittlerer Erdradius (IUGG) für die Haversine-Distanz
+ERDRADIUS_KM = 6371.0088
+
 def lade_gpx_punkte(pfad):
     with open(pfad, 'r', encoding='utf-8') as f:
         gpx = gpxpy.parse(f)
@@ -27,6 +34,41 @@ def lade_gpx_punkte(pfad):
                 punkte.append((p.latitude, p.longitude, p.elevation or 0.0))
     return punkte
 
+def _lokaler_name(tag: str) -> str:
+    """Entfernt den XML-Namespace aus einem Tag-Namen."""
+    return tag.rsplit('}', 1)[-1]
+
+def iter_gpx_punkte(quelle: IO[bytes]) -> Iterator[Tuple[float, float, float]]:
+    """
+    Liest Trackpunkte streamend (iterparse) aus einer GPX-Datei.
+
+    Jeder Trackpunkt wird nach dem Auslesen aus dem Baum entfernt, der
+    Speicherbedarf hängt daher nicht von der Anzahl der Punkte ab.
+
+    Args:
+        quelle: Pfad oder binäres Dateiobjekt (z.B. aus einem Zip-Archiv)
+
+    Yields:
+        Tupel (lat, lon, ele) wie bei lade_gpx_punkte
+    """
+    stapel = []
+    for ereignis, elem in ET.iterparse(quelle, events=('start', 'end')):
+        if ereignis == 'start':
+            stapel.append(elem)
+            continue
+        stapel.pop()
+        if _lokaler_name(elem.tag) != 'trkpt':
+            continue
+        ele = 0.0
+        for kind in elem:
+            if _lokaler_name(kind.tag) == 'ele' and kind.text:
+                ele = float(kind.text)
+                break
+        yield float(elem.get('lat')), float(elem.get('lon')), ele
+        elem.clear()
+        if stapel:
+            stapel[-1].remove(elem)
+
 def extrahiere_trackpunkte(gpx: gpxpy.gpx.GPX) -> List[gpxpy.gpx.GPXTrackPoint]:
     """Extrahiert alle Trackpunkte aus dem GPX-Objekt."""
     trackpunkte = []
@@ -39,29 +81,49 @@ def berechne_distanz(p1, p2):
     # Erwartet Tupel (lat, lon, ele)
     return geodesic((p1[0], p1[1]), (p2[0], p2[1])).kilometers
 
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Haversine-Distanz in km; akzeptiert Skalare oder NumPy-Arrays (Broadcasting)."""
+    lat1, lon1, lat2, lon2 = (np.radians(x) for x in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * ERDRADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
 def finde_hochpunkte_und_zwischenpunkte(punkte, min_abstand_start=1.0, min_abstand_ziel=1.0, min_abstand_punkte=5.0, max_luecke=8.0):
     if len(punkte) < 2:
         return punkte
     start = punkte[0]
     ziel = punkte[-1]
     result = [start]
+    koordinaten = np.asarray([(p[0], p[1], p[2]) for p in punkte], dtype=float)
+    lat, lon, ele = koordinaten[:, 0], koordinaten[:, 1], koordinaten[:, 2]
     # Hochpunkte: nach Höhe sortiert, mind. 1km nach Start und vor Ziel
-    zwischenkandidaten = [p for p in punkte[1:-1]
-                         if berechne_distanz(start, p) >= min_abstand_start and berechne_distanz(p, ziel) >= min_abstand_ziel]
-    hochpunkte = sorted(zwischenkandidaten, key=lambda p: p[2], reverse=True)
-    # Füge Hochpunkte ein, wenn sie mind. min_abstand_punkte voneinander entfernt sind
+    innen = np.arange(1, len(punkte) - 1)
+    zwischenkandidaten = innen[
+        (haversine_km(lat[0], lon[0], lat[innen], lon[innen]) >= min_abstand_start)
+        & (haversine_km(lat[innen], lon[innen], lat[-1], lon[-1]) >= min_abstand_ziel)
+    ]
+    # Stabil sortieren: bei gleicher Höhe bleibt die Routenreihenfolge erhalten
+    hochpunkte = zwischenkandidaten[np.argsort(-ele[zwischenkandidaten], kind='stable')]
+    # Füge Hochpunkte ein, wenn sie mind. min_abstand_punkte voneinander entfernt sind:
+    # jeder ausgewählte Punkt sperrt alle Kandidaten in seinem Umkreis
+    hp_lat, hp_lon = lat[hochpunkte], lon[hochpunkte]
+    frei = np.ones(len(hochpunkte), dtype=bool)
     ausgewaehlt = []
-    for hp in hochpunkte:
-        if all(berechne_distanz(hp, p) >= min_abstand_punkte for p in ausgewaehlt):
-            ausgewaehlt.append(hp)
+    pos = 0
+    while True:
+        naechster = np.flatnonzero(frei[pos:])
+        if len(naechster) == 0:
+            break
+        pos += int(naechster[0])
+        ausgewaehlt.append(int(hochpunkte[pos]))
+        frei &= haversine_km(hp_lat[pos], hp_lon[pos], hp_lat, hp_lon) >= min_abstand_punkte
+        pos += 1
     # Sortiere nach Reihenfolge auf der Route
-    ausgewaehlt = sorted(ausgewaehlt, key=lambda p: punkte.index(p))
-    result.extend(ausgewaehlt)
+    result.extend(punkte[i] for i in sorted(ausgewaehlt))
     # Prüfe auf große Lücken (>max_luecke km) und füge ggf. Mittelpunkt ein
     alle_punkte = result + [ziel]
     final = [alle_punkte[0]]
     for i in range(1, len(alle_punkte)):
-        dist = berechne_distanz(alle_punkte[i-1], alle_punkte[i])
+        dist = float(haversine_km(alle_punkte[i-1][0], alle_punkte[i-1][1], alle_punkte[i][0], alle_punkte[i][1]))
         if dist > max_luecke:
             # Füge Mittelpunkt ein
             mid_lat = (alle_punkte[i-1][0] + alle_punkte[i][0]) / 2
@@ -79,30 +141,66 @@ def finde_hochpunkte_und_zwischenpunkte(punkte, min_abstand_start=1.0, min_absta
             seen.add(key)
     return unique
 
-def konvertiere_gpx_zu_json(input_dir, output_file):
-    gpx_files = [f for f in os.listdir(input_dir) if f.lower().endswith('.gpx')]
-    gpx_files.sort(key=extrahiere_etappennummer)
-    print(f"Found GPX files: {gpx_files}")
+def verarbeite_gpx_datei(quelle: Tuple[Optional[str], str]) -> Tuple[Dict[str, Any], int]:
+    """
+    Erzeugt den Etappen-Eintrag für eine GPX-Datei (Worker-Funktion).
+
+    Args:
+        quelle: (zip_pfad, name) für einen Eintrag eines Zip-Archivs oder
+            (None, pfad) für eine einzelne Datei
+
+    Returns:
+        Tupel (Etappen-Eintrag, Anzahl gelesener Punkte)
+    """
+    zip_pfad, name = quelle
+    if zip_pfad:
+        with zipfile.ZipFile(zip_pfad) as archiv, archiv.open(name) as f:
+            punkte = list(iter_gpx_punkte(f))
+    else:
+        punkte = list(iter_gpx_punkte(name))
+    punkte_auswahl = finde_hochpunkte_und_zwischenpunkte(punkte)
+    etappe = {
+        "name": extrahiere_stage_name(os.path.basename(name)),
+        "punkte": [{"lat": p[0], "lon": p[1]} for p in punkte_auswahl]
+    }
+    return etappe, len(punkte)
+
+def finde_gpx_im_zip(zip_pfad: str) -> List[str]:
+    """Listet die GPX-Dateien eines Zip-Archivs (ohne macOS-Metadaten), nach Etappe sortiert."""
+    with zipfile.ZipFile(zip_pfad) as archiv:
+        namen = [n for n in archiv.namelist()
+                 if n.lower().endswith('.gpx')
+                 and not n.startswith('__MACOSX/')
+                 and not os.path.basename(n).startswith('._')]
+    return sorted(namen, key=lambda n: extrahiere_etappennummer(os.path.basename(n)))
+
+def _konvertiere_parallel(quellen: List[Tuple[Optional[str], str]], output_file: str,
+                          workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Verarbeitet alle GPX-Quellen in Worker-Prozessen und speichert etappen.json."""
+    print(f"Found GPX files: {[os.path.basename(name) for _, name in quellen]}")
     etappen = []
-    for fname in gpx_files:
-        pfad = os.path.join(input_dir, fname)
-        print(f"Processing: {fname}")
-        punkte = lade_gpx_punkte(pfad)
-        print(f"  Loaded {len(punkte)} points")
-        punkte_auswahl = finde_hochpunkte_und_zwischenpunkte(punkte)
-        print(f"  Selected {len(punkte_auswahl)} points")
-        
-        # Extract stage name from filename
-        stage_name = extrahiere_stage_name(fname)
-        print(f"  Stage name: {stage_name}")
-        
-        etappen.append({
-            "name": stage_name,
-            "punkte": [{"lat": p[0], "lon": p[1]} for p in punkte_auswahl]
-        })
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for (_, name), (etappe, anzahl) in zip(quellen, executor.map(verarbeite_gpx_datei, quellen)):
+            print(f"Processed: {os.path.basename(name)}")
+            print(f"  Loaded {anzahl} points")
+            print(f"  Selected {len(etappe['punkte'])} points")
+            print(f"  Stage name: {etappe['name']}")
+            etappen.append(etappe)
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(etappen, f, indent=2, ensure_ascii=False)
     print(f"Etappen erfolgreich gespeichert in {output_file}")
+    return etappen
+
+def konvertiere_gpx_zu_json(input_dir, output_file, workers=None):
+    gpx_files = [f for f in os.listdir(input_dir) if f.lower().endswith('.gpx')]
+    gpx_files.sort(key=extrahiere_etappennummer)
+    quellen = [(None, os.path.join(input_dir, fname)) for fname in gpx_files]
+    return _konvertiere_parallel(quellen, output_file, workers)
+
+def konvertiere_zip_zu_json(zip_pfad, output_file, workers=None):
+    """Konvertiert alle GPX-Dateien eines Zip-Archivs ohne vorheriges Entpacken."""
+    quellen = [(zip_pfad, name) for name in finde_gpx_im_zip(zip_pfad)]
+    return _konvertiere_parallel(quellen, output_file, workers)
 
 def get_gpx_startzeit(gpx: gpxpy.gpx.GPX) -> str:
     """Extrahiert die Startzeit aus einer GPX-Datei."""
@@ -139,10 +237,16 @@ def extrahiere_stage_name(dateiname: str) -> str:
 
 def main():
     parser = argparse.ArgumentParser(description="Konvertiert GPX-Etappen zu etappen.json mit Start, Hochpunkten/Zwischenpunkten und Ziel.")
-    parser.add_argument('--input-dir', required=True, help='Verzeichnis mit GPX-Dateien')
+    quelle = parser.add_mutually_exclusive_group(required=True)
+    quelle.add_argument('--input-dir', help='Verzeichnis mit GPX-Dateien')
+    quelle.add_argument('--input-zip', help='Zip-Archiv mit GPX-Dateien (wird nicht entpackt)')
     parser.add_argument('--output', default='etappen.json', help='Ziel-Datei')
+    parser.add_argument('--workers', type=int, default=None, help='Anzahl Worker-Prozesse (Standard: CPU-Anzahl)')
     args = parser.parse_args()
-    konvertiere_gpx_zu_json(args.input_dir, args.output)
+    if args.input_zip:
+        konvertiere_zip_zu_json(args.input_zip, args.output, args.workers)
+    else:
+        konvertiere_gpx_zu_json(args.input_dir, args.output, args.workers)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
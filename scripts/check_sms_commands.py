@@ -3,10 +3,12 @@
 SMS Command Checker.
 
 This script polls for incoming SMS messages and processes configuration commands.
-It can be run manually or as a scheduled task (cron job).
+It can be run manually or as a scheduled task (cron job), or with --watch as a
+long-running poller with an adaptive interval.
 """
 
 import argparse
+import asyncio
 import logging
 import sys
 import os
@@ -96,6 +98,12 @@ def main():
                        help="Logging level (default: INFO)")
     parser.add_argument("--cleanup", action="store_true",
                        help="Clean up old processed messages")
+    parser.add_argument("--watch", action="store_true",
+                       help="Keep polling with an adaptive interval until interrupted")
+    parser.add_argument("--min-interval", type=float, default=5,
+                       help="Shortest poll interval in seconds for --watch (default: 5)")
+    parser.add_argument("--max-interval", type=float, default=300,
+                       help="Longest poll interval in seconds for --watch (default: 300)")
     
     args = parser.parse_args()
     
@@ -128,6 +136,10 @@ def main():
             logger.info("Cleaning up old processed messages...")
             client.cleanup_old_messages()
         
+        if args.watch:
+            asyncio.run(client.run_forever(min_interval=args.min_interval, max_interval=args.max_interval))
+            return
+        
         # Poll for incoming SMS
         logger.info("Polling for incoming SMS messages...")
         result = client.poll_incoming_sms()
@@ -20,6 +20,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 from logic.report_scheduler import ReportScheduler, get_nearest_stage_location, should_send_dynamic_report
 from notification.email_client import EmailClient
 from notification.modular_sms_client import ModularSmsClient
+from notification.gsm7_validator import GSM7Validator, SEGMENT_SEPTETS
+from notification.outbox import SENT, PENDING, Outbox, OutboxDispatcher, report_id
 from logic.analyse_weather import analyze_weather_data, compute_risk
 from wetter.fetch_meteofrance import get_forecast, get_thunderstorm, get_alerts, ForecastResult, get_tomorrow_forecast
 # REMOVED: Open-Meteo imports - api_usage_policy.mdc requires MeteoFrance-only usage
@@ -27,7 +29,7 @@ from wetter.fetch_meteofrance import get_forecast, get_thunderstorm, get_alerts,
 from wetter.weather_data_processor import process_stage_weather_data
 from position.etappenlogik import get_stage_info, get_stage_coordinates, get_next_stage, get_day_after_tomorrow_stage
 from utils.env_loader import get_env_var
-from config.config_loader import load_config as load_config_with_env
+from config.config_loader import load_config as load_config_with_env, load_config_cached
 from model.datatypes import WeatherData, WeatherPoint
 
 
@@ -407,14 +409,118 @@ def convert_tomorrow_openmeteo_to_weather_data(openmeteo_dict: dict) -> WeatherD
     return WeatherData(points=weather_points)
 
 
+def send_report(config: dict, report_data: dict, email_client: EmailClient,
+                sms_client: Optional[ModularSmsClient]) -> Tuple[bool, bool]:
+    """
+    Queue a report in the notification outbox and deliver it.
+
+    Messages that cannot be delivered within outbox.drain_timeout_seconds stay
+    queued and are retried with backoff by the next run; messages left over
+    from earlier runs are delivered as well. A report still queued by an earlier
+    run (e.g. one that crashed) is not sent twice; a re-run of a report that
+    was already delivered sends it again.
+
+    Returns:
+        (email, sms): True if the message was delivered or is queued for retry
+    """
+    outbox = Outbox.from_config(config)
+    senders = {"email": email_client.send_gr20_report}
+    if sms_client:
+        senders["sms"] = sms_client.send_gr20_report
+
+    # The SMS carries its recipients, so a retry only goes to the numbers that were not reached
+    message_id = report_id(report_data)
+    outbox.enqueue(message_id, "email", report_data)
+    if sms_client:
+        outbox.enqueue(message_id, "sms", dict(report_data, recipients=sms_client.recipients))
+
+    dispatcher = OutboxDispatcher(outbox, senders)
+    dispatcher.start()
+    try:
+        dispatcher.drain(config.get("outbox", {}).get("drain_timeout_seconds", 120))
+    finally:
+        dispatcher.stop()
+
+    return tuple(channel in senders and outbox.status(message_id, channel) in (SENT, PENDING)
+                 for channel in ("email", "sms"))
+
+
+def run_fire_risk_check(config: dict, stage_name: str, email_client: EmailClient,
+                        sms_client: Optional[ModularSmsClient]) -> bool:
+    """
+    Send a dynamic report if the fire risk dataset changed significantly.
+
+    Only the daily fire risk dataset is polled; no weather data is fetched.
+
+    Returns:
+        True if a report was sent, False otherwise
+    """
+    from fire.fire_risk_watcher import FireRiskWatcher, format_fire_risk_changes
+    from logic.dynamic_report_comparator import DynamicReportComparator
+
+    changes = FireRiskWatcher(config).poll()
+    if not changes:
+        print("Fire risk dataset unchanged")
+        return False
+
+    comparator = DynamicReportComparator(config)
+    should_send, change_details = comparator.compare_fire_risk([change.to_dict() for change in changes])
+    comparator.save_comparison_result(stage_name, datetime.now().date(), should_send, change_details)
+    if not should_send:
+        print("Fire risk changes below thresholds - no report")
+        return False
+
+    fire_changes = change_details["risk_zonal"]["fire_changes"]
+    result_output = f"{stage_name[:10]} - {format_fire_risk_changes(fire_changes, config)}"
+    result_output = GSM7Validator().truncate_to_septets(result_output, SEGMENT_SEPTETS, "...")
+    print(f"Fire risk report: {result_output}")
+
+    report_data = {
+        "location": stage_name,
+        "report_time": datetime.now(),
+        "report_type": "dynamic",
+        "result_output": result_output,
+        "debug_output": ""
+    }
+    return any(send_report(config, report_data, email_client, sms_client))
+
+
+def run_route_reports(config: dict, report_type: str) -> int:
+    """
+    Generate and send the report of today's stage of every configured route.
+
+    All routes are generated in one run and share the forecast client, the
+    fire risk dataset and grid-deduplicated forecast fetches. Each report is
+    sent with the recipients of its own route.
+
+    Returns:
+        Number of reports queued for delivery
+    """
+    from logic.report_daemon import ReportDaemon
+
+    daemon = ReportDaemon(config)
+    queued = daemon.run_reports(report_type)
+    daemon.deliver_queued()
+    return queued
+
+
 def main():
     """Main function for GR20 weather monitor."""
     parser = argparse.ArgumentParser(description="GR20 Weather Report Monitor")
-    parser.add_argument("--modus", choices=["morning", "evening", "dynamic"], 
-                       help="Manual mode selection (overrides automatic scheduling)")
+    parser.add_argument("--modus", choices=["morning", "evening", "dynamic", "fire"], 
+                       help="Manual mode selection (overrides automatic scheduling); "
+                            "'fire' only checks the fire risk dataset for changes")
     parser.add_argument("--sms", choices=["test", "production"], 
                        help="Override SMS mode (test/production) from config.yaml")
+    parser.add_argument("--routes", action="store_true",
+                       help="Generate the report of every route in the 'routes' section of config.yaml "
+                            "(requires --modus morning, evening or dynamic)")
+    parser.add_argument("--daemon", action="store_true",
+                       help="Run as long-running daemon that triggers all reports internally "
+                            "(stops gracefully on SIGTERM)")
     args = parser.parse_args()
+    if args.routes and args.modus not in ("morning", "evening", "dynamic"):
+        parser.error("--routes requires --modus morning, evening or dynamic")
     
     print("Starting GR20 Weather Report Monitor...")
     
@@ -429,6 +535,25 @@ def main():
             config["sms"]["mode"] = args.sms
             print(f"SMS mode overridden: {original_mode} -> {args.sms}")
         
+        if args.daemon:
+            import asyncio
+            from logic.report_daemon import ReportDaemon
+
+            def current_config() -> dict:
+                # Re-read only when config.yaml changed (e.g. by an SMS config command)
+                current = load_config_cached()
+                if args.sms and "sms" in current:
+                    current["sms"]["mode"] = args.sms
+                return current
+
+            asyncio.run(ReportDaemon(config, config_source=current_config).run())
+            return
+        
+        if args.routes:
+            sent = run_route_reports(config, args.modus)
+            print(f"Route reports queued: {sent}")
+            return
+        
         # Initialize components
         # Note: State file is hardcoded here, not using config["state_file"]
         # The config entry "state_file" is deprecated and not used in production
@@ -462,16 +587,14 @@ def main():
                 "report_type": "no_stages"
             }
             
-            # Send email notification
-            email_success = email_client.send_gr20_report(report_data)
+            # Send email and SMS notification (SMS only if available)
+            email_success, sms_success = send_report(config, report_data, email_client, sms_client)
             if email_success:
                 print("Email notification sent: No stages available")
             else:
                 print("Failed to send email notification")
             
-            # Send SMS notification if available
             if sms_client:
-                sms_success = sms_client.send_gr20_report(report_data)
                 if sms_success:
                     print("SMS notification sent: No stages available")
                 else:
@@ -486,6 +609,10 @@ def main():
         location_name = stage_info["name"] if stage_info else "Unbekannt"
         print(f"Current stage: {location_name}")
         
+        if args.modus == "fire":
+            run_fire_risk_check(config, location_name, email_client, sms_client)
+            return
+        
         # Use new MorningEveningRefactor for weather data
         from weather.core.morning_evening_refactor import MorningEveningRefactor
         weather_processor = MorningEveningRefactor(config)
@@ -789,21 +916,16 @@ def main():
                 if day_after_tomorrow_thunderstorm_analysis:
                     report_data["weather_data"]["day_after_tomorrow_thunderstorm_probability"] = day_after_tomorrow_thunderstorm_analysis.max_thunderstorm_probability or 0
             
-            # Send email report
-            print("Sending email weather report...")
-            email_success = email_client.send_gr20_report(report_data)
+            # Send email and SMS report (SMS only if available)
+            print("Sending weather report...")
+            email_success, sms_success = send_report(config, report_data, email_client, sms_client)
             
             if email_success:
                 print("Email weather report sent successfully")
             else:
                 print("Failed to send email weather report")
             
-            # Send SMS report if available
-            sms_success = False
             if sms_client:
-                print("Sending SMS weather report...")
-                sms_success = sms_client.send_gr20_report(report_data)
-                
                 if sms_success:
                     print("SMS weather report sent successfully")
                 else:
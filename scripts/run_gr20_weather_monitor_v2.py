@@ -105,7 +105,7 @@ def send_sms_report(config: dict, report_type: str, stage_name: str, result_outp
         sms_content = f"GR20 {report_type.capitalize()}: {result_output}"
         
         # Send SMS
-        success = sms_client.send_sms(sms_content, recipient_phone)
+        success = sms_client.send_sms(sms_content, recipients=[recipient_phone])
         
         if success:
             print(f"✅ SMS sent successfully")
@@ -1,53 +1,84 @@
+#!/usr/bin/env python3
+"""
+Send evening reports for all stages.
+
+Generates the evening report of every stage for one date in parallel (as if
+each stage were today's stage) and sends them by email. config.yaml is not
+modified: each stage is generated against its own in-memory config copy.
+With --digest all reports are sent as one digest mail (split by size if needed).
+"""
+
 import sys
 import os
-import yaml
-import json
-from datetime import date, timedelta
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.report.weather_report_generator import generate_weather_report
-from src.config.config_loader import load_config
-from src.config.config_preserver import update_yaml_preserving_comments
-from src.notification.email_client import EmailClient
-from src.position.etappenlogik import get_current_stage
-
-ETAPPEN_PATH = os.path.join(os.path.dirname(__file__), '../etappen.json')
-CONFIG_PATH = os.path.join(os.path.dirname(__file__), '../config.yaml')
-
-# Load all stages
-with open(ETAPPEN_PATH, 'r', encoding='utf-8') as f:
-    etappen = json.load(f)
-
-# Load config
-with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-    config = yaml.safe_load(f)
-
-# Save original start date
-original_start = config.get('startdatum')
-
-# Prepare email client
-email_client = EmailClient(config)
-
-for idx, stage in enumerate(etappen):
-    # Set start date so that this stage is 'today'
-    today = date.today()
-    stage_start = today - timedelta(days=idx)
-    # Update config using comment-preserving function
-    update_yaml_preserving_comments(CONFIG_PATH, 'startdatum', stage_start.strftime('%Y-%m-%d'))
-    # Reload config and get current stage name
-    config_reload = load_config()
-    current_stage = get_current_stage(config_reload, ETAPPEN_PATH)
-    stage_name = current_stage['name'] if current_stage else 'Unknown'
-    print(f"[DEBUG] Processing stage {idx+1}: {stage_name} (startdatum={stage_start.strftime('%Y-%m-%d')})")
-    # Generate and send evening report
-    result = generate_weather_report('evening')
-    if result['success']:
-        print(f"[OK] Sent evening report for stage {stage_name} ({stage_start})")
-        email_client.send_gr20_report(result)
-    else:
-        print(f"[FAIL] Could not generate report for stage {stage_name}: {result.get('error')}")
-
-# Restore original config
-if original_start:
-    update_yaml_preserving_comments(CONFIG_PATH, 'startdatum', original_start)
-print("All evening reports sent.") 
\ No newline at end of file
+import argparse
+from datetime import date, datetime
+from pathlib import Path
+
+# Add src to path for imports
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from config.config_loader import load_config
+from notification.email_client import EmailClient
+from report.batch_report_generator import generate_all_stage_reports
+
+
+def _report_data(report) -> dict:
+    return {
+        'location': report.stage_name,
+        'report_type': 'evening',
+        'report_time': datetime.now(),
+        'result_output': report.result_output,
+        'debug_output': report.debug_output,
+        'debug_report': report.debug_report,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Send evening reports for all stages")
+    parser.add_argument("--date", help="Report date (YYYY-MM-DD, default: today)")
+    parser.add_argument("--workers", type=int, default=4, help="Number of stages generated in parallel")
+    parser.add_argument("--digest", action="store_true", help="Send one digest mail instead of one mail per stage")
+    args = parser.parse_args()
+
+    # Reports read etappen.json relative to the working directory
+    os.chdir(ROOT_DIR)
+    report_date = datetime.strptime(args.date, "%Y-%m-%d").date() if args.date else date.today()
+
+    config = load_config()
+    email_client = EmailClient(config)
+    reports = generate_all_stage_reports(config, 'evening', report_date, max_workers=args.workers)
+
+    failed = 0
+    if args.digest:
+        for report in reports:
+            if not report.success:
+                failed += 1
+                print(f"[FAIL] Could not generate report for stage {report.stage_name}: {report.error}")
+        results = email_client.send_digest(_report_data(report) for report in reports if report.success)
+        if not all(results):
+            print(f"[FAIL] {results.count(False)}/{len(results)} digest mails could not be sent")
+            return 1
+        print(f"Evening digest sent ({len(reports) - failed}/{len(reports)} stages in {len(results)} mails).")
+        return 1 if failed else 0
+
+    # All mails share one SMTP connection (one TLS handshake and login)
+    with email_client.batch():
+        for report in reports:
+            if not report.success:
+                failed += 1
+                print(f"[FAIL] Could not generate report for stage {report.stage_name}: {report.error}")
+                continue
+            sent = email_client.send_gr20_report(_report_data(report))
+            if sent:
+                print(f"[OK] Sent evening report for stage {report.stage_offset + 1}: {report.stage_name}")
+            else:
+                failed += 1
+                print(f"[FAIL] Could not send report for stage {report.stage_name}")
+
+    print(f"All evening reports processed ({len(reports) - failed}/{len(reports)} sent).")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
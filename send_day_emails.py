@@ -1,139 +1,118 @@
 #!/usr/bin/env python3
 """
 Send real emails for Day function testing using the existing run.py output
+
+With --digest both reports are sent as one digest mail.
 """
 
 import sys
 import os
+import argparse
 import subprocess
+from datetime import datetime
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.notification.email_client import EmailClient
 import yaml
 
-def send_day_emails():
+# (run.py modus, report type, label)
+REPORTS = [
+    ('morgen', 'morning', 'MORNING'),
+    ('abend', 'evening', 'EVENING'),
+]
+
+
+def _run_report(modus):
+    """Run run.py and extract (result_output, debug_output) from its output."""
+    result = subprocess.run(['python3', 'run.py', '--modus', modus],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+
+    result_output = ""
+    debug_output = ""
+    in_result = False
+    in_debug = False
+
+    for line in result.stdout.split('\n'):
+        if "📋 RESULT OUTPUT:" in line:
+            in_result = True
+            continue
+        elif "📋 DEBUG OUTPUT:" in line:
+            in_result = False
+            in_debug = True
+            continue
+        elif in_result and line.strip():
+            result_output = line.strip()
+            in_result = False
+        elif in_debug and line.strip():
+            if line.strip() == "# DEBUG DATENEXPORT":
+                debug_output += line + "\n"
+            elif line.strip() == "Debug output temporarily disabled due to comparison errors":
+                debug_output += line + "\n"
+
+    return result_output, debug_output
+
+
+def send_day_emails(digest=False):
     """Send real emails for Day function testing"""
-    
+
     print("🌞 DAY FUNCTION - SENDING REAL EMAILS")
     print("=" * 50)
-    
+
     # Load config
     with open("config.yaml", "r") as f:
         config = yaml.safe_load(f)
-    
+
     # Initialize email client
     email_client = EmailClient(config)
-    
-    # Test MORNING report
-    print("🔍 Testing MORNING report...")
-    try:
-        # Run the morning report
-        result = subprocess.run(['python3', 'run.py', '--modus', 'morgen'], 
-                              capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            # Extract result output from the output
-            output_lines = result.stdout.split('\n')
-            result_output = ""
-            debug_output = ""
-            in_result = False
-            in_debug = False
-            
-            for line in output_lines:
-                if "📋 RESULT OUTPUT:" in line:
-                    in_result = True
-                    continue
-                elif "📋 DEBUG OUTPUT:" in line:
-                    in_result = False
-                    in_debug = True
-                    continue
-                elif in_result and line.strip():
-                    result_output = line.strip()
-                    in_result = False
-                elif in_debug and line.strip():
-                    if line.strip() == "# DEBUG DATENEXPORT":
-                        debug_output += line + "\n"
-                    elif line.strip() == "Debug output temporarily disabled due to comparison errors":
-                        debug_output += line + "\n"
-            
-            # Create email content
-            email_content = f"""{result_output}
 
-{debug_output}"""
-            
-            # Send real email
-            print("📧 Sending morning report email...")
-            email_client.send_email(
-                subject="🌞 Day Function Test - Morning Report",
-                body=email_content,
-                to_email=config.get('email', {}).get('to_email', 'test@example.com')
-            )
-            print("✅ MORNING email sent successfully!")
-            print(f"📧 Email content: {result_output}")
-            
+    digest_reports = []
+    for modus, report_type, label in REPORTS:
+        print(f"🔍 Testing {label} report...")
+        try:
+            result_output, debug_output = _run_report(modus)
+        except Exception as e:
+            print(f"❌ {label} report failed: {e}")
+            print()
+            continue
+
+        if digest:
+            digest_reports.append({
+                'location': f"Day Function Test - {label.capitalize()}",
+                'report_type': report_type,
+                'report_time': datetime.now(),
+                'result_output': result_output,
+                'debug_output': debug_output,
+            })
+            print(f"📋 {label} report added to digest")
         else:
-            print(f"❌ MORNING report failed: {result.stderr}")
-            
-    except Exception as e:
-        print(f"❌ MORNING report failed: {e}")
-    
-    print()
-    
-    # Test EVENING report
-    print("🔍 Testing EVENING report...")
-    try:
-        # Run the evening report
-        result = subprocess.run(['python3', 'run.py', '--modus', 'abend'], 
-                              capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            # Extract result output from the output
-            output_lines = result.stdout.split('\n')
-            result_output = ""
-            debug_output = ""
-            in_result = False
-            in_debug = False
-            
-            for line in output_lines:
-                if "📋 RESULT OUTPUT:" in line:
-                    in_result = True
-                    continue
-                elif "📋 DEBUG OUTPUT:" in line:
-                    in_result = False
-                    in_debug = True
-                    continue
-                elif in_result and line.strip():
-                    result_output = line.strip()
-                    in_result = False
-                elif in_debug and line.strip():
-                    if line.strip() == "# DEBUG DATENEXPORT":
-                        debug_output += line + "\n"
-                    elif line.strip() == "Debug output temporarily disabled due to comparison errors":
-                        debug_output += line + "\n"
-            
             # Create email content
             email_content = f"""{result_output}
 
 {debug_output}"""
-            
+
             # Send real email
-            print("📧 Sending evening report email...")
-            email_client.send_email(
-                subject="🌞 Day Function Test - Evening Report",
-                body=email_content,
-                to_email=config.get('email', {}).get('to_email', 'test@example.com')
-            )
-            print("✅ EVENING email sent successfully!")
-            print(f"📧 Email content: {result_output}")
-            
+            print(f"📧 Sending {report_type} report email...")
+            if email_client.send_email(email_content, f"🌞 Day Function Test - {label.capitalize()} Report"):
+                print(f"✅ {label} email sent successfully!")
+                print(f"📧 Email content: {result_output}")
+            else:
+                print(f"❌ {label} email could not be sent")
+        print()
+
+    if digest and digest_reports:
+        print("📧 Sending digest email...")
+        results = email_client.send_digest(digest_reports)
+        if all(results):
+            print(f"✅ Digest sent successfully ({len(results)} mails)!")
         else:
-            print(f"❌ EVENING report failed: {result.stderr}")
-            
-    except Exception as e:
-        print(f"❌ EVENING report failed: {e}")
-    
-    print()
+            print(f"❌ {results.count(False)}/{len(results)} digest mails could not be sent")
+        print()
+
     print("🎯 Both emails sent!")
 
 if __name__ == "__main__":
-    send_day_emails() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Send real emails for Day function testing")
+    parser.add_argument("--digest", action="store_true", help="Send both reports as one digest mail")
+    send_day_emails(digest=parser.parse_args().digest)
@@ -1,4 +1,6 @@
+import copy
 import os
+import threading
 import yaml
 import re
 try:
@@ -143,4 +145,54 @@ def load_config(path: str = "config.yaml") -> dict:
         else:
             sms_config["to"] = sms_config["production_number"]
 
-    return config
\ No newline at end of file
+    return config
+
+
+# Parsed configurations by absolute path with the (mtime_ns, size, inode) they were read at
+_config_cache = {}
+_config_cache_lock = threading.Lock()
+
+
+def _file_signature(path: str):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def load_config_cached(path: str = "config.yaml") -> dict:
+    """
+    Load configuration like load_config, reusing the parsed result while the file is unchanged.
+    
+    Config writes replace the file by rename, so a change made by another
+    process (e.g. an SMS command) is detected by the new inode/mtime and
+    the file is read again.
+    
+    Args:
+        path: Path to configuration file
+        
+    Returns:
+        Copy of the configuration dictionary
+    """
+    if not os.path.exists(path):
+        return load_config(path)
+    key = os.path.abspath(path)
+    signature = _file_signature(path)
+    with _config_cache_lock:
+        cached = _config_cache.get(key)
+        if cached is None or cached[0] != signature:
+            cached = (signature, load_config(path))
+            _config_cache[key] = cached
+        return copy.deepcopy(cached[1])
+
+
+def invalidate_config_cache(path: str = None) -> None:
+    """
+    Drop cached configurations so the next load_config_cached reads the file.
+    
+    Args:
+        path: Configuration file to drop (all files if None)
+    """
+    with _config_cache_lock:
+        if path is None:
+            _config_cache.clear()
+        else:
+            _config_cache.pop(os.path.abspath(path), None)
@@ -5,58 +5,73 @@ This module provides utilities to update YAML configuration files
 while preserving comments, formatting, and structure using ruamel.yaml.
 """
 
+import io
 import os
 from typing import Any, Dict
 from ruamel.yaml import YAML
 
-def update_yaml_preserving_comments(file_path: str, key: str, value: Any) -> bool:
+try:
+    from utils.file_lock import atomic_write_text, file_lock
+except ImportError:
+    from ..utils.file_lock import atomic_write_text, file_lock
+
+
+def update_yaml_keys_preserving_comments(file_path: str, updates: Dict[str, Any]) -> bool:
     """
-    Update a specific key in a YAML file while preserving comments and formatting using ruamel.yaml.
+    Apply several key updates to a YAML file in one atomic write.
+    
+    The file is read, changed and written under the lock "<file>.lock";
+    the new content replaces the file in a single rename, so concurrent
+    readers see either the old or the new configuration, never a mix.
     
     Args:
         file_path: Path to the YAML file
-        key: The configuration key to update (dot notation for nested keys)
-        value: The new value to set
+        updates: New values by configuration key (dot notation for nested keys)
         
     Returns:
-        True if update was successful, False otherwise
+        True if all updates were written, False otherwise (file unchanged)
     """
+    if not updates:
+        return True
     yaml = YAML()
     yaml.preserve_quotes = True
     try:
-        # Read the file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = yaml.load(f)
-        
-        # Create a backup of the original file
-        backup_path = f"{file_path}.backup"
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f)
-        
-        # Navigate to the nested key and update
-        keys = key.split('.')
-        current = data
-        for k in keys[:-1]:
-            if k not in current or current[k] is None:
-                current[k] = {}
-            current = current[k]
-        current[keys[-1]] = value
-        
-        # Write back to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f)
-        
-        # Remove backup file on success
-        try:
-            os.remove(backup_path)
-        except OSError:
-            pass  # Ignore if backup removal fails
-        
+        with file_lock(f"{file_path}.lock"):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = yaml.load(f)
+            
+            for key, value in updates.items():
+                keys = key.split('.')
+                current = data
+                for k in keys[:-1]:
+                    if k not in current or current[k] is None:
+                        current[k] = {}
+                    current = current[k]
+                current[keys[-1]] = value
+            
+            buffer = io.StringIO()
+            yaml.dump(data, buffer)
+            atomic_write_text(file_path, buffer.getvalue())
         return True
     except Exception as e:
         print(f"Failed to update configuration file: {e}")
         return False
 
+
+def update_yaml_preserving_comments(file_path: str, key: str, value: Any) -> bool:
+    """
+    Update a specific key in a YAML file while preserving comments and formatting using ruamel.yaml.
+    
+    Args:
+        file_path: Path to the YAML file
+        key: The configuration key to update (dot notation for nested keys)
+        value: The new value to set
+        
+    Returns:
+        True if update was successful, False otherwise
+    """
+    return update_yaml_keys_preserving_comments(file_path, {key: value})
+
 def safe_yaml_dump(data: Dict[str, Any], file_path: str) -> bool:
     """
     Safely dump YAML data to a file, creating a backup first, using ruamel.yaml.
@@ -9,10 +9,13 @@ whitelist of allowed keys and value types.
 import yaml
 import logging
 import re
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, Iterator, List, Tuple, Optional
 import os # Added for backup file handling
 
+from .config_loader import invalidate_config_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +26,9 @@ class SMSConfigProcessor:
     This class handles incoming SMS commands in the format "### <key>: <value>"
     and updates the corresponding values in config.yaml if they are in the
     whitelist and pass type validation.
+    
+    Within transaction() the validated updates of all commands are queued
+    and written to config.yaml once, atomically, when the block ends.
     """
     
     def __init__(self, config_file_path: str = "config.yaml"):
@@ -33,6 +39,7 @@ class SMSConfigProcessor:
             config_file_path: Path to the configuration file to update
         """
         self.config_file_path = config_file_path
+        self._pending: Optional[Dict[str, Any]] = None
         
         # Whitelist of allowed configuration keys
         self.whitelist = [
@@ -145,6 +152,16 @@ class SMSConfigProcessor:
             # Convert value to appropriate type
             converted_value = self._convert_value(key, value)
             
+            # Inside a transaction: queue the update for the single write at commit
+            if self._pending is not None:
+                self._pending[key] = converted_value
+                return {
+                    "success": True,
+                    "key": key,
+                    "value": converted_value,
+                    "message": "Configuration update queued"
+                }
+            
             # Update configuration file
             if self._update_config_file(key, converted_value):
                 # Log the successful update
@@ -176,6 +193,44 @@ class SMSConfigProcessor:
                 "message": f"Error processing command: {str(e)}"
             }
     
+    @contextmanager
+    def transaction(self) -> Iterator["SMSConfigProcessor"]:
+        """
+        Queue the configuration updates of all commands processed within
+        the block and write them in one atomic write when the block ends.
+        
+        Nested blocks join the outer transaction.
+        """
+        if self._pending is not None:
+            yield self
+            return
+        self._pending = {}
+        try:
+            yield self
+        finally:
+            self.commit()
+            self._pending = None
+    
+    def commit(self) -> bool:
+        """
+        Write the updates queued so far; the transaction stays open.
+        
+        Returns:
+            True if the updates were written (or nothing was queued), False otherwise
+        """
+        if not self._pending:
+            return True
+        updates, self._pending = self._pending, {}
+        success = self._update_config_file_batch(updates)
+        message = "Configuration updated successfully" if success else "Failed to update configuration file"
+        for key, value in updates.items():
+            self._log_config_update(key, value, success, message)
+        if success:
+            logger.info(f"Configuration updated: {', '.join(f'{k} = {v}' for k, v in updates.items())}")
+        else:
+            logger.error(f"Failed to write configuration updates: {', '.join(updates)}")
+        return success
+    
     def _validate_key(self, key: str) -> bool:
         """
         Validate that the key is in the whitelist.
@@ -328,19 +383,35 @@ class SMSConfigProcessor:
             key: The configuration key to update
             value: The new value to set
             
+        Returns:
+            True if update was successful, False otherwise
+        """
+        return self._update_config_file_batch({key: value})
+    
+    def _update_config_file_batch(self, updates: Dict[str, Any]) -> bool:
+        """
+        Write several updates to the configuration file in one atomic write
+        and invalidate the cached configuration.
+        
+        Args:
+            updates: New values by configuration key
+            
         Returns:
             True if update was successful, False otherwise
         """
         try:
-            from .config_preserver import update_yaml_preserving_comments
-            return update_yaml_preserving_comments(self.config_file_path, key, value)
+            from .config_preserver import update_yaml_keys_preserving_comments
+            success = update_yaml_keys_preserving_comments(self.config_file_path, updates)
         except ImportError:
             # Fallback to old method if config_preserver not available
             logger.warning("config_preserver not available, using fallback method")
-            return self._update_config_file_fallback(key, value)
+            success = all(self._update_config_file_fallback(key, value) for key, value in updates.items())
         except Exception as e:
             logger.error(f"Failed to update configuration file: {e}")
             return False
+        if success:
+            invalidate_config_cache(self.config_file_path)
+        return success
     
     def _update_config_file_fallback(self, key: str, value: Any) -> bool:
         """
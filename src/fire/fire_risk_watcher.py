@@ -0,0 +1,240 @@
+"""
+Fire risk change watcher for GR20 dynamic reports.
+
+The daily fire dataset (import_data/YYYYMMDD.json with the "zm" zone levels
+and the "massifs" access procedures) is otherwise only read when a scheduled
+report is built. This module polls the dataset cheaply - conditional GET with
+ETag/Last-Modified plus a content hash - and computes per-zone and per-massif
+differences against the last stored snapshot. Only changed entries are handed
+to DynamicReportComparator, so no weather data has to be fetched.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from .risk_block_formatter import FIRE_DATA_URL, GR20_ZONES, GR20_MASSIFS
+
+try:
+    from utils.file_lock import file_lock, atomic_write_json
+except ImportError:
+    from src.utils.file_lock import file_lock, atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_PATH = ".data/fire_risk/snapshot.json"
+
+
+@dataclass
+class FireRiskChange:
+    """Change of a single zone level or massif procedure."""
+    kind: str  # 'zone' or 'massif'
+    id: int
+    name: str
+    old_level: Optional[int] = None
+    new_level: Optional[int] = None
+    old_procedure: Optional[int] = None
+    new_procedure: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the change as a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+def diff_fire_risk(previous: Dict[str, Any], current: Dict[str, Any],
+                   zone_ids: Optional[List[int]] = None,
+                   massif_ids: Optional[List[int]] = None) -> List[FireRiskChange]:
+    """
+    Compute per-zone and per-massif differences between two datasets.
+
+    Args:
+        previous: Previous dataset with "zm" and "massifs" sections
+        current: Current dataset with "zm" and "massifs" sections
+        zone_ids: Zones to watch (all zones if None)
+        massif_ids: Massifs to watch (all massifs if None)
+
+    Returns:
+        List of FireRiskChange entries for changed zones and massifs
+    """
+    changes = []
+
+    previous_zones = {int(k): v for k, v in (previous.get('zm') or {}).items()}
+    current_zones = {int(k): v for k, v in (current.get('zm') or {}).items()}
+    for zone_id in sorted(set(previous_zones) | set(current_zones)):
+        if zone_ids is not None and zone_id not in zone_ids:
+            continue
+        old_level = previous_zones.get(zone_id)
+        new_level = current_zones.get(zone_id)
+        if old_level != new_level:
+            zone = GR20_ZONES.get(zone_id)
+            changes.append(FireRiskChange(
+                kind='zone',
+                id=zone_id,
+                name=zone.name if zone else f"Zone {zone_id}",
+                old_level=old_level,
+                new_level=new_level
+            ))
+
+    previous_massifs = {int(k): v for k, v in (previous.get('massifs') or {}).items()}
+    current_massifs = {int(k): v for k, v in (current.get('massifs') or {}).items()}
+    for massif_id in sorted(set(previous_massifs) | set(current_massifs)):
+        if massif_ids is not None and massif_id not in massif_ids:
+            continue
+        # massif data is [level, procedure]
+        old = list(previous_massifs.get(massif_id) or [None, None]) + [None, None]
+        new = list(current_massifs.get(massif_id) or [None, None]) + [None, None]
+        if old[:2] != new[:2]:
+            massif = GR20_MASSIFS.get(massif_id)
+            changes.append(FireRiskChange(
+                kind='massif',
+                id=massif_id,
+                name=massif.name if massif else f"Massif {massif_id}",
+                old_level=old[0],
+                new_level=new[0],
+                old_procedure=old[1],
+                new_procedure=new[1]
+            ))
+
+    return changes
+
+
+def format_fire_risk_changes(changes: List[Dict[str, Any]], config: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Format fire risk changes in the compact dynamic report style.
+
+    Zones are shown like the risk block ("Z:HIGH208 -> Z:MAX208"), massifs
+    as "M:+6" when a restriction starts and "M:-6" when it is lifted.
+
+    Args:
+        changes: Change dictionaries (FireRiskChange.to_dict())
+        config: Configuration dictionary with fire_risk_levels
+
+    Returns:
+        Comma-separated change string
+    """
+    fire_config = (config or {}).get('fire_risk_levels', {})
+    zone_mapping = fire_config.get('zone_risk_mapping', {1: "LOW", 2: "HIGH", 3: "HIGH", 4: "MAX"})
+    restriction_threshold = fire_config.get('massif_restriction_threshold', 1)
+
+    def level_label(level):
+        if not level:
+            return "-"
+        return zone_mapping.get(level, zone_mapping.get(str(level), str(level)))
+
+    parts = []
+    for change in changes:
+        if change['kind'] == 'zone':
+            parts.append(f"Z:{level_label(change['old_level'])}{change['id']} -> "
+                         f"Z:{level_label(change['new_level'])}{change['id']}")
+        else:
+            restricted = (change.get('new_procedure') or 0) >= restriction_threshold
+            parts.append(f"M:{'+' if restricted else '-'}{change['id']}")
+    return ", ".join(parts)
+
+
+class FireRiskWatcher:
+    """
+    Polls the daily fire risk dataset and reports changed zones and massifs.
+
+    The last seen dataset is kept as a snapshot file together with its
+    content hash and HTTP validators.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 snapshot_path: str = DEFAULT_SNAPSHOT_PATH,
+                 session: Optional[requests.Session] = None,
+                 gr20_only: bool = True):
+        """
+        Initialize the watcher.
+
+        Args:
+            config: Configuration dictionary
+            snapshot_path: Path of the snapshot file
+            session: Optional HTTP session (a new one is created otherwise)
+            gr20_only: Only report GR20-relevant zones and massifs
+        """
+        self.config = config or {}
+        self.snapshot_path = snapshot_path
+        self.session = session or requests.Session()
+        self.zone_ids = list(GR20_ZONES) if gr20_only else None
+        self.massif_ids = list(GR20_MASSIFS) if gr20_only else None
+
+    def poll(self, now: Optional[datetime] = None) -> List[FireRiskChange]:
+        """
+        Fetch the current dataset if it changed and diff it against the snapshot.
+
+        The first poll only stores a snapshot and reports no changes.
+
+        Args:
+            now: Current time (defaults to datetime.now())
+
+        Returns:
+            List of changed zones and massifs (empty if nothing changed)
+        """
+        now = now or datetime.now()
+        day = now.strftime("%Y%m%d")
+        url = FIRE_DATA_URL.format(day=day)
+
+        with file_lock(f"{self.snapshot_path}.lock"):
+            snapshot = self.load_snapshot()
+
+            headers = {}
+            if snapshot and snapshot.get('date') == day:
+                if snapshot.get('etag'):
+                    headers['If-None-Match'] = snapshot['etag']
+                if snapshot.get('last_modified'):
+                    headers['If-Modified-Since'] = snapshot['last_modified']
+
+            response = self.session.get(url, headers=headers, timeout=10)
+            if response.status_code == 304:
+                logger.debug(f"Fire risk dataset {day} not modified")
+                return []
+            response.raise_for_status()
+
+            content_hash = hashlib.sha256(response.content).hexdigest()
+            if snapshot and snapshot.get('content_hash') == content_hash:
+                logger.debug(f"Fire risk dataset {day} unchanged (hash match)")
+                return []
+
+            data = json.loads(response.content)
+            current = {'zm': data.get('zm') or {}, 'massifs': data.get('massifs') or {}}
+
+            changes = []
+            if snapshot:
+                changes = diff_fire_risk(snapshot, current, self.zone_ids, self.massif_ids)
+            else:
+                logger.info(f"Stored first fire risk snapshot for {day}")
+
+            self._save_snapshot({
+                'date': day,
+                'fetched_at': now.isoformat(),
+                'content_hash': content_hash,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                **current
+            })
+
+            if changes:
+                logger.info(f"Fire risk changes detected: {[c.to_dict() for c in changes]}")
+            return changes
+
+    def load_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Load the last snapshot (None if missing or unreadable)."""
+        if not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable fire risk snapshot {self.snapshot_path}: {e}")
+            return None
+
+    def _save_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        """Persist the snapshot atomically."""
+        atomic_write_json(self.snapshot_path, snapshot, indent=2)
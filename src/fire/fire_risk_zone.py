@@ -74,6 +74,13 @@ class FireRiskZone:
         Returns:
             Dictionary with fire risk alert information or None if not found
         """
+        # Pick up zone polygons published by the incremental zone extractor
+        try:
+            if self.zone_mapper.reload_if_changed():
+                logger.info(f"Fire zone polygons reloaded from {self.zone_mapper.geojson_path}")
+        except Exception as e:
+            logger.warning(f"Could not reload fire zone polygons, keeping the loaded ones: {e}")
+        
         # Get zone information for coordinates
         zone_info = self.zone_mapper.get_zone_for_coordinates(lat, lon)
         if not zone_info:
@@ -25,6 +25,7 @@ class FireZoneMapper:
         """
         self.geojson_path = Path(geojson_path)
         self.gdf = None
+        self._loaded_mtime_ns = None
         self._load_zones()
         
         # Official zone number to name mapping based on screenshots and official map
@@ -54,7 +55,31 @@ class FireZoneMapper:
         if not self.geojson_path.exists():
             raise FileNotFoundError(f"Fire zones GeoJSON not found: {self.geojson_path}")
             
+        # Recorded only after a successful read, so a failed reload is retried
+        mtime_ns = self.geojson_path.stat().st_mtime_ns
         self.gdf = gpd.read_file(self.geojson_path)
+        self._loaded_mtime_ns = mtime_ns
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the zone polygons if the GeoJSON file was replaced.
+        
+        The incremental zone extractor publishes new versions atomically,
+        so a changed modification time means a complete new file.
+        
+        Returns:
+            True if the polygons were reloaded, False otherwise
+        """
+        try:
+            mtime_ns = self.geojson_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+        
+        if mtime_ns == self._loaded_mtime_ns:
+            return False
+        
+        self._load_zones()
+        return True
         
     def get_zone_for_coordinates(self, lat: float, lon: float) -> Optional[Dict[str, Any]]:
         """
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Incremental Fire Zone Extractor - Update zone polygons only where zones.js changed
+
+The official zones.js file is republished as a whole, but usually only a few
+zone objects (or none) differ from the previous download. This module scans
+the zones array object by object, hashes each zone and re-parses only zones
+whose hash changed since the last run. Every change produces a new versioned,
+compact GeoJSON file plus a change log entry; the current version is also
+published atomically to data/fire_zones.geojson so FireZoneMapper can reload
+it without a rebuild.
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .fire_zone_extractor import FireZoneExtractor
+
+try:
+    from utils.file_lock import file_lock, atomic_write_json, atomic_write_text
+except ImportError:
+    from src.utils.file_lock import file_lock, atomic_write_json, atomic_write_text
+
+
+ZONES_ARRAY_MARKER = "var zones = ["
+NUMERO_PATTERN = re.compile(r'numero_zon: "(\d+)"')
+
+
+@dataclass
+class ZoneUpdateResult:
+    """Outcome of an incremental zone extraction run."""
+    version: int
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    output_path: Optional[str] = None
+
+    @property
+    def has_changes(self) -> bool:
+        """True if any zone was added, removed or changed."""
+        return bool(self.added or self.removed or self.changed)
+
+
+def iter_zone_objects(lines: Iterator[str]) -> Iterator[str]:
+    """
+    Yield the source text of each top-level object in the zones array.
+
+    The input is consumed line by line; only the current zone object is held
+    in memory. Braces inside string literals are ignored.
+
+    Args:
+        lines: Iterator over the lines of zones.js
+
+    Yields:
+        Text of one zone object including its outer braces
+    """
+    in_array = False
+    depth = 0
+    in_string = False
+    escaped = False
+    buffer: List[str] = []
+
+    for line in lines:
+        start = 0
+        if not in_array:
+            marker = line.find(ZONES_ARRAY_MARKER)
+            if marker < 0:
+                continue
+            in_array = True
+            start = marker + len(ZONES_ARRAY_MARKER)
+
+        for char in line[start:]:
+            if depth > 0:
+                buffer.append(char)
+
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+                continue
+
+            if char == '"':
+                in_string = True
+            elif char == '{':
+                if depth == 0:
+                    buffer = ['{']
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0:
+                    yield ''.join(buffer)
+                    buffer = []
+            elif char == ']' and depth == 0:
+                return
+
+    if not in_array:
+        raise ValueError("Could not find zones array in zones.js")
+
+
+def zone_hash(zone_text: str) -> str:
+    """Return a whitespace-insensitive content hash of a zone object."""
+    normalized = ''.join(zone_text.split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class IncrementalFireZoneExtractor(FireZoneExtractor):
+    """Extract fire zones from zones.js, re-parsing only changed zones."""
+
+    def __init__(self, zones_js_path: str = "data/official_zones.js",
+                 output_dir: str = "data/fire_zones",
+                 publish_path: Optional[str] = "data/fire_zones.geojson"):
+        """
+        Initialize the incremental extractor.
+
+        Args:
+            zones_js_path: Path to the downloaded zones.js file
+            output_dir: Directory for versioned GeoJSON files, manifest and change log
+            publish_path: Stable path that always holds the current version (None to disable)
+        """
+        super().__init__(zones_js_path)
+        self.output_dir = Path(output_dir)
+        self.publish_path = Path(publish_path) if publish_path else None
+        self.manifest_path = self.output_dir / "manifest.json"
+        self.changelog_path = self.output_dir / "changelog.jsonl"
+
+    def scan_zones(self) -> Iterator[Tuple[str, str, str]]:
+        """
+        Scan zones.js and yield (zone id, hash, object text) per zone.
+
+        Zones without a numero_zon are keyed by their hash.
+        """
+        if not self.zones_js_path.exists():
+            raise FileNotFoundError(f"Zones.js file not found: {self.zones_js_path}")
+
+        with open(self.zones_js_path, 'r', encoding='utf-8') as f:
+            for zone_text in iter_zone_objects(f):
+                digest = zone_hash(zone_text)
+                numero_match = NUMERO_PATTERN.search(zone_text)
+                zone_id = numero_match.group(1) if numero_match else digest[:12]
+                yield zone_id, digest, zone_text
+
+    def update(self) -> ZoneUpdateResult:
+        """
+        Bring the versioned output up to date with zones.js.
+
+        Returns:
+            ZoneUpdateResult describing the changes; version is unchanged
+            if zones.js contains no zone changes
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        with file_lock(f"{self.manifest_path}.lock"):
+            manifest = self.load_manifest()
+            previous_hashes: Dict[str, str] = manifest.get('zones', {})
+            previous_features = self._load_features(manifest.get('current_file'), manifest.get('feature_ids'))
+
+            result = ZoneUpdateResult(version=manifest.get('version', 0))
+            features: List[Dict[str, Any]] = []
+            feature_ids: List[str] = []
+            hashes: Dict[str, str] = {}
+
+            for zone_id, digest, zone_text in self.scan_zones():
+                hashes[zone_id] = digest
+                feature = previous_features.get(zone_id) if previous_hashes.get(zone_id) == digest else None
+
+                if feature is None:
+                    feature = self._parse_zone_object(zone_text)
+                    if not feature:
+                        hashes.pop(zone_id)
+                        continue
+                    if zone_id in previous_hashes:
+                        result.changed.append(zone_id)
+                    else:
+                        result.added.append(zone_id)
+                else:
+                    result.unchanged.append(zone_id)
+
+                features.append(feature)
+                feature_ids.append(zone_id)
+
+            result.removed = sorted(set(previous_hashes) - set(hashes))
+
+            if not result.has_changes and manifest.get('current_file'):
+                result.output_path = str(self.output_dir / manifest['current_file'])
+                return result
+
+            result.version += 1
+            filename = f"fire_zones_v{result.version}.geojson"
+            content = json.dumps({
+                "type": "FeatureCollection",
+                "version": result.version,
+                "features": features
+            }, ensure_ascii=False, separators=(',', ':'))
+
+            atomic_write_text(str(self.output_dir / filename), content)
+            if self.publish_path:
+                atomic_write_text(str(self.publish_path), content)
+
+            generated_at = datetime.now().isoformat()
+            with open(self.changelog_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({
+                    "version": result.version,
+                    "generated_at": generated_at,
+                    "added": result.added,
+                    "removed": result.removed,
+                    "changed": result.changed
+                }) + "\n")
+
+            atomic_write_json(str(self.manifest_path), {
+                "version": result.version,
+                "generated_at": generated_at,
+                "current_file": filename,
+                "zones": hashes,
+                "feature_ids": feature_ids
+            }, indent=2)
+
+            result.output_path = str(self.output_dir / filename)
+            return result
+
+    def load_manifest(self) -> Dict[str, Any]:
+        """Load the manifest of the current version (empty if none exists)."""
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return {}
+
+    def read_changelog(self) -> List[Dict[str, Any]]:
+        """Return all change log entries, oldest first."""
+        if not self.changelog_path.exists():
+            return []
+        with open(self.changelog_path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _load_features(self, filename: Optional[str],
+                       feature_ids: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Load features of a previous version keyed by zone id.
+
+        Args:
+            filename: GeoJSON file of the previous version
+            feature_ids: Zone id of each feature in file order, from the manifest
+                (manifests without it are keyed by numero_zon)
+        """
+        if not filename:
+            return {}
+        path = self.output_dir / filename
+        if not path.exists():
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                collection = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return {}
+        features = collection.get('features', [])
+        if feature_ids is not None and len(feature_ids) == len(features):
+            return dict(zip(feature_ids, features))
+        return {
+            feature['properties']['numero_zon']: feature
+            for feature in features
+            if feature.get('properties', {}).get('numero_zon')
+        }
+
+
+def main():
+    """Main function to update the versioned fire zones."""
+    extractor = IncrementalFireZoneExtractor()
+
+    try:
+        result = extractor.update()
+        if result.has_changes:
+            print(f"Fire zones updated to version {result.version}: {result.output_path}")
+            print(f"  added: {', '.join(result.added) or '-'}")
+            print(f"  changed: {', '.join(result.changed) or '-'}")
+            print(f"  removed: {', '.join(result.removed) or '-'}")
+        else:
+            print(f"Fire zones unchanged (version {result.version})")
+    except Exception as e:
+        print(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
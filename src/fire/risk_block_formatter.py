@@ -6,7 +6,9 @@ zone and massif IDs for fire risk warnings and access restrictions.
 """
 
 import logging
-from typing import Optional, List, Dict, Any
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional, List, Dict, Any
 from dataclasses import dataclass
 import requests
 from bs4 import BeautifulSoup
@@ -61,6 +63,63 @@ GR20_MASSIFS = {
 }
 
 
+FIRE_DATA_URL = "https://www.risque-prevention-incendie.fr/static/20/import_data/{day}.json"
+
+# Daily datasets shared within a shared_fire_risk_data() block (None = not shared)
+_shared_data: Optional[Dict[str, Dict[str, Any]]] = None
+_shared_lock = threading.Lock()
+
+
+@contextmanager
+def shared_fire_risk_data() -> Iterator[None]:
+    """
+    Share the daily fire risk dataset between all lookups inside the block.
+
+    Without it, every zone and massif lookup downloads the dataset again. Runs
+    that generate many reports (several stages or routes) wrap the generation
+    in this block so the dataset is downloaded once per day.
+    """
+    global _shared_data
+    with _shared_lock:
+        outermost = _shared_data is None
+        if outermost:
+            _shared_data = {}
+    try:
+        yield
+    finally:
+        if outermost:
+            with _shared_lock:
+                _shared_data = None
+
+
+def load_fire_risk_data(day: str) -> Dict[str, Any]:
+    """
+    Load the daily fire risk dataset.
+
+    Args:
+        day: Date in YYYYMMDD format
+
+    Returns:
+        Parsed dataset with the "zm" zone levels and "massifs" restrictions
+
+    Raises:
+        requests.RequestException: If the dataset cannot be downloaded
+    """
+    def fetch() -> Dict[str, Any]:
+        response = requests.get(FIRE_DATA_URL.format(day=day), timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    if _shared_data is None:
+        return fetch()
+    with _shared_lock:
+        if _shared_data is None:
+            return fetch()
+        if day not in _shared_data:
+            _shared_data[day] = fetch()
+        return _shared_data[day]
+
+
 def get_zone_risk_levels(latitude: float, longitude: float) -> Dict[int, int]:
     """
     Get current risk levels for GR20-relevant zones by parsing the daily JSON data.
@@ -76,12 +135,9 @@ def get_zone_risk_levels(latitude: float, longitude: float) -> Dict[int, int]:
     
     # Get today's date in YYYYMMDD format
     today = datetime.datetime.now().strftime("%Y%m%d")
-    url = f"https://www.risque-prevention-incendie.fr/static/20/import_data/{today}.json"
     
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = load_fire_risk_data(today)
         
         zone_risks = {}
         
@@ -178,12 +234,9 @@ def get_massif_restrictions(config: Optional[Dict[str, Any]] = None) -> List[int
     
     # Get today's date in YYYYMMDD format
     today = datetime.datetime.now().strftime("%Y%m%d")
-    url = f"https://www.risque-prevention-incendie.fr/static/20/import_data/{today}.json"
     
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = load_fire_risk_data(today)
         
         restricted_ids = []
         
@@ -0,0 +1,136 @@
+"""
+Delta Engine
+
+Vectorized change detection for dynamic reports. Each report is normalized
+into a fixed-layout feature vector with one slot per compared element and
+field (maximum value, threshold time, maximum time). Change detection is a
+single array difference against a threshold vector, which also allows the
+current forecast to be compared against any number of earlier reports in
+one pass.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# (report element, delta_thresholds key); gust uses the wind threshold
+COMPARED_ELEMENTS: Tuple[Tuple[str, str], ...] = (
+    ('rain_mm', 'rain_amount'),
+    ('rain_percent', 'rain_probability'),
+    ('wind', 'wind_speed'),
+    ('gust', 'wind_speed'),
+    ('thunderstorm', 'thunderstorm'),
+)
+
+# Fields per element in priority order; times are compared in full hours
+SLOT_FIELDS: Tuple[str, ...] = ('max_value', 'threshold_time', 'max_time')
+TIME_FIELDS = ('threshold_time', 'max_time')
+
+SLOTS: Tuple[Tuple[str, str], ...] = tuple(
+    (element, field) for element, _ in COMPARED_ELEMENTS for field in SLOT_FIELDS
+)
+
+
+def _hour(value: Any) -> float:
+    """Convert "HH:MM", "HH" or an integer hour to a float hour (NaN if missing)."""
+    if not value:
+        return math.nan
+    try:
+        if isinstance(value, str):
+            return float(int(value.split(':')[0]))
+        return float(int(value))
+    except (ValueError, TypeError):
+        return math.nan
+
+
+def _number(value: Any) -> float:
+    """Convert a numeric value to float (NaN if missing)."""
+    if value is None:
+        return math.nan
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return math.nan
+
+
+def feature_vector(report: Dict[str, Any]) -> np.ndarray:
+    """
+    Normalize a report dictionary into its feature vector.
+
+    Args:
+        report: Report dictionary (encode_report layout)
+
+    Returns:
+        Float array with one entry per slot in SLOTS (NaN for missing values)
+    """
+    values = []
+    for element, _ in COMPARED_ELEMENTS:
+        data = report.get(element) or {}
+        for field in SLOT_FIELDS:
+            raw = data.get(field)
+            values.append(_hour(raw) if field in TIME_FIELDS else _number(raw))
+    return np.array(values, dtype=float)
+
+
+class DeltaEngine:
+    """
+    Detects changed slots between report feature vectors.
+    """
+
+    def __init__(self, delta_thresholds: Dict[str, Any]):
+        """
+        Build the threshold vector.
+
+        Elements whose delta threshold is 0 (or missing) are never reported
+        as changed. Time slots change with a difference of at least one hour.
+
+        Args:
+            delta_thresholds: delta_thresholds section of the configuration
+        """
+        thresholds = []
+        for _, threshold_key in COMPARED_ELEMENTS:
+            threshold = delta_thresholds.get(threshold_key, 0)
+            for field in SLOT_FIELDS:
+                if not threshold:
+                    thresholds.append(math.inf)
+                elif field in TIME_FIELDS:
+                    thresholds.append(1.0)
+                else:
+                    thresholds.append(float(threshold))
+        self.thresholds = np.array(thresholds, dtype=float)
+
+    def diff(self, current: np.ndarray, previous: np.ndarray) -> np.ndarray:
+        """
+        Compare the current vector against one or many previous vectors.
+
+        Args:
+            current: Feature vector of the current report
+            previous: Feature vector or matrix (one row per earlier report)
+
+        Returns:
+            Boolean mask of changed slots with the shape of previous
+        """
+        with np.errstate(invalid='ignore'):
+            return np.abs(current - previous) >= self.thresholds
+
+    def changed_slots(self, current: np.ndarray, previous: np.ndarray) -> List[Tuple[str, str]]:
+        """Return the (element, field) slots changed between two vectors."""
+        return [SLOTS[i] for i in np.flatnonzero(self.diff(current, previous))]
+
+    def changed_slots_many(self, current: np.ndarray,
+                           previous: Sequence[np.ndarray]) -> List[List[Tuple[str, str]]]:
+        """Return the changed slots against each earlier vector (one array pass)."""
+        if len(previous) == 0:
+            return []
+        mask = self.diff(current, np.vstack(previous))
+        return [[SLOTS[i] for i in np.flatnonzero(row)] for row in mask]
+
+
+def first_changed_field(changed: Sequence[Tuple[str, str]], element: str) -> Optional[str]:
+    """Return the highest-priority changed field of an element (None if unchanged)."""
+    fields = {field for name, field in changed if name == element}
+    for field in SLOT_FIELDS:
+        if field in fields:
+            return field
+    return None
@@ -12,6 +12,15 @@ from datetime import datetime, date
 from typing import Dict, Any, Optional, List, Tuple
 import logging
 
+try:
+    from logic.delta_engine import DeltaEngine, COMPARED_ELEMENTS, feature_vector, first_changed_field
+    from logic.report_store import ReportStore, REPORT_STORE_FILENAME
+    from weather.core.report_codec import encode_report
+except ImportError:
+    from src.logic.delta_engine import DeltaEngine, COMPARED_ELEMENTS, feature_vector, first_changed_field
+    from src.logic.report_store import ReportStore, REPORT_STORE_FILENAME
+    from src.weather.core.report_codec import encode_report
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,12 +43,16 @@ class DynamicReportComparator:
         """
         self.config = config
         self.delta_thresholds = config.get('delta_thresholds', {})
+        self.delta_engine = DeltaEngine(self.delta_thresholds)
         self.data_dir = ".data/weather_reports"
         
     def load_last_report(self, stage_name: str, report_date: date) -> Optional[Dict[str, Any]]:
         """
         Load the last sent report for a specific stage and date.
         
+        The report history store is queried first; the per-day JSON file is
+        used for reports written before the store existed.
+        
         Args:
             stage_name: Name of the stage
             report_date: Date of the report
@@ -47,6 +60,15 @@ class DynamicReportComparator:
         Returns:
             Dictionary with last report data or None if not found
         """
+        try:
+            store = ReportStore(os.path.join(self.data_dir, REPORT_STORE_FILENAME))
+            data = store.last_sent(stage_name, report_date)
+            if data is not None:
+                logger.info(f"Loaded previous report from {store.db_path}")
+                return data
+        except Exception as e:
+            logger.warning(f"Report history store unavailable, falling back to JSON file: {e}")
+        
         try:
             date_str = report_date.strftime('%Y-%m-%d')
             filepath = os.path.join(self.data_dir, date_str, f"{stage_name}.json")
@@ -86,41 +108,34 @@ class DynamicReportComparator:
             "changes": []
         }
         
-        # Convert WeatherReportData to dictionary if needed
+        # Convert WeatherReportData to dictionary if needed (no deep copy)
         if hasattr(current_report, 'stage_name'):
             # It's a WeatherReportData object, convert to dict
-            from dataclasses import asdict
-            current_dict = asdict(current_report)
+            current_dict = encode_report(current_report)
         else:
             current_dict = current_report
             
         if hasattr(previous_report, 'stage_name'):
             # It's a WeatherReportData object, convert to dict
-            from dataclasses import asdict
-            previous_dict = asdict(previous_report)
+            previous_dict = encode_report(previous_report)
         else:
             previous_dict = previous_report
         
-        # Compare each weather element
-        elements_to_compare = [
-            ('rain_mm', 'rain_amount'),
-            ('rain_percent', 'rain_probability'),
-            ('wind', 'wind_speed'),
-            ('gust', 'wind_speed'),  # Use same threshold as wind
-            ('thunderstorm', 'thunderstorm')
-        ]
+        # Compare all elements in one vectorized pass
+        changed = self.delta_engine.changed_slots(feature_vector(current_dict), feature_vector(previous_dict))
         
         has_significant_changes = False
         
-        for element_name, threshold_key in elements_to_compare:
-            changed, element_details = self._compare_element(current_dict, previous_dict, element_name, threshold_key)
-            if changed:
+        for element_name, threshold_key in COMPARED_ELEMENTS:
+            field = first_changed_field(changed, element_name)
+            if field:
                 has_significant_changes = True
                 change_details["changes"].append({
                     "element": element_name,
                     "threshold_key": threshold_key
                 })
                 # Add detailed change information
+                element_details = self._change_details(current_dict[element_name], previous_dict[element_name], field)
                 change_details[element_name] = element_details
                 logger.info(f"Added change details for {element_name}: {element_details}")
         
@@ -132,7 +147,113 @@ class DynamicReportComparator:
             
         return has_significant_changes, change_details
     
-    def _compare_element(self, current: Dict[str, Any], previous: Dict[str, Any], 
+    def compare_with_history(self, current_report: Dict[str, Any], stage_name: str,
+                             report_date: date) -> List[Dict[str, Any]]:
+        """
+        Compare the current report against every stored report of the day in one pass.
+        
+        Args:
+            current_report: Current weather report data
+            stage_name: Name of the stage
+            report_date: Date of the reports
+            
+        Returns:
+            One entry per earlier report with id, report_type, generated_at,
+            sent and changed_slots (list of "element.field")
+        """
+        if hasattr(current_report, 'stage_name'):
+            current_report = encode_report(current_report)
+        
+        store = ReportStore(os.path.join(self.data_dir, REPORT_STORE_FILENAME))
+        history = store.history(stage_name, start_date=report_date, end_date=report_date)
+        changed_per_report = self.delta_engine.changed_slots_many(
+            feature_vector(current_report),
+            [feature_vector(entry['data']) for entry in history]
+        )
+        
+        return [{
+            "id": entry['id'],
+            "report_type": entry['report_type'],
+            "generated_at": entry['generated_at'],
+            "sent": entry['sent'],
+            "changed_slots": [f"{element}.{field}" for element, field in changed]
+        } for entry, changed in zip(history, changed_per_report)]
+    
+    @staticmethod
+    def _change_details(current: Dict[str, Any], previous: Dict[str, Any], field: str) -> Dict[str, Any]:
+        """
+        Build change details for an element from its highest-priority changed field.
+        
+        Args:
+            current: Current element data
+            previous: Previous element data
+            field: Changed field ('max_value', 'threshold_time' or 'max_time')
+            
+        Returns:
+            Dictionary with changed, old/new value and old/new time
+        """
+        if field == 'threshold_time':
+            value_key, time_key = 'threshold_value', 'threshold_time'
+        else:
+            value_key, time_key = 'max_value', 'max_time'
+        return {
+            "changed": True,
+            "old_value": previous.get(value_key),
+            "new_value": current.get(value_key),
+            "old_time": previous.get(time_key),
+            "new_time": current.get(time_key)
+        }
+    
+    def compare_fire_risk(self, fire_changes: List[Dict[str, Any]]) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Check fire risk changes from FireRiskWatcher for significance.
+
+        Zone level changes count if the level moved by at least
+        delta_thresholds.fire_risk_level and one of the levels is displayed
+        (>= fire_risk_levels.minimum_display_level). Massif changes count if
+        the access restriction starts or ends.
+
+        Args:
+            fire_changes: Change dictionaries (FireRiskChange.to_dict())
+
+        Returns:
+            Tuple of (should_send_report, change_details)
+        """
+        fire_config = self.config.get('fire_risk_levels', {})
+        min_display_level = fire_config.get('minimum_display_level', 2)
+        restriction_threshold = fire_config.get('massif_restriction_threshold', 1)
+        level_threshold = self.delta_thresholds.get('fire_risk_level', 1)
+
+        significant = []
+        for change in fire_changes:
+            if change.get('kind') == 'zone':
+                old_level = change.get('old_level') or 0
+                new_level = change.get('new_level') or 0
+                if (abs(new_level - old_level) >= level_threshold
+                        and max(old_level, new_level) >= min_display_level):
+                    significant.append(change)
+            elif change.get('kind') == 'massif':
+                was_restricted = (change.get('old_procedure') or 0) >= restriction_threshold
+                is_restricted = (change.get('new_procedure') or 0) >= restriction_threshold
+                if was_restricted != is_restricted:
+                    significant.append(change)
+
+        if not significant:
+            logger.debug("No significant fire risk changes detected")
+            return False, {"reason": "no_significant_changes", "changes": []}
+
+        change_details = {
+            "reason": "significant_changes_detected",
+            "changes": [{"element": "risk_zonal", "threshold_key": "fire_risk_level"}],
+            "risk_zonal": {
+                "changed": True,
+                "fire_changes": significant
+            }
+        }
+        logger.info(f"Significant fire risk changes detected: {significant}")
+        return True, change_details
+
+    def _compare_element(self, current: Dict[str, Any], previous: Dict[str, Any],
                         element_name: str, threshold_key: str) -> Tuple[bool, Dict[str, Any]]:
         """
         Compare a specific weather element between current and previous reports.
@@ -0,0 +1,521 @@
+"""
+GR20 Report Daemon
+
+Long-running replacement for the per-run cron start of
+run_gr20_weather_monitor.py. One asyncio loop keeps the route registry
+(stage index), the forecast client (OAuth token and HTTP pool), the fire
+risk watcher session and the notification clients warm and triggers all
+reports internally:
+
+- morning and evening reports at send_schedule.morning_time/evening_time
+- dynamic checks every daemon.dynamic_interval_min minutes
+- fire risk checks every daemon.fire_interval_min minutes
+- a one-off revalidation daemon.revalidate_delay_seconds after a dynamic
+  check that was served stale forecasts: it waits for the background
+  refresh of those points and runs the dynamic check again
+
+With a config source (e.g. load_config_cached), the configuration is
+checked at least every CONFIG_CHECK_SECONDS and before every job, so
+changes made by SMS config commands apply without a restart.
+
+Jobs run one at a time in a worker thread. Reports are queued in the
+notification outbox and delivered by its channel workers, so a slow or
+failing SMTP server or SMS gateway does not hold up the next job. SIGTERM
+and SIGINT stop the loop after the running job and delivery have finished.
+"""
+
+import asyncio
+import os
+import signal
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from utils.logging_setup import get_logger
+except ImportError:
+    try:
+        from src.utils.logging_setup import get_logger
+    except ImportError:
+        from ..utils.logging_setup import get_logger
+
+try:
+    from logic.report_scheduler import ReportScheduler
+    from position.route_registry import DEFAULT_ROUTE_NAME, Route, RouteRegistry
+    from report.batch_report_generator import FORECAST_GRID_PRECISION, StageReport, generate_route_reports
+    from weather.core.forecast_snapshot import ForecastCache
+    from notification.gsm7_validator import GSM7Validator, SEGMENT_SEPTETS
+    from notification.outbox import Outbox, OutboxDispatcher, channel_name, report_id
+except ImportError:
+    from src.logic.report_scheduler import ReportScheduler
+    from src.position.route_registry import DEFAULT_ROUTE_NAME, Route, RouteRegistry
+    from src.report.batch_report_generator import FORECAST_GRID_PRECISION, StageReport, generate_route_reports
+    from src.weather.core.forecast_snapshot import ForecastCache
+    from src.notification.gsm7_validator import GSM7Validator, SEGMENT_SEPTETS
+    from src.notification.outbox import Outbox, OutboxDispatcher, channel_name, report_id
+
+logger = get_logger(__name__)
+
+SCHEDULED_JOBS = ("morning", "evening")
+DEFAULT_SEND_TIMES = {"morning": "04:30", "evening": "19:00"}
+DEFAULT_INTERVALS_MIN = {"dynamic": 30, "fire": 60}
+REVALIDATE_JOB = "revalidate"
+CONFIG_CHECK_SECONDS = 60
+
+
+def next_occurrence(time_str: str, after: datetime) -> datetime:
+    """
+    Return the first datetime with the given wall clock time after a moment.
+
+    Args:
+        time_str: Time in HH:MM format
+        after: Reference datetime
+
+    Returns:
+        Today at time_str if still ahead of after, otherwise tomorrow
+    """
+    hour, minute = map(int, time_str.split(":"))
+    candidate = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate <= after:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+class ReportDaemon:
+    """
+    Timer-driven report loop around ReportScheduler with warm clients.
+    """
+
+    def __init__(self, config: Dict[str, Any], state_dir: str = "data",
+                 clock: Callable[[], datetime] = datetime.now,
+                 config_source: Optional[Callable[[], Dict[str, Any]]] = None):
+        """
+        Initialize the daemon.
+
+        Args:
+            config: Configuration dictionary from config.yaml
+            state_dir: Directory of the scheduler state files and the outbox
+            clock: Source of the current time
+            config_source: Returns the current configuration (checked on every tick; None: fixed config)
+        """
+        self.clock = clock
+        self.state_dir = state_dir
+        self.config_source = config_source
+        self.schedulers: Dict[str, ReportScheduler] = {}
+        self._clients: Dict[str, Tuple[Any, Any]] = {}
+        self._fire_watcher = None
+        self._dispatcher: Optional[OutboxDispatcher] = None
+        self._apply_config(config)
+        self.next_run: Dict[str, datetime] = {}
+        self._stale_coordinates: List[Tuple[float, float]] = []
+        # Forecast fingerprint per (route, stage) of the dynamic checks that were served stale
+        self._stale_fingerprints: Dict[Tuple[str, str], str] = {}
+        self.outbox = Outbox.from_config(config, state_dir)
+        self._forecast_client = None
+        self._forecast_cache = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._stop_requested = False
+
+    @staticmethod
+    def _state_file(state_dir: str, route_name: str) -> str:
+        if route_name == DEFAULT_ROUTE_NAME:
+            return os.path.join(state_dir, "gr20_report_state.json")
+        return os.path.join(state_dir, f"gr20_report_state_{route_name}.json")
+
+    def _apply_config(self, config: Dict[str, Any]) -> None:
+        """Derive routes, schedulers, intervals and clients from a configuration."""
+        self.config = config
+        self.registry = RouteRegistry.from_config(config)
+        schedulers = {}
+        for route in self.registry:
+            scheduler = self.schedulers.get(route.name)
+            if scheduler is None:
+                scheduler = ReportScheduler(self._state_file(self.state_dir, route.name), route.config)
+            else:
+                scheduler.config = route.config
+            schedulers[route.name] = scheduler
+        self.schedulers = schedulers
+        daemon_config = config.get("daemon", {})
+        self.intervals = {
+            job: timedelta(minutes=daemon_config.get(f"{job}_interval_min", default))
+            for job, default in DEFAULT_INTERVALS_MIN.items()
+        }
+        self.revalidate_delay = timedelta(seconds=daemon_config.get("revalidate_delay_seconds", 15))
+        # Notification clients are created again with the new route configuration
+        self._clients = {}
+        if self._fire_watcher is not None:
+            self._fire_watcher.config = config
+        # Routes added by a reload get delivery workers of their own
+        if self._dispatcher is not None:
+            for route in self.registry:
+                for channel, sender in self._route_senders(route.name).items():
+                    if self._dispatcher.add_sender(channel, sender):
+                        logger.info(f"Delivering {channel} of the new route {route.name}")
+
+    def refresh_config(self, now: datetime) -> bool:
+        """
+        Apply the current configuration of config_source if it changed.
+
+        Scheduler state, forecast cache and outbox are kept; scheduled
+        reports whose send time changed are planned again.
+
+        Args:
+            now: Current datetime
+
+        Returns:
+            True if a changed configuration was applied
+        """
+        if self.config_source is None:
+            return False
+        try:
+            config = self.config_source()
+        except Exception as e:
+            logger.error(f"Could not reload configuration, keeping the current one: {e}")
+            return False
+        if config == self.config:
+            return False
+
+        self._apply_config(config)
+        send_schedule = config.get("send_schedule", {})
+        for job in SCHEDULED_JOBS:
+            send_time = send_schedule.get(f"{job}_time", DEFAULT_SEND_TIMES[job])
+            if job in self.next_run and self.next_run[job].strftime("%H:%M") != send_time:
+                self.next_run[job] = next_occurrence(send_time, now)
+        logger.info("Configuration changed - applied to the running daemon")
+        return True
+
+    @property
+    def forecast_client(self) -> Any:
+        """MeteoFranceClient reused by all jobs (created on first use)."""
+        if self._forecast_client is None:
+            from meteofrance_api import MeteoFranceClient
+            self._forecast_client = MeteoFranceClient()
+        return self._forecast_client
+
+    @property
+    def forecast_cache(self) -> ForecastCache:
+        """
+        Forecast cache shared by all runs (created on first use).
+
+        Scheduled reports use entries up to forecast_cache.max_age_seconds old;
+        dynamic runs serve older entries stale-while-revalidate.
+        """
+        if self._forecast_cache is None:
+            cache_config = self.config.get("forecast_cache", {})
+            self._forecast_cache = ForecastCache(
+                self.forecast_client,
+                precision=FORECAST_GRID_PRECISION,
+                max_age=cache_config.get("max_age_seconds", 600),
+                stale_seconds=cache_config.get("stale_seconds", 3600)
+            )
+        return self._forecast_cache
+
+    def notification_clients(self, route: Route) -> Tuple[Any, Any]:
+        """Return the (email, sms) clients of a route; sms is None if unavailable."""
+        if route.name not in self._clients:
+            try:
+                from notification.email_client import EmailClient
+                from notification.modular_sms_client import ModularSmsClient
+            except ImportError:
+                from src.notification.email_client import EmailClient
+                from src.notification.modular_sms_client import ModularSmsClient
+            try:
+                sms_client = ModularSmsClient(route.config)
+            except Exception as e:
+                logger.info(f"[{route.name}] SMS client not available: {e}")
+                sms_client = None
+            self._clients[route.name] = (EmailClient(route.config), sms_client)
+        return self._clients[route.name]
+
+    @property
+    def dispatcher(self) -> OutboxDispatcher:
+        """Outbox delivery workers for the email and SMS channel of every route."""
+        if self._dispatcher is None:
+            senders = {}
+            for route in self.registry:
+                senders.update(self._route_senders(route.name))
+            self._dispatcher = OutboxDispatcher(self.outbox, senders)
+        return self._dispatcher
+
+    def _route_senders(self, route_name: str) -> Dict[str, Callable[[Dict[str, Any]], bool]]:
+        """Send functions of the email and SMS channel of a route."""
+        return {channel_name("email", route_name): self._sender(route_name, 0),
+                channel_name("sms", route_name): self._sender(route_name, 1)}
+
+    def _sender(self, route_name: str, index: int) -> Callable[[Dict[str, Any]], bool]:
+        def send(report_data: Dict[str, Any]) -> bool:
+            # Look the route up on every send so a reloaded configuration is used
+            route = self.registry.get(route_name)
+            if route is None:
+                raise ValueError(f"Route {route_name} is no longer configured")
+            client = self.notification_clients(route)[index]
+            return client is not None and client.send_gr20_report(report_data)
+        return send
+
+    def deliver_queued(self, timeout: Optional[float] = None) -> bool:
+        """
+        Deliver all due outbox messages (for single runs outside the daemon loop).
+
+        Args:
+            timeout: Maximum seconds to wait (outbox.drain_timeout_seconds, default 120)
+
+        Returns:
+            True if nothing due is left; failed messages stay queued for retry
+        """
+        if timeout is None:
+            timeout = self.config.get("outbox", {}).get("drain_timeout_seconds", 120)
+        self.dispatcher.start()
+        try:
+            return self.dispatcher.drain(timeout)
+        finally:
+            self.dispatcher.stop()
+
+    def plan(self, now: datetime) -> None:
+        """
+        Compute the first run of every job.
+
+        Args:
+            now: Current datetime
+        """
+        send_schedule = self.config.get("send_schedule", {})
+        for job in SCHEDULED_JOBS:
+            self.next_run[job] = next_occurrence(send_schedule.get(f"{job}_time", DEFAULT_SEND_TIMES[job]), now)
+        for job, interval in self.intervals.items():
+            self.next_run[job] = now + interval
+
+    def due_jobs(self, now: datetime) -> List[str]:
+        """
+        Return the jobs due at now and advance their next run.
+
+        Scheduled reports move to the same time on the next day; interval jobs
+        move one interval past now, so a long pause does not trigger catch-up runs.
+        A due revalidation is removed (it is scheduled again when needed).
+
+        Args:
+            now: Current datetime
+
+        Returns:
+            Due jobs, scheduled reports first
+        """
+        due = [job for job, at in sorted(self.next_run.items(), key=lambda item: item[1]) if at <= now]
+        for job in due:
+            if job in SCHEDULED_JOBS:
+                self.next_run[job] = next_occurrence(self.next_run[job].strftime("%H:%M"), now)
+            elif job in self.intervals:
+                self.next_run[job] = now + self.intervals[job]
+            else:
+                del self.next_run[job]
+        return sorted(due, key=lambda job: job not in SCHEDULED_JOBS)
+
+    def run_job(self, job: str, now: datetime) -> int:
+        """
+        Run one job.
+
+        Args:
+            job: 'morning', 'evening', 'dynamic', 'fire' or 'revalidate'
+            now: Time the job was triggered
+
+        Returns:
+            Number of reports queued for delivery
+        """
+        if job == "fire":
+            return self.run_fire_check(now)
+        if job == REVALIDATE_JOB:
+            return self.run_revalidation(now)
+        return self.run_reports(job, now)
+
+    def run_reports(self, report_type: str, now: Optional[datetime] = None,
+                    compared_fingerprints: Optional[Dict[Tuple[str, str], str]] = None) -> int:
+        """
+        Generate and send the report of today's stage of every route.
+
+        Args:
+            report_type: 'morning', 'evening' or 'dynamic'
+            now: Report time (defaults to the clock)
+            compared_fingerprints: Forecast fingerprint per (route, stage) a dynamic
+                report was already compared with (not compared again if unchanged)
+
+        Returns:
+            Number of reports queued for delivery
+        """
+        now = now or self.clock()
+        is_dynamic = report_type == "dynamic"
+        sent = 0
+        for report in generate_route_reports(self.registry, report_type, now.date(), snapshot=self.forecast_cache,
+                                             compared_fingerprints=compared_fingerprints):
+            if is_dynamic and report.stale_coordinates:
+                self.schedule_revalidation(report, now)
+            if not report.success:
+                logger.warning(f"[{report.route}] No {report_type} report for {report.stage_name}: {report.error}")
+                continue
+            if is_dynamic and report.result_output.endswith(": NO CHANGES"):
+                continue
+            scheduler = self.schedulers[report.route]
+            if is_dynamic and not scheduler.dynamic_report_allowed(now):
+                logger.info(f"[{report.route}] Dynamic report suppressed by interval/daily limit")
+                continue
+            if self._send(report, report_type, now):
+                scheduler.update_state_after_report(now, scheduler.current_state.last_risk_value, is_dynamic)
+                sent += 1
+        return sent
+
+    def schedule_revalidation(self, report: StageReport, now: datetime) -> None:
+        """
+        Schedule a dynamic check after the refresh of stale forecasts.
+
+        Args:
+            report: Dynamic report generated from stale forecasts
+            now: Time of the dynamic check
+        """
+        self._stale_coordinates.extend(report.stale_coordinates)
+        if report.fingerprint:
+            self._stale_fingerprints[(report.route, report.stage_name)] = report.fingerprint
+        self.next_run.setdefault(REVALIDATE_JOB, now + self.revalidate_delay)
+
+    def run_revalidation(self, now: Optional[datetime] = None) -> int:
+        """
+        Wait for the refresh of the forecasts served stale and run the dynamic check again.
+
+        Stages whose refreshed forecast has the fingerprint of the stale check
+        are not compared again; a refresh that does not finish in time does
+        not schedule another revalidation.
+
+        Args:
+            now: Check time (defaults to the clock)
+
+        Returns:
+            Number of reports queued for delivery
+        """
+        coordinates, self._stale_coordinates = self._stale_coordinates, []
+        fingerprints, self._stale_fingerprints = self._stale_fingerprints, {}
+        if not coordinates:
+            return 0
+        if not self.forecast_cache.wait_for_refresh(coordinates=coordinates):
+            logger.warning(f"Forecast refresh of {len(coordinates)} point(s) not finished - checking with the cached data")
+        sent = self.run_reports("dynamic", now, compared_fingerprints=fingerprints)
+        self.next_run.pop(REVALIDATE_JOB, None)
+        self._stale_coordinates = []
+        self._stale_fingerprints = {}
+        return sent
+
+    def run_fire_check(self, now: Optional[datetime] = None) -> int:
+        """
+        Poll the fire risk dataset and send a dynamic report to every active route on changes.
+
+        Args:
+            now: Check time (defaults to the clock)
+
+        Returns:
+            Number of reports queued for delivery
+        """
+        try:
+            from fire.fire_risk_watcher import FireRiskWatcher, format_fire_risk_changes
+            from logic.dynamic_report_comparator import DynamicReportComparator
+        except ImportError:
+            from src.fire.fire_risk_watcher import FireRiskWatcher, format_fire_risk_changes
+            from src.logic.dynamic_report_comparator import DynamicReportComparator
+
+        now = now or self.clock()
+        if self._fire_watcher is None:
+            self._fire_watcher = FireRiskWatcher(self.config)
+        changes = self._fire_watcher.poll(now)
+        if not changes:
+            return 0
+
+        should_send, change_details = DynamicReportComparator(self.config).compare_fire_risk(
+            [change.to_dict() for change in changes]
+        )
+        if not should_send:
+            return 0
+
+        summary = format_fire_risk_changes(change_details["risk_zonal"]["fire_changes"], self.config)
+        sent = 0
+        for route in self.registry:
+            offset = route.stage_offset(now.date())
+            if offset is None or not self.schedulers[route.name].dynamic_report_allowed(now):
+                continue
+            stage_name = route.etappen[offset]["name"]
+            result_output = f"{stage_name[:10]} - {summary}"
+            result_output = GSM7Validator().truncate_to_septets(result_output, SEGMENT_SEPTETS, "...")
+            report = StageReport(stage_offset=offset, stage_name=stage_name, report_date=now.date(),
+                                 report_type="dynamic", result_output=result_output, success=True,
+                                 route=route.name)
+            if self._send(report, "dynamic", now):
+                scheduler = self.schedulers[route.name]
+                scheduler.update_state_after_report(now, scheduler.current_state.last_risk_value, True)
+                sent += 1
+        return sent
+
+    def _send(self, report: StageReport, report_type: str, now: datetime) -> bool:
+        """Queue a report for email and SMS delivery with the clients of its route."""
+        route = self.registry.get(report.route)
+        sms_client = self.notification_clients(route)[1]
+        report_data = {
+            "location": report.stage_name,
+            "report_time": now,
+            "report_type": report_type,
+            "result_output": report.result_output
+        }
+        message_id = report_id(report_data, route.name)
+        # The debug output is rendered from debug_report when the mail is sent
+        queued = self.outbox.enqueue(message_id, channel_name("email", route.name),
+                                     dict(report_data, debug_report=report.debug_report))
+        if sms_client:
+            queued = self.outbox.enqueue(message_id, channel_name("sms", route.name),
+                                         dict(report_data, recipients=sms_client.recipients)) or queued
+        self.dispatcher.wake()
+        logger.info(f"[{route.name}] {report.result_output} - {'queued' if queued else 'already queued'}")
+        return queued
+
+    def stop(self) -> None:
+        """Request shutdown; the running job is finished first."""
+        logger.info("Report daemon shutdown requested")
+        self._stop_requested = True
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def run(self) -> None:
+        """Run the report loop until stop() is called or SIGTERM/SIGINT is received."""
+        loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        if self._stop_requested:
+            self._stop_event.set()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                # Not supported on this platform or outside the main thread
+                pass
+
+        self.plan(self.clock())
+        self.dispatcher.start()
+        logger.info(f"Report daemon started for routes: {', '.join(route.name for route in self.registry)}")
+        try:
+            while not self._stop_event.is_set():
+                delay = (min(self.next_run.values()) - self.clock()).total_seconds()
+                if self.config_source is not None:
+                    delay = min(delay, CONFIG_CHECK_SECONDS)
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+                        break
+                    except asyncio.TimeoutError:
+                        pass
+
+                now = self.clock()
+                self.refresh_config(now)
+                for job in self.due_jobs(now):
+                    if self._stop_event.is_set():
+                        break
+                    try:
+                        sent = await loop.run_in_executor(None, self.run_job, job, now)
+                        logger.info(f"Job {job} finished: {sent} report(s) queued")
+                    except Exception as e:
+                        logger.error(f"Job {job} failed: {e}")
+        finally:
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                try:
+                    loop.remove_signal_handler(sig)
+                except (NotImplementedError, RuntimeError):
+                    pass
+            await loop.run_in_executor(None, self.dispatcher.stop)
+            logger.info("Report daemon stopped")
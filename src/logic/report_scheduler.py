@@ -164,6 +164,37 @@ class ReportScheduler:
         self.current_state.last_risk_value = risk_value
         self._save_state()
     
+    def dynamic_report_allowed(self, current_time: datetime) -> bool:
+        """
+        Check the minimum interval and the daily limit for dynamic reports.
+        
+        Unlike should_send_report, the risk value is not checked; the caller
+        decides on changes by comparing report content.
+        
+        Args:
+            current_time: Current datetime
+            
+        Returns:
+            True if another dynamic report may be sent, False otherwise
+        """
+        delta_thresholds = self.config.get("delta_thresholds", {})
+        min_interval = self.config.get("min_interval_min", delta_thresholds.get("min_interval_min", 60))
+        max_daily = self.config.get("max_daily_reports", delta_thresholds.get("max_daily_reports", 3))
+        
+        last_dynamic = self.current_state.last_dynamic_report
+        if last_dynamic and (current_time - last_dynamic).total_seconds() / 60 < min_interval:
+            logger.debug(f"Last dynamic report at {last_dynamic} is less than {min_interval}min ago")
+            return False
+        
+        daily_count = self.current_state.daily_dynamic_report_count
+        if self.current_state.last_report_date != current_time.strftime("%Y-%m-%d"):
+            daily_count = 0
+        if daily_count >= max_daily:
+            logger.debug(f"Daily dynamic report count {daily_count} at maximum {max_daily}")
+            return False
+        
+        return True
+    
     def get_report_type(self, current_time: datetime, current_risk: float) -> str:
         """
         Determine the type of report to send.
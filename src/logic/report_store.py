@@ -0,0 +1,224 @@
+"""
+Report History Store
+
+Append-only SQLite store for generated weather reports. Every report is kept
+with its stage, date, type and generation time; a small index table points to
+the last sent report per stage and date, so the dynamic report comparator can
+look it up with a single primary key access instead of re-reading JSON files.
+History queries support trend analysis across reports.
+"""
+
+import json
+import os
+import sqlite3
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    from utils.logging_setup import get_logger
+except ImportError:
+    try:
+        from src.utils.logging_setup import get_logger
+    except ImportError:
+        from ..utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+REPORT_STORE_FILENAME = "reports.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    stage_name TEXT NOT NULL,
+    report_date TEXT NOT NULL,
+    report_type TEXT NOT NULL,
+    generated_at TEXT NOT NULL,
+    sent INTEGER NOT NULL DEFAULT 1,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reports_stage_date ON reports (stage_name, report_date, id);
+CREATE TABLE IF NOT EXISTS last_sent (
+    stage_name TEXT NOT NULL,
+    report_date TEXT NOT NULL,
+    report_id INTEGER NOT NULL,
+    PRIMARY KEY (stage_name, report_date)
+);
+"""
+
+
+def _date_key(value) -> str:
+    """Normalize a date or ISO date string to YYYY-MM-DD."""
+    if isinstance(value, (date, datetime)):
+        return value.strftime('%Y-%m-%d')
+    return str(value)
+
+
+class ReportStore:
+    """
+    Append-only history of generated weather reports.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: Path of the SQLite database file (created on first write)
+        """
+        self.db_path = db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection and make sure the schema exists."""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.db_path, timeout=10)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def append(self, stage_name: str, report_date, report_type: str, data: Dict[str, Any],
+               generated_at: Optional[datetime] = None, sent: bool = True) -> int:
+        """
+        Append a report to the history.
+
+        Args:
+            stage_name: Name of the stage
+            report_date: Date of the report
+            report_type: 'morning', 'evening' or 'dynamic'
+            data: Report data (JSON-serializable, non-serializable values are stored as strings)
+            generated_at: Generation time (defaults to now)
+            sent: Whether the report was sent (updates the last sent index)
+
+        Returns:
+            Id of the stored report
+        """
+        generated_at = (generated_at or datetime.now()).isoformat()
+        date_key = _date_key(report_date)
+        payload = json.dumps(data, separators=(',', ':'), default=str)
+
+        connection = self._connect()
+        try:
+            with connection:
+                cursor = connection.execute(
+                    "INSERT INTO reports (stage_name, report_date, report_type, generated_at, sent, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (stage_name, date_key, report_type, generated_at, int(sent), payload)
+                )
+                report_id = cursor.lastrowid
+                if sent:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO last_sent (stage_name, report_date, report_id) VALUES (?, ?, ?)",
+                        (stage_name, date_key, report_id)
+                    )
+        finally:
+            connection.close()
+
+        logger.debug(f"Stored {report_type} report {report_id} for {stage_name} on {date_key}")
+        return report_id
+
+    def last_sent(self, stage_name: str, report_date) -> Optional[Dict[str, Any]]:
+        """
+        Return the last sent report for a stage and date.
+
+        Args:
+            stage_name: Name of the stage
+            report_date: Date of the report
+
+        Returns:
+            Report data or None if no report was sent
+        """
+        if not os.path.exists(self.db_path):
+            return None
+
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                "SELECT r.data FROM last_sent l JOIN reports r ON r.id = l.report_id "
+                "WHERE l.stage_name = ? AND l.report_date = ?",
+                (stage_name, _date_key(report_date))
+            ).fetchone()
+        finally:
+            connection.close()
+
+        return json.loads(row['data']) if row else None
+
+    def history(self, stage_name: Optional[str] = None, start_date=None, end_date=None,
+                report_type: Optional[str] = None, sent_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Return stored reports in generation order.
+
+        Args:
+            stage_name: Only reports of this stage
+            start_date: Only reports on or after this date
+            end_date: Only reports on or before this date
+            report_type: Only reports of this type
+            sent_only: Only reports that were sent
+
+        Returns:
+            List of dictionaries with id, stage_name, report_date, report_type,
+            generated_at, sent and data
+        """
+        if not os.path.exists(self.db_path):
+            return []
+
+        conditions = []
+        params: List[Any] = []
+        if stage_name is not None:
+            conditions.append("stage_name = ?")
+            params.append(stage_name)
+        if start_date is not None:
+            conditions.append("report_date >= ?")
+            params.append(_date_key(start_date))
+        if end_date is not None:
+            conditions.append("report_date <= ?")
+            params.append(_date_key(end_date))
+        if report_type is not None:
+            conditions.append("report_type = ?")
+            params.append(report_type)
+        if sent_only:
+            conditions.append("sent = 1")
+
+        query = "SELECT * FROM reports"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id"
+
+        connection = self._connect()
+        try:
+            rows = connection.execute(query, params).fetchall()
+        finally:
+            connection.close()
+
+        return [{
+            'id': row['id'],
+            'stage_name': row['stage_name'],
+            'report_date': row['report_date'],
+            'report_type': row['report_type'],
+            'generated_at': row['generated_at'],
+            'sent': bool(row['sent']),
+            'data': json.loads(row['data'])
+        } for row in rows]
+
+    def element_trend(self, stage_name: str, element: str, field: str = 'max_value',
+                      start_date=None, end_date=None) -> List[Dict[str, Any]]:
+        """
+        Return the development of one weather element across stored reports.
+
+        Args:
+            stage_name: Name of the stage
+            element: Report element (e.g. 'rain_mm', 'wind')
+            field: Field of the element (e.g. 'max_value', 'threshold_time')
+            start_date: Only reports on or after this date
+            end_date: Only reports on or before this date
+
+        Returns:
+            List of {generated_at, report_date, report_type, value}
+        """
+        return [{
+            'generated_at': entry['generated_at'],
+            'report_date': entry['report_date'],
+            'report_type': entry['report_type'],
+            'value': (entry['data'].get(element) or {}).get(field)
+        } for entry in self.history(stage_name, start_date, end_date)]
@@ -5,18 +5,51 @@ This module provides functionality to send messages to Garmin inReach devices
 via the MapShare web interface. It handles configuration, HTTP requests with
 retries, and proper error handling.
 
+All senders share one HTTP session (connection reuse). With a
+MapShareRetryScheduler failed sends are retried in the background instead
+of blocking the caller, and a MapShareReceiptLog records which report ids
+were delivered to which device, so a re-send after a crash is skipped
+instead of paying for the satellite message twice.
+
 Note: This is for experimental/technical testing purposes only.
 No production use or sending of sensitive data is intended.
 """
 
+import heapq
+import itertools
 import json
+import logging
 import os
+import threading
 import time
 from dataclasses import dataclass
-from typing import Optional
+from datetime import datetime
+from typing import Callable, List, Optional, Set, Tuple
 
 import requests
 
+try:
+    from utils.file_lock import file_lock
+except ImportError:
+    from ..utils.file_lock import file_lock
+
+logger = logging.getLogger(__name__)
+
+# HTTP status codes worth retrying later
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _shared_session() -> requests.Session:
+    """HTTP session shared by all senders (created on first use)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+        return _session
+
 
 @dataclass
 class MapShareConfig:
@@ -42,10 +75,187 @@ class MapShareResult:
         success: Whether the operation was successful
         status_code: HTTP status code (None if request failed)
         response_text: Response text from the server
+        skipped: Not sent because the receipt log shows it was delivered
+        retry_scheduled: Failed, but a retry is scheduled
     """
     success: bool
     status_code: Optional[int]
     response_text: str
+    skipped: bool = False
+    retry_scheduled: bool = False
+
+
+class MapShareReceiptLog:
+    """
+    Append-only log of delivered (report id, device) pairs.
+    
+    One JSON line per delivery; a partly written last line (crash while
+    appending) is ignored when the log is read.
+    """
+    
+    def __init__(self, path: str = "data/mapshare_receipts.jsonl"):
+        """
+        Initialize the receipt log.
+        
+        Args:
+            path: Path of the log file (created on first delivery)
+        """
+        self.path = path
+        self._delivered: Optional[Set[Tuple[str, str]]] = None
+        self._lock = threading.Lock()
+    
+    def _load(self) -> Set[Tuple[str, str]]:
+        delivered = set()
+        if not os.path.exists(self.path):
+            return delivered
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    delivered.add((entry["report_id"], entry["device"]))
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return delivered
+    
+    def is_delivered(self, report_id: str, device: str) -> bool:
+        """
+        Check whether a report was already delivered to a device.
+        
+        Args:
+            report_id: Report identifier
+            device: Device identifier (MapShare extId)
+        """
+        with self._lock:
+            if self._delivered is None:
+                self._delivered = self._load()
+            return (report_id, device) in self._delivered
+    
+    def record(self, report_id: str, device: str, status_code: Optional[int] = None) -> None:
+        """
+        Record a delivery.
+        
+        Args:
+            report_id: Report identifier
+            device: Device identifier (MapShare extId)
+            status_code: HTTP status code of the delivery
+        """
+        entry = {
+            "report_id": report_id,
+            "device": device,
+            "status_code": status_code,
+            "delivered_at": datetime.now().isoformat(timespec="seconds")
+        }
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with file_lock(f"{self.path}.lock"):
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+            if self._delivered is not None:
+                self._delivered.add((report_id, device))
+
+
+class MapShareRetryScheduler:
+    """
+    Retries failed MapShare sends later without blocking the caller.
+    
+    Retries wait base_delay * 2^(attempt - 1) seconds, at most max_delay.
+    Due retries are sent by a background thread after start(), or by
+    calling run_due().
+    """
+    
+    def __init__(self, base_delay: float = 30, max_delay: float = 900,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            base_delay: Delay before the first retry in seconds
+            max_delay: Upper bound for the delay in seconds
+            clock: Monotonic clock
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self._queue: List[Tuple[float, int, "MapShareSender", Optional[str], int]] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+    
+    @property
+    def pending_count(self) -> int:
+        """Number of scheduled retries."""
+        with self._condition:
+            return len(self._queue)
+    
+    def schedule(self, sender: "MapShareSender", report_id: Optional[str], attempt: int) -> float:
+        """
+        Schedule a send attempt.
+        
+        Args:
+            sender: Sender of the message
+            report_id: Report identifier for the receipt log
+            attempt: Number of the attempt to schedule (2 for the first retry)
+            
+        Returns:
+            Delay until the attempt in seconds
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** max(0, attempt - 2))
+        with self._condition:
+            heapq.heappush(self._queue, (self.clock() + delay, next(self._counter), sender, report_id, attempt))
+            self._condition.notify()
+        return delay
+    
+    def run_due(self) -> List[MapShareResult]:
+        """
+        Send all attempts that are due now.
+        
+        Returns:
+            Results of the attempts
+        """
+        results = []
+        while True:
+            with self._condition:
+                if not self._queue or self._queue[0][0] > self.clock():
+                    return results
+                _, _, sender, report_id, attempt = heapq.heappop(self._queue)
+            results.append(sender.send_message(report_id, attempt=attempt))
+    
+    def start(self) -> None:
+        """Start the background thread that sends due retries."""
+        if self._thread is not None:
+            return
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="mapshare-retry", daemon=True)
+        self._thread.start()
+    
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    timeout = self._queue[0][0] - self.clock() if self._queue else None
+                    if timeout is not None and timeout <= 0:
+                        break
+                    self._condition.wait(timeout)
+                if self._stopped:
+                    return
+            try:
+                self.run_due()
+            except Exception as e:
+                logger.error(f"MapShare retry failed: {e}")
+    
+    def stop(self) -> None:
+        """Stop the background thread (scheduled retries are dropped)."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
 
 
 class MapShareSender:
@@ -56,18 +266,26 @@ class MapShareSender:
     proper headers, retry logic, and error handling.
     """
     
-    def __init__(self, config: MapShareConfig):
+    def __init__(self, config: MapShareConfig, session: Optional[requests.Session] = None,
+                 receipts: Optional[MapShareReceiptLog] = None,
+                 scheduler: Optional[MapShareRetryScheduler] = None):
         """
         Initialize the MapShare sender.
         
         Args:
             config: Configuration for message sending
+            session: HTTP session (the shared session if None)
+            receipts: Receipt log to skip already delivered reports
+            scheduler: Retry scheduler; without one, retries block with retry_delay
         """
         self.config = config
         # This was the URL that returned 200 OK, even if messages were blocked.
         self.url = "https://share.garmin.com/textmessage/txtmsg"
         self.max_retries = 3
         self.retry_delay = 1.0  # seconds
+        self.session = session or _shared_session()
+        self.receipts = receipts
+        self.scheduler = scheduler
     
     def _prepare_request_data(self) -> dict:
         """
@@ -94,59 +312,71 @@ class MapShareSender:
             "Content-Type": "application/x-www-form-urlencoded",
         }
     
-    def send_message(self) -> MapShareResult:
+    def send_message(self, report_id: Optional[str] = None, attempt: int = 1) -> MapShareResult:
         """
         Send the message to the Garmin MapShare service.
         
+        Args:
+            report_id: Report identifier; with a receipt log a report already
+                delivered to this device is skipped and a delivery is recorded
+            attempt: Number of this attempt (set by the retry scheduler)
+        
         Returns:
             MapShareResult with operation status and details
         """
-        data = self._prepare_request_data()
-        headers = self._prepare_headers()
+        device = self.config.ext_id
+        if report_id and self.receipts is not None and self.receipts.is_delivered(report_id, device):
+            logger.info(f"MapShare report {report_id} already delivered to {device}, skipping")
+            return MapShareResult(success=True, status_code=None,
+                                  response_text="Already delivered", skipped=True)
         
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.post(
-                    self.url,
-                    data=data,
-                    headers=headers,
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    return MapShareResult(
-                        success=True,
-                        status_code=response.status_code,
-                        response_text=response.text
-                    )
-                else:
-                    return MapShareResult(
-                        success=False,
-                        status_code=response.status_code,
-                        response_text=response.text
-                    )
-                    
-            except requests.exceptions.RequestException as e:
-                error_message = f"Request failed (attempt {attempt + 1}/{self.max_retries}): {str(e)}"
-                if attempt == self.max_retries - 1:
-                    return MapShareResult(
-                        success=False,
-                        status_code=None,
-                        response_text=error_message
-                    )
+        if self.scheduler is not None:
+            result = self._post(attempt)
+            retryable = result.status_code is None or result.status_code in RETRYABLE_STATUS_CODES
+            if not result.success and retryable and attempt < self.max_retries:
+                delay = self.scheduler.schedule(self, report_id, attempt + 1)
+                logger.warning(f"MapShare send failed, retry {attempt + 1}/{self.max_retries} in {delay:.0f}s")
+                result.retry_scheduled = True
+        else:
+            while True:
+                result = self._post(attempt)
+                if result.success or result.status_code is not None or attempt >= self.max_retries:
+                    break
                 time.sleep(self.retry_delay)
+                attempt += 1
         
-        return MapShareResult(
-            success=False,
-            status_code=None,
-            response_text="An unexpected error occurred."
-        )
+        if result.success and report_id and self.receipts is not None:
+            self.receipts.record(report_id, device, result.status_code)
+        return result
+    
+    def _post(self, attempt: int) -> MapShareResult:
+        """Send one request over the session."""
+        try:
+            response = self.session.post(
+                self.url,
+                data=self._prepare_request_data(),
+                headers=self._prepare_headers(),
+                timeout=30
+            )
+            return MapShareResult(
+                success=response.status_code == 200,
+                status_code=response.status_code,
+                response_text=response.text
+            )
+        except requests.exceptions.RequestException as e:
+            return MapShareResult(
+                success=False,
+                status_code=None,
+                response_text=f"Request failed (attempt {attempt}/{self.max_retries}): {str(e)}"
+            )
 
 
 def send_mapshare_message(
     ext_id: str,
     adr: str,
-    message_text: str
+    message_text: str,
+    report_id: Optional[str] = None,
+    receipts: Optional[MapShareReceiptLog] = None
 ) -> MapShareResult:
     """
     Send a message to a Garmin inReach device via MapShare.
@@ -155,6 +385,8 @@ def send_mapshare_message(
         ext_id: Garmin-provided parameter from MapShare link
         adr: Target address (e.g., phone number of the sender)
         message_text: The message to be sent
+        report_id: Report identifier for the receipt log
+        receipts: Receipt log to skip already delivered reports
         
     Returns:
         MapShareResult with operation status and details
@@ -165,5 +397,5 @@ def send_mapshare_message(
         message_text=message_text
     )
     
-    sender = MapShareSender(config)
-    return sender.send_message() 
\ No newline at end of file
+    sender = MapShareSender(config, receipts=receipts)
+    return sender.send_message(report_id) 
\ No newline at end of file
@@ -4,15 +4,21 @@ Email client for sending weather reports.
 This module provides functionality for sending weather reports via email.
 """
 
-import smtplib
+import gzip
+import io
 import ssl
 import os
+import tempfile
+from contextlib import contextmanager
+from email.mime.application import MIMEApplication
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Tuple
 from datetime import datetime
 import logging
 
+from .smtp_session import SmtpSession
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
@@ -57,6 +63,8 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+DEBUG_MARKER = "# DEBUG DATENEXPORT"
+
 # Remove all the old formatting functions (_format_thunderstorm_field, etc.)
 # as they are now handled by the central WeatherFormatter
 
@@ -87,6 +95,181 @@ def generate_debug_email_append(report_data: Dict[str, Any], config: Dict[str, A
         return f"\n--- DEBUG INFO ---\nError generating debug info: {str(e)}\n"
 
 
+def write_debug_report(debug_report: Dict[str, Any], stream) -> None:
+    """
+    Render the debug output of a MorningEveningRefactor report line by line to a text stream.
+    
+    Args:
+        debug_report: Data queued with the report (MorningEveningRefactor.encode_debug_report)
+        stream: Text stream to write to
+    """
+    try:
+        from src.weather.core.morning_evening_refactor import MorningEveningRefactor
+    except ImportError:
+        from weather.core.morning_evening_refactor import MorningEveningRefactor
+    MorningEveningRefactor.write_debug_report(debug_report, stream)
+
+
+def _refactor_debug_text(report_data: Dict[str, Any]) -> str:
+    """Return the MorningEveningRefactor debug output of a report ('' if it has none)."""
+    if report_data.get("debug_report"):
+        buffer = io.StringIO()
+        write_debug_report(report_data["debug_report"], buffer)
+        return buffer.getvalue()
+    return report_data.get("debug_output") or ""
+
+
+def render_debug_attachment(report_data: Dict[str, Any], config: Dict[str, Any]) -> Optional[str]:
+    """
+    Render the debug output of a report gzip-compressed into a temporary file.
+    
+    The debug output of a MorningEveningRefactor report is rendered from its
+    debug_report here, line by line into the compressed file. Reports with a
+    rendered debug_output are only compressed; otherwise the legacy debug
+    append is generated, which happens only on this send path.
+    
+    Args:
+        report_data: Dictionary containing report information
+        config: Configuration dictionary
+        
+    Returns:
+        Path of the .txt.gz file (to be removed by the caller), None if there is no debug output
+    """
+    debug_report = report_data.get("debug_report")
+    debug_text = None
+    if not debug_report:
+        debug_text = report_data.get("debug_output") or generate_debug_email_append(report_data, config)
+        if not debug_text or debug_text.strip() in ("", DEBUG_MARKER):
+            return None
+    
+    fd, path = tempfile.mkstemp(prefix="gr20_debug_", suffix=".txt.gz")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as compressed, \
+                io.TextIOWrapper(compressed, encoding="utf-8") as text:
+            if debug_report:
+                write_debug_report(debug_report, text)
+            else:
+                text.write(debug_text.lstrip("\n"))
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def _debug_attachment_name(report_data: Dict[str, Any]) -> str:
+    report_time = report_data.get("report_time")
+    date_part = report_time.strftime("%Y-%m-%d") if isinstance(report_time, datetime) else "report"
+    location = "".join(c if c.isalnum() else "_" for c in str(report_data.get("location", "")))
+    return f"debug_{date_part}_{report_data.get('report_type', 'report')}_{location}.txt.gz"
+
+
+# Default size limit of one digest mail (body and debug output, uncompressed)
+DIGEST_MAX_BYTES = 2 * 1024 * 1024
+
+
+class _DigestPart:
+    """One mail of a digest: body file, optional gzip debug file and its stages."""
+
+    def __init__(self, with_debug_file: bool):
+        fd, self.body_path = tempfile.mkstemp(prefix="gr20_digest_", suffix=".txt")
+        self.body = os.fdopen(fd, "w", encoding="utf-8")
+        self.debug_path: Optional[str] = None
+        self.debug: Optional[io.TextIOWrapper] = None
+        if with_debug_file:
+            fd, self.debug_path = tempfile.mkstemp(prefix="gr20_digest_debug_", suffix=".txt.gz")
+            raw = os.fdopen(fd, "wb")
+            self.debug = io.TextIOWrapper(gzip.GzipFile(fileobj=raw, mode="wb", mtime=0), encoding="utf-8")
+            self._debug_raw = raw
+        self.stages: List[str] = []
+        self.size = 0
+        self.debug_written = False
+
+    def close(self) -> None:
+        if not self.body.closed:
+            self.body.close()
+        if self.debug is not None and not self.debug.closed:
+            self.debug.close()
+            self._debug_raw.close()
+
+    def remove(self) -> None:
+        self.close()
+        for path in (self.body_path, self.debug_path):
+            if path:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+class DigestWriter:
+    """
+    Streaming writer of digest mails with one section per stage report.
+    
+    Sections are written to temporary files as they are added, so the debug
+    output of a whole batch is never held in memory at once. A new part (one
+    mail each) is started when a section would push the current part over
+    max_bytes; a single larger section gets a part of its own. With debug
+    attachments the debug output of all stages of a part goes into one gzip
+    file, otherwise it follows the section in the body.
+    """
+    
+    def __init__(self, config: Dict[str, Any], max_bytes: int = DIGEST_MAX_BYTES,
+                 debug_attachment: bool = False):
+        """
+        Initialize the writer.
+        
+        Args:
+            config: Configuration dictionary (for report text generation)
+            max_bytes: Size limit of one part in bytes (body and debug output, uncompressed)
+            debug_attachment: Write debug output into a gzip file per part instead of the body
+        """
+        self.config = config
+        self.max_bytes = max_bytes
+        self.debug_attachment = debug_attachment
+        self.parts: List[_DigestPart] = []
+    
+    def add(self, report_data: Dict[str, Any]) -> None:
+        """
+        Write the section of one report.
+        
+        Args:
+            report_data: Report dictionary as passed to EmailClient.send_gr20_report
+        """
+        title = f"=== {report_data.get('location', 'Unknown')} ({report_data.get('report_type', 'morning')}) ==="
+        text = generate_gr20_report_text(report_data, self.config, include_debug=False)
+        section = f"{title}\n{text}\n\n"
+        debug_text = _refactor_debug_text(report_data) or generate_debug_email_append(report_data, self.config)
+        debug_text = debug_text.lstrip("\n") if debug_text and debug_text.strip() != DEBUG_MARKER else ""
+        
+        size = len(section.encode("utf-8")) + len(debug_text.encode("utf-8"))
+        part = self.parts[-1] if self.parts else None
+        if part is None or (part.stages and part.size + size > self.max_bytes):
+            if part is not None:
+                part.close()
+            part = _DigestPart(with_debug_file=self.debug_attachment)
+            self.parts.append(part)
+        
+        part.body.write(section)
+        if debug_text and part.debug is not None:
+            part.debug.write(f"{title}\n{debug_text}\n\n")
+            part.debug_written = True
+        elif debug_text:
+            part.body.write(f"{debug_text}\n\n")
+        part.stages.append(str(report_data.get("location", "Unknown")))
+        part.size += size
+    
+    def close(self) -> None:
+        """Finish writing; the part files stay until remove()."""
+        for part in self.parts:
+            part.close()
+    
+    def remove(self) -> None:
+        """Remove all temporary files."""
+        for part in self.parts:
+            part.remove()
+        self.parts = []
+
+
 
 
 
@@ -131,14 +314,39 @@ class EmailClient:
         # Fallback to environment variable for backward compatibility
         if not self.smtp_password:
             self.smtp_password = os.getenv("GMAIL_APP_PW") or os.getenv("SMTP_PASSWORD")
+        
+        # Seconds an unused SMTP connection stays open (0: new connection per mail)
+        self.idle_timeout = smtp_config.get("idle_timeout_seconds", 0)
+        
+        # With debug enabled, send the debug output as gzip attachment instead of in the body
+        debug_config = config.get("debug", {}) or {}
+        self.debug_attachment = bool(debug_config.get("enabled", False)) and \
+            debug_config.get("email_attachment", True)
+        self._smtp_session: Optional[SmtpSession] = None
+    
+    @property
+    def smtp_session(self) -> SmtpSession:
+        """SMTP connection reused by all mails of this client (created on first use)."""
+        if self._smtp_session is None:
+            self._smtp_session = SmtpSession(self.smtp_host, self.smtp_port, self.smtp_user,
+                                             self.smtp_password, idle_timeout=self.idle_timeout)
+        return self._smtp_session
     
-    def send_email(self, message_text: str, subject: Optional[str] = None) -> bool:
+    @contextmanager
+    def batch(self) -> Iterator["EmailClient"]:
+        """Send all mails within the block over one authenticated SMTP connection."""
+        with self.smtp_session.hold():
+            yield self
+    
+    def send_email(self, message_text: str, subject: Optional[str] = None,
+                   attachments: Optional[List[Tuple[str, str]]] = None) -> bool:
         """
         Send an email with the given message.
         
         Args:
             message_text: The message text to send
             subject: Optional subject line (uses template if not provided)
+            attachments: Optional (filename, path) pairs of gzip files to attach
             
         Returns:
             True if email sent successfully, False otherwise
@@ -153,21 +361,14 @@ class EmailClient:
             # Add message body
             msg.attach(MIMEText(message_text, 'plain', 'utf-8'))
             
-            # Connect to SMTP server
-            server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-            server.starttls()
-            
-            # Login with password from config or environment
-            if self.smtp_password:
-                server.login(self.smtp_user, self.smtp_password)
-            else:
-                # Try without password (for testing or if not required)
-                server.login(self.smtp_user, "")
+            for filename, path in attachments or []:
+                with open(path, 'rb') as f:
+                    part = MIMEApplication(f.read(), 'gzip')
+                part.add_header('Content-Disposition', 'attachment', filename=filename)
+                msg.attach(part)
             
-            # Send email
-            text = msg.as_string()
-            server.sendmail(self.smtp_user, self.recipient_email, text)
-            server.quit()
+            # Send over the (possibly reused) SMTP connection
+            self.smtp_session.send(self.smtp_user, self.recipient_email, msg.as_string())
             
             return True
             
@@ -175,6 +376,70 @@ class EmailClient:
             print(f"Failed to send email: {e}")
             return False
     
+    def send_many(self, messages: Iterable[Tuple[str, Optional[str]]]) -> List[bool]:
+        """
+        Send several emails over one SMTP connection.
+        
+        Args:
+            messages: (message_text, subject) pairs; subject None uses the template
+            
+        Returns:
+            Success flag per message
+        """
+        with self.batch():
+            return [self.send_email(message_text, subject) for message_text, subject in messages]
+    
+    def send_digest(self, reports: Iterable[Dict[str, Any]],
+                    max_bytes: Optional[int] = None) -> List[bool]:
+        """
+        Send the reports of a batch as digest: one mail with a section per
+        report, or several mails if the size limit is reached.
+        
+        Reports are formatted one by one into temporary files by a
+        DigestWriter, so a generator keeps only one report in memory. All
+        mails share one SMTP connection.
+        
+        Args:
+            reports: Report dictionaries as passed to send_gr20_report
+            max_bytes: Size limit per mail (default smtp.digest_max_bytes or DIGEST_MAX_BYTES)
+            
+        Returns:
+            Success flag per mail (empty if there were no reports)
+        """
+        if max_bytes is None:
+            max_bytes = self.config["smtp"].get("digest_max_bytes", DIGEST_MAX_BYTES)
+        writer = DigestWriter(self.config, max_bytes, debug_attachment=self.debug_attachment)
+        report_type = None
+        try:
+            for report_data in reports:
+                report_type = report_type or report_data.get("report_type", "morning")
+                writer.add(report_data)
+            writer.close()
+            
+            base_subject = self.config["smtp"].get("subject", "GR20 Wetter")
+            results = []
+            with self.batch():
+                for index, part in enumerate(writer.parts, 1):
+                    subject = f"{base_subject} Digest: {len(part.stages)} Etappen ({report_type})"
+                    if len(writer.parts) > 1:
+                        subject = f"{subject} [{index}/{len(writer.parts)}]"
+                    with open(part.body_path, encoding="utf-8") as f:
+                        message_text = f.read()
+                    attachments = []
+                    if part.debug_written:
+                        filename = f"debug_digest_{report_type}_{index}.txt.gz"
+                        attachments.append((filename, part.debug_path))
+                        message_text = f"{message_text}{DEBUG_MARKER}: {filename}"
+                    sent = self.send_email(message_text, subject, attachments=attachments)
+                    if sent:
+                        logger.info(f"DIGEST SENT to {self.recipient_email}: {', '.join(part.stages)}")
+                    else:
+                        logger.error(f"DIGEST SEND FAILED to {self.recipient_email}: {', '.join(part.stages)}")
+                    results.append(sent)
+            return results
+        finally:
+            writer.remove()
+    
     def _generate_dynamic_subject(self, report_data: Dict[str, Any]) -> str:
         """
         Generate email subject according to email_format specification.
@@ -269,8 +534,20 @@ class EmailClient:
         Returns:
             True if email sent successfully, False otherwise
         """
-        # Generate report text
-        message_text = generate_gr20_report_text(report_data, self.config)
+        # Generate report text; with debug attachments the body stays short
+        message_text = generate_gr20_report_text(report_data, self.config,
+                                                 include_debug=not self.debug_attachment)
+        attachments = []
+        if self.debug_attachment:
+            try:
+                debug_path = render_debug_attachment(report_data, self.config)
+            except Exception as e:
+                logger.error(f"Failed to render debug attachment: {e}")
+                debug_path = None
+            if debug_path:
+                filename = _debug_attachment_name(report_data)
+                attachments.append((filename, debug_path))
+                message_text = f"{message_text}\n\n{DEBUG_MARKER}: {filename}"
         
         # Generate dynamic subject
         subject = self._generate_dynamic_subject(report_data)
@@ -288,7 +565,14 @@ class EmailClient:
         logger.info(f"EMAIL GENERATED - Length: {len(message_text)} characters")
         
         # Send email
-        send_result = self.send_email(message_text, subject)
+        try:
+            send_result = self.send_email(message_text, subject, attachments=attachments)
+        finally:
+            for _, path in attachments:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
         
         if send_result:
             logger.info(f"EMAIL SENT SUCCESSFULLY to {self.recipient_email}")
@@ -298,7 +582,8 @@ class EmailClient:
         return send_result
 
 
-def generate_gr20_report_text(report_data: Dict[str, Any], config: Dict[str, Any]) -> str:
+def generate_gr20_report_text(report_data: Dict[str, Any], config: Dict[str, Any],
+                              include_debug: bool = True) -> str:
     """
     Generate GR20 weather report text according to email_format rule.
     
@@ -310,11 +595,13 @@ def generate_gr20_report_text(report_data: Dict[str, Any], config: Dict[str, Any
             - report_time: Datetime of the report
             - result_output: New MorningEveningRefactor output (if available)
         config: Configuration dictionary
+        include_debug: Append the debug output (False: not even generated)
         
     Returns:
         Formatted report text (max 160 characters, no links) with optional debug info
     """
     report_type = report_data.get("report_type", "morning")
+    refactor_debug = _refactor_debug_text(report_data) if include_debug else ""
     
     # Check if we have new MorningEveningRefactor output
     if "result_output" in report_data and report_data["result_output"]:
@@ -323,10 +610,10 @@ def generate_gr20_report_text(report_data: Dict[str, Any], config: Dict[str, Any
         logger.info(f"Using MorningEveningRefactor result_output: {base_text}")
         
         # Also use the new debug_output if available
-        if "debug_output" in report_data and report_data["debug_output"]:
+        if refactor_debug:
             # Append the new debug_output to the base_text
-            final_text = f"{base_text}\n\n{report_data['debug_output']}"
-            logger.info(f"Using MorningEveningRefactor debug_output (length: {len(report_data['debug_output'])} characters)")
+            final_text = f"{base_text}\n\n{refactor_debug}"
+            logger.info(f"Using MorningEveningRefactor debug_output (length: {len(refactor_debug)} characters)")
         else:
             final_text = base_text
     else:
@@ -417,7 +704,7 @@ def generate_gr20_report_text(report_data: Dict[str, Any], config: Dict[str, Any
     
     # Add debug information if enabled
     # Only generate old debug output if we don't have new MorningEveningRefactor debug_output
-    if "debug_output" not in report_data or not report_data["debug_output"]:
+    if include_debug and not refactor_debug:
         debug_info = generate_debug_email_append(report_data, config)
         if debug_info:
             final_text += debug_info
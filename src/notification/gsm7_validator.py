@@ -3,10 +3,37 @@ GSM-7 character set validation for SMS messages.
 
 This module provides a validator to ensure that SMS messages
 only contain valid GSM-7 characters.
+
+Normalization is a single str.translate pass over a precompiled table, and
+the septet length and segment count take the GSM-7 extension characters
+(sent as escape + character, 2 septets) into account, so callers can budget
+SMS text exactly instead of counting Python characters.
 """
 
+import re
 from typing import List, Dict, Any
 
+# GSM 03.38 extension table: each character costs 2 septets (escape + character)
+GSM7_EXTENSION_CHARS = "^{}\\[~]|€\f"
+
+# Septets of a single SMS and of each part of a concatenated SMS (7 septets go to the UDH)
+SEGMENT_SEPTETS = 160
+MULTIPART_SEGMENT_SEPTETS = 153
+
+
+class _NormalizeTable(dict):
+    """
+    str.translate table that removes every character it does not know.
+
+    Unknown characters are cached on first lookup, so later occurrences are
+    handled by the C-level dictionary lookup only.
+    """
+
+    def __missing__(self, ordinal: int) -> None:
+        self[ordinal] = None
+        return None
+
+
 class GSM7Validator:
     """
     Validator for GSM-7 character set compliance.
@@ -109,12 +136,7 @@ class GSM7Validator:
         Returns:
             True if all characters are GSM-7, False otherwise
         """
-        if not message:
-            return True
-        for char in message:
-            if char not in self.GSM7_SET:
-                return False
-        return True
+        return not message or self.GSM7_SET.issuperset(message)
 
     def validate_message(self, message: str) -> Dict[str, Any]:
         """
@@ -127,26 +149,26 @@ class GSM7Validator:
                 - is_valid: bool
                 - violations: List of dicts with keys 'character', 'position', 'context'
         """
-        violations = []
-        if not message:
+        if self.is_valid(message):
             return {"is_valid": True, "violations": []}
-        for idx, char in enumerate(message):
-            if char not in self.GSM7_SET:
-                # Extract context (5 chars before/after)
-                start = max(0, idx - 5)
-                end = min(len(message), idx + 6)
-                context = message[start:end]
-                violations.append({
-                    "character": char,
-                    "position": idx,
-                    "context": context
-                })
-        return {"is_valid": len(violations) == 0, "violations": violations}
+        violations = []
+        for match in _NON_GSM7.finditer(message):
+            idx = match.start()
+            # Extract context (5 chars before/after)
+            violations.append({
+                "character": match.group(),
+                "position": idx,
+                "context": message[max(0, idx - 5):idx + 6]
+            })
+        return {"is_valid": False, "violations": violations}
     
     def normalize_to_gsm7(self, message: str) -> str:
         """
         Normalize a message to contain only GSM-7 characters.
         
+        Characters with an entry in CHAR_REPLACEMENTS are replaced, all other
+        non-GSM-7 characters are removed.
+        
         Args:
             message: The message text to normalize
             
@@ -155,20 +177,7 @@ class GSM7Validator:
         """
         if not message:
             return message
-            
-        normalized = ""
-        for char in message:
-            if char in self.GSM7_SET:
-                # Character is already GSM-7 compliant
-                normalized += char
-            elif char in self.CHAR_REPLACEMENTS:
-                # Replace with GSM-7 equivalent
-                normalized += self.CHAR_REPLACEMENTS[char]
-            else:
-                # Remove character entirely
-                continue
-                
-        return normalized
+        return message.translate(_NORMALIZE_TABLE)
     
     def normalize_with_logging(self, message: str) -> Dict[str, Any]:
         """
@@ -184,42 +193,127 @@ class GSM7Validator:
                 - replacements: List of dicts with 'original', 'replacement', 'position'
                 - removed_chars: List of dicts with 'character', 'position'
         """
-        if not message:
+        replacements = []
+        removed_chars = []
+        if self.is_valid(message):
             return {
                 "normalized_text": message,
                 "was_changed": False,
-                "replacements": [],
-                "removed_chars": []
+                "replacements": replacements,
+                "removed_chars": removed_chars
             }
-            
-        normalized = ""
-        replacements = []
-        removed_chars = []
         
-        for idx, char in enumerate(message):
-            if char in self.GSM7_SET:
-                # Character is already GSM-7 compliant
-                normalized += char
-            elif char in self.CHAR_REPLACEMENTS:
-                # Replace with GSM-7 equivalent
-                replacement = self.CHAR_REPLACEMENTS[char]
-                normalized += replacement
-                replacements.append({
-                    "original": char,
-                    "replacement": replacement,
-                    "position": idx
-                })
+        for match in _NON_GSM7.finditer(message):
+            char = match.group()
+            replacement = _NORMALIZE_TABLE[ord(char)]
+            if replacement is None:
+                removed_chars.append({"character": char, "position": match.start()})
             else:
-                # Remove character entirely
-                removed_chars.append({
-                    "character": char,
-                    "position": idx
-                })
-                continue
-                
+                replacements.append({"original": char, "replacement": replacement, "position": match.start()})
+        
         return {
-            "normalized_text": normalized,
-            "was_changed": len(replacements) > 0 or len(removed_chars) > 0,
+            "normalized_text": message.translate(_NORMALIZE_TABLE),
+            "was_changed": True,
             "replacements": replacements,
             "removed_chars": removed_chars
-        } 
\ No newline at end of file
+        }
+
+    def septet_length(self, message: str) -> int:
+        """
+        Return the encoded length of a GSM-7 message in septets.
+
+        Extension characters (^ { } \\ [ ~ ] | €) count twice.
+
+        Args:
+            message: Normalized GSM-7 text
+        Returns:
+            Number of septets
+        """
+        return 2 * len(message) - len(message.translate(_EXTENSION_TABLE))
+
+    def segment_count(self, message: str) -> int:
+        """
+        Return the number of SMS segments needed for a GSM-7 message.
+
+        Messages up to 160 septets need one segment; longer ones are split into
+        parts of 153 septets, and an escape sequence is never split across parts.
+
+        Args:
+            message: Normalized GSM-7 text
+        Returns:
+            Number of segments (0 for an empty message)
+        """
+        if not message:
+            return 0
+        septets = self.septet_length(message)
+        if septets <= SEGMENT_SEPTETS:
+            return 1
+        if septets == len(message):
+            return -(-septets // MULTIPART_SEGMENT_SEPTETS)
+        segments, used = 1, 0
+        for char in message:
+            cost = 2 if char in GSM7_EXTENSION_CHARS else 1
+            if used + cost > MULTIPART_SEGMENT_SEPTETS:
+                segments += 1
+                used = 0
+            used += cost
+        return segments
+
+    def truncate_to_septets(self, message: str, max_septets: int = SEGMENT_SEPTETS, suffix: str = "") -> str:
+        """
+        Shorten a GSM-7 message to at most max_septets septets.
+
+        Args:
+            message: Normalized GSM-7 text
+            max_septets: Septet budget (160 for a single SMS)
+            suffix: Text appended when the message is shortened (e.g. "...")
+        Returns:
+            The message itself if it fits, otherwise its longest prefix that fits
+            together with suffix (an extension character is never cut in half)
+        """
+        if self.septet_length(message) <= max_septets:
+            return message
+        budget = max_septets - self.septet_length(suffix)
+        if self.septet_length(message[:budget]) == budget:
+            return message[:budget] + suffix
+        used = 0
+        for idx, char in enumerate(message):
+            used += 2 if char in GSM7_EXTENSION_CHARS else 1
+            if used > budget:
+                return message[:idx] + suffix
+        return message + suffix
+
+    def measure(self, message: str) -> Dict[str, Any]:
+        """
+        Normalize a message and compute its SMS size.
+
+        Args:
+            message: The message text
+        Returns:
+            Dictionary with keys:
+                - normalized_text: str - The normalized message
+                - septets: int - Encoded length
+                - segments: int - Number of SMS segments
+                - remaining: int - Septets left before the next segment is needed
+        """
+        normalized = self.normalize_to_gsm7(message) or ""
+        septets = self.septet_length(normalized)
+        segments = self.segment_count(normalized)
+        if segments <= 1:
+            remaining = SEGMENT_SEPTETS - septets
+        else:
+            remaining = segments * MULTIPART_SEGMENT_SEPTETS - septets
+        return {
+            "normalized_text": normalized,
+            "septets": septets,
+            "segments": segments,
+            "remaining": max(0, remaining)
+        }
+
+
+# Precompiled tables shared by all validators
+_NORMALIZE_TABLE = _NormalizeTable({ord(char): ord(char) for char in GSM7Validator.GSM7_SET})
+_NORMALIZE_TABLE.update({ord(char): replacement for char, replacement in GSM7Validator.CHAR_REPLACEMENTS.items()
+                         if len(char) == 1 and char not in GSM7Validator.GSM7_SET})
+_EXTENSION_TABLE = {ord(char): None for char in GSM7_EXTENSION_CHARS}
+_NON_GSM7 = re.compile("[^" + re.escape(GSM7Validator.GSM7_CHARS) + "]")
@@ -6,13 +6,15 @@ SMS providers (seven.io, Twilio, etc.) through a unified interface.
 """
 
 import logging
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from .sms_factory import SmsProviderFactory
 from .sms_provider import SmsProvider
 from .email_client import generate_gr20_report_text
 import os
-from .gsm7_validator import GSM7Validator
+from .gsm7_validator import GSM7Validator, SEGMENT_SEPTETS
+from .outbox import PartialDelivery
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +25,13 @@ class ModularSmsClient:
     
     This class provides a unified interface for sending SMS via different
     providers, with proper configuration management and error handling.
+    
+    In production mode the message goes to production_number and every
+    number in the optional sms.recipients list (a hiking group). Providers
+    with a bulk API send all recipients in one request; otherwise up to
+    sms.max_concurrency messages are sent in parallel. Reports queued in
+    the outbox carry their 'recipients', so a retry after a partial
+    delivery only goes to the numbers that were not reached.
     """
     
     def __init__(self, config: Dict[str, Any]):
@@ -60,11 +69,17 @@ class ModularSmsClient:
         self.mode = mode
         self.config = config
         
-        # Set recipient number based on mode
+        # Set recipient numbers based on mode (test mode never reaches the group)
         if mode == "test":
-            self.recipient_number = sms_config["test_number"]
+            self.recipients = [sms_config["test_number"]]
         else:
-            self.recipient_number = sms_config["production_number"]
+            self.recipients = [sms_config["production_number"]]
+            for number in sms_config.get("recipients") or []:
+                if number and number not in self.recipients:
+                    self.recipients.append(number)
+        self.recipient_number = self.recipients[0]
+        self.max_concurrency = max(1, int(sms_config.get("max_concurrency", 4)))
+        self.last_delivery_status: Dict[str, bool] = {}
         
         # Create provider instance
         provider_config = self._get_provider_config(sms_config)
@@ -72,7 +87,7 @@ class ModularSmsClient:
         
         logger.info(f"Modular SMS client initialized with {provider_name} provider")
         logger.info(f"SMS mode: {mode}")
-        logger.info(f"SMS recipient: {self.recipient_number}")
+        logger.info(f"SMS recipients: {', '.join(self.recipients)}")
     
     def _get_provider_config(self, sms_config: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -102,27 +117,52 @@ class ModularSmsClient:
         else:
             raise ValueError(f"Unsupported provider: {provider_name}")
     
-    def send_sms(self, message_text: str) -> bool:
+    def send_sms(self, message_text: str, *, recipients: Optional[List[str]] = None) -> bool:
         """
-        Send an SMS with the given message.
+        Send an SMS with the given message to all recipients.
         
         Args:
-            message_text: The message text to send (max 160 characters)
+            message_text: The message text to send (max 160 GSM-7 septets)
+            recipients: Send only to these numbers (all recipients if None; a single
+                number may be given as string)
             
         Returns:
-            True if SMS sent successfully, False otherwise
+            True if the SMS reached at least one recipient, False otherwise
+            (per-recipient status in last_delivery_status)
+        """
+        return any(self.send_to_recipients(message_text, recipients=recipients).values())
+    
+    def send_to_recipients(self, message_text: str, *,
+                           recipients: Optional[List[str]] = None) -> Dict[str, bool]:
         """
+        Send an SMS with the given message to all recipients.
+        
+        Args:
+            message_text: The message text to send (max 160 GSM-7 septets)
+            recipients: Send only to these numbers (all recipients if None; a single
+                number may be given as string)
+            
+        Returns:
+            Delivery status per recipient number
+        """
+        if recipients is None:
+            recipients = self.recipients
+        elif isinstance(recipients, str):
+            recipients = [recipients]
+        recipients = list(recipients)
+        self.last_delivery_status = {to: False for to in recipients}
+        
         if not self.enabled:
             logger.info("SMS sending disabled")
-            return False
+            return self.last_delivery_status
         
         if not self.provider.is_configured():
             logger.error(f"{self.provider_name} provider not properly configured")
-            return False
+            return self.last_delivery_status
         
         if not message_text or not message_text.strip():
             logger.warning("Empty message text provided")
-            return False
+            return self.last_delivery_status
 
         # Normalize message to GSM-7
         validator = GSM7Validator()
@@ -171,28 +211,55 @@ class ModularSmsClient:
                     f.write(f"Character: '{v['character']}', Position: {v['position']}, Context: '{v['context']}'\n")
                 f.write(f"Sender: SMS module weather report\n")
             logger.error("SMS send aborted due to invalid GSM-7 characters after normalization. See sms_encoding_violation.log for details.")
-            return False
+            return self.last_delivery_status
         
-        # Ensure message doesn't exceed 160 characters
+        # Ensure message fits into one SMS (extension characters count twice)
         message_text = message_text.strip()
-        if len(message_text) > 160:
-            message_text = message_text[:160]
-            logger.info("Message truncated to 160 characters")
+        truncated = validator.truncate_to_septets(message_text, SEGMENT_SEPTETS)
+        if truncated != message_text:
+            message_text = truncated
+            logger.info("Message truncated to 160 GSM-7 septets")
         
-        logger.info(f"Sending SMS via {self.provider_name} to {self.recipient_number}: {message_text[:50]}...")
+        logger.info(f"Sending SMS via {self.provider_name} to {', '.join(recipients)}: {message_text[:50]}...")
         
+        self.last_delivery_status = self._fan_out(message_text, recipients)
+        failed = [to for to, sent in self.last_delivery_status.items() if not sent]
+        if not failed:
+            logger.info(f"SMS sent successfully via {self.provider_name}")
+        elif len(failed) < len(recipients):
+            logger.error(f"Failed to send SMS via {self.provider_name} to {', '.join(failed)}")
+        else:
+            logger.error(f"Failed to send SMS via {self.provider_name}")
+        return self.last_delivery_status
+    
+    def _send_one(self, to: str, message_text: str) -> bool:
         try:
-            success = self.provider.send_sms(self.recipient_number, message_text)
-            if success:
-                logger.info(f"SMS sent successfully via {self.provider_name}")
-            else:
-                logger.error(f"Failed to send SMS via {self.provider_name}")
-            return success
-            
+            return bool(self.provider.send_sms(to, message_text))
         except Exception as e:
-            logger.error(f"Failed to send SMS via {self.provider_name}: {e}")
+            logger.error(f"Failed to send SMS via {self.provider_name} to {to}: {e}")
             return False
     
+    def _fan_out(self, message_text: str, recipients: List[str]) -> Dict[str, bool]:
+        """
+        Send the prepared message to the recipients: one request for a single
+        recipient or a bulk-capable provider, a bounded thread pool otherwise.
+        """
+        if len(recipients) == 1:
+            return {recipients[0]: self._send_one(recipients[0], message_text)}
+        
+        if self.provider.supports_bulk:
+            try:
+                statuses = self.provider.send_bulk(recipients, message_text)
+                return {to: bool(statuses.get(to)) for to in recipients}
+            except Exception as e:
+                logger.error(f"Failed to send bulk SMS via {self.provider_name}: {e}")
+                return {to: False for to in recipients}
+        
+        workers = min(self.max_concurrency, len(recipients))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sms-fan-out") as pool:
+            results = pool.map(lambda to: self._send_one(to, message_text), recipients)
+            return dict(zip(recipients, results))
+    
     def send_gr20_report(self, report_data: Dict[str, Any]) -> bool:
         """
         Send a GR20 weather report SMS.
@@ -203,9 +270,14 @@ class ModularSmsClient:
                 - report_type: "morning", "evening", or "dynamic"
                 - weather_data: Detailed weather data for formatting
                 - report_time: Datetime of the report
+                - recipients: Optional numbers to send to (outbox messages)
                 
         Returns:
             True if SMS sent successfully, False otherwise
+
+        Raises:
+            PartialDelivery: Only some of the given recipients were reached;
+                its retry payload lists the others
         """
         logger.info("Modular SMS send_gr20_report called")
         
@@ -216,8 +288,8 @@ class ModularSmsClient:
         # SMS must ONLY contain the compact result_output (no debug)
         message_text = report_data.get("result_output")
         if not message_text:
-            # Fallback: generate text but do NOT append debug
-            generated = generate_gr20_report_text(report_data, self.config)
+            # Fallback: generate text but do NOT append (or render) debug
+            generated = generate_gr20_report_text(report_data, self.config, include_debug=False)
             # If generate_gr20_report_text appended debug, strip it at marker
             marker = "# DEBUG DATENEXPORT"
             if marker in generated:
@@ -226,5 +298,20 @@ class ModularSmsClient:
                 message_text = generated
         logger.info(f"Generated SMS text: {message_text}")
         
-        # Send SMS
-        return self.send_sms(message_text) 
\ No newline at end of file
+        queued = report_data.get("recipients")
+        if queued is None:
+            return self.send_sms(message_text)
+        # Numbers removed from the configuration (or mode changed) since the report was queued
+        recipients = [number for number in queued if number in self.recipients]
+        if len(recipients) < len(queued):
+            removed = [number for number in queued if number not in recipients]
+            logger.info(f"Not sending to {', '.join(removed)} - no longer SMS recipients")
+        if not recipients:
+            return True
+        statuses = self.send_to_recipients(message_text, recipients=recipients)
+        failed = [number for number in recipients if not statuses.get(number)]
+        if not failed:
+            return True
+        if len(failed) == len(recipients):
+            return False
+        raise PartialDelivery(dict(report_data, recipients=failed), f"not delivered to {', '.join(failed)}") 
\ No newline at end of file
@@ -0,0 +1,449 @@
+"""
+Notification Outbox
+
+Durable SQLite queue for outbound notifications. Reports are enqueued per
+channel (email, sms, ...) and delivered by one worker thread per channel,
+so report generation returns as soon as the message is stored. Failed
+deliveries are retried with exponential backoff; a message that is still
+failing after max_attempts is kept with status 'failed'. Every message is
+identified by its report id and channel, so enqueuing the same report
+again while it is still queued (e.g. after a crash and restart) does not
+send it twice; a report that was already delivered or given up is queued
+again, so an explicit re-run is sent. A sender that delivered a message
+only in part (e.g. an SMS that reached some of its recipients) raises
+PartialDelivery, and only the undelivered rest is retried.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_FILENAME = "outbox.sqlite"
+
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    report_id TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    claimed_at REAL,
+    last_error TEXT,
+    created_at TEXT NOT NULL,
+    UNIQUE (report_id, channel)
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (channel, status, next_attempt_at);
+"""
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    return str(value)
+
+
+def _decode(value: Dict[str, Any]) -> Any:
+    if set(value) == {"$datetime"}:
+        return datetime.fromisoformat(value["$datetime"])
+    return value
+
+
+def report_id(report_data: Dict[str, Any], route: Optional[str] = None) -> str:
+    """
+    Return the deduplication id of a report.
+
+    Reports of the same route, stage, type and day with the same text get the
+    same id; a changed dynamic report gets a new one.
+
+    Args:
+        report_data: Report data as passed to send_gr20_report
+        route: Route name (None for the single-route setup)
+
+    Returns:
+        Id like '2025-08-01/default/morning/Corte/3f2a9c1e0b7d'
+    """
+    report_time = report_data.get("report_time") or datetime.now()
+    text = report_data.get("result_output") or report_data.get("risk_description") or ""
+    digest = hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+    return "/".join([report_time.strftime("%Y-%m-%d"), route or "default",
+                     report_data.get("report_type", ""), report_data.get("location", ""), digest])
+
+
+def channel_name(kind: str, route: Optional[str] = None) -> str:
+    """Return the channel of a client kind ('email', 'sms') for a route ('email' for the default route)."""
+    if route is None or route == "default":
+        return kind
+    return f"{kind}:{route}"
+
+
+class PartialDelivery(Exception):
+    """
+    Raised by a sender that delivered a message only in part.
+
+    The message is retried with retry_payload (e.g. only the recipients
+    that were not reached) instead of its original payload.
+    """
+
+    def __init__(self, retry_payload: Dict[str, Any], error: str = "partly delivered"):
+        super().__init__(error)
+        self.retry_payload = retry_payload
+
+
+@dataclass
+class OutboxMessage:
+    """One queued notification."""
+    id: int
+    report_id: str
+    channel: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+class Outbox:
+    """
+    Persistent notification queue with retry backoff and deduplication.
+    """
+
+    def __init__(self, db_path: str, max_attempts: int = 6, base_delay: float = 30,
+                 max_delay: float = 3600, claim_timeout: float = 600,
+                 clock: Callable[[], float] = time.time):
+        """
+        Initialize the outbox.
+
+        Args:
+            db_path: Path of the SQLite database file (created on first use)
+            max_attempts: Delivery attempts before a message is given up
+            base_delay: Seconds before the first retry (doubled per attempt)
+            max_delay: Upper bound of the retry delay in seconds
+            claim_timeout: Seconds after which an unfinished delivery is retried
+                (the worker that claimed it crashed)
+            clock: Source of the current time in seconds
+        """
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.claim_timeout = claim_timeout
+        self.clock = clock
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], state_dir: str = "data") -> "Outbox":
+        """
+        Create the outbox from the 'outbox' section of config.yaml.
+
+        Args:
+            config: Configuration dictionary
+            state_dir: Directory of the outbox database
+
+        Returns:
+            Outbox with max_attempts, base_delay_seconds and max_delay_seconds from config
+        """
+        outbox_config = config.get("outbox", {})
+        return cls(os.path.join(state_dir, OUTBOX_FILENAME),
+                   max_attempts=outbox_config.get("max_attempts", 6),
+                   base_delay=outbox_config.get("base_delay_seconds", 30),
+                   max_delay=outbox_config.get("max_delay_seconds", 3600))
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection and make sure the schema exists."""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.db_path, timeout=10)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def enqueue(self, report_id: str, channel: str, payload: Dict[str, Any]) -> bool:
+        """
+        Queue a message for delivery.
+
+        Args:
+            report_id: Deduplication id of the report
+            channel: Delivery channel (a sender of OutboxDispatcher)
+            payload: Report data (datetimes are preserved, other non-JSON values become strings)
+
+        Returns:
+            True if queued, False if the report is still queued for this channel
+            (a delivered or given up report is queued again)
+        """
+        data = json.dumps(payload, separators=(',', ':'), default=_encode)
+        connection = self._connect()
+        try:
+            with connection:
+                cursor = connection.execute(
+                    "INSERT INTO outbox (report_id, channel, payload, status, next_attempt_at, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (report_id, channel) DO UPDATE SET payload = excluded.payload, "
+                    "status = excluded.status, attempts = 0, next_attempt_at = excluded.next_attempt_at, "
+                    "claimed_at = NULL, last_error = NULL, created_at = excluded.created_at "
+                    "WHERE outbox.status IN (?, ?)",
+                    (report_id, channel, data, PENDING, self.clock(), datetime.now().isoformat(), SENT, FAILED)
+                )
+        finally:
+            connection.close()
+
+        if cursor.rowcount == 0:
+            logger.info(f"Report {report_id} already queued for {channel} - skipped")
+            return False
+        logger.debug(f"Queued report {report_id} for {channel}")
+        return True
+
+    def claim(self, channel: str) -> Optional[OutboxMessage]:
+        """
+        Take the oldest due message of a channel for delivery.
+
+        Args:
+            channel: Delivery channel
+
+        Returns:
+            Claimed message or None if nothing is due
+        """
+        now = self.clock()
+        connection = self._connect()
+        try:
+            with connection:
+                row = connection.execute(
+                    "SELECT * FROM outbox WHERE channel = ? AND ("
+                    "(status = ? AND next_attempt_at <= ?) OR (status = ? AND claimed_at <= ?)"
+                    ") ORDER BY next_attempt_at, id LIMIT 1",
+                    (channel, PENDING, now, SENDING, now - self.claim_timeout)
+                ).fetchone()
+                if row is None:
+                    return None
+                cursor = connection.execute(
+                    "UPDATE outbox SET status = ?, claimed_at = ?, attempts = attempts + 1 "
+                    "WHERE id = ? AND status = ? AND attempts = ?",
+                    (SENDING, now, row['id'], row['status'], row['attempts'])
+                )
+        finally:
+            connection.close()
+
+        if cursor.rowcount == 0:
+            # Claimed by another process in the meantime
+            return None
+        return OutboxMessage(id=row['id'], report_id=row['report_id'], channel=channel,
+                             payload=json.loads(row['payload'], object_hook=_decode),
+                             attempts=row['attempts'] + 1)
+
+    def mark_sent(self, message: OutboxMessage) -> None:
+        """Record a successful delivery."""
+        self._update(message, SENT, None, None)
+
+    def mark_failed(self, message: OutboxMessage, error: str,
+                    payload: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record a failed delivery and schedule the retry.
+
+        Args:
+            message: Claimed message
+            error: Error description
+            payload: Payload to retry with instead of the original one
+                (the undelivered rest of a partial delivery)
+        """
+        if message.attempts >= self.max_attempts:
+            logger.error(f"Giving up {message.channel} delivery of {message.report_id} "
+                         f"after {message.attempts} attempts: {error}")
+            self._update(message, FAILED, None, error, payload)
+            return
+        delay = min(self.max_delay, self.base_delay * 2 ** (message.attempts - 1))
+        logger.warning(f"{message.channel} delivery of {message.report_id} failed ({error}) - "
+                       f"retry in {delay:.0f}s")
+        self._update(message, PENDING, self.clock() + delay, error, payload)
+
+    def _update(self, message: OutboxMessage, status: str, next_attempt_at: Optional[float],
+                error: Optional[str], payload: Optional[Dict[str, Any]] = None) -> None:
+        data = None if payload is None else json.dumps(payload, separators=(',', ':'), default=_encode)
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    "UPDATE outbox SET status = ?, next_attempt_at = COALESCE(?, next_attempt_at), "
+                    "claimed_at = NULL, last_error = ?, payload = COALESCE(?, payload) WHERE id = ?",
+                    (status, next_attempt_at, error, data, message.id)
+                )
+        finally:
+            connection.close()
+
+    def due_count(self, channels: Optional[Iterable[str]] = None) -> int:
+        """
+        Count messages that are due now or being delivered.
+
+        Args:
+            channels: Only count these channels (all if None)
+
+        Returns:
+            Number of messages
+        """
+        if not os.path.exists(self.db_path):
+            return 0
+        query = "SELECT COUNT(*) FROM outbox WHERE ((status = ? AND next_attempt_at <= ?) OR status = ?)"
+        params: List[Any] = [PENDING, self.clock(), SENDING]
+        if channels is not None:
+            channels = list(channels)
+            query += f" AND channel IN ({', '.join('?' for _ in channels)})"
+            params.extend(channels)
+        connection = self._connect()
+        try:
+            return connection.execute(query, params).fetchone()[0]
+        finally:
+            connection.close()
+
+    def status(self, report_id: str, channel: str) -> Optional[str]:
+        """Return the delivery status of a report on a channel (None if never queued)."""
+        if not os.path.exists(self.db_path):
+            return None
+        connection = self._connect()
+        try:
+            row = connection.execute("SELECT status FROM outbox WHERE report_id = ? AND channel = ?",
+                                     (report_id, channel)).fetchone()
+        finally:
+            connection.close()
+        return row['status'] if row else None
+
+
+class OutboxDispatcher:
+    """
+    Delivery workers of an Outbox, one thread per channel.
+    """
+
+    def __init__(self, outbox: Outbox, senders: Dict[str, Callable[[Dict[str, Any]], bool]],
+                 poll_interval: float = 5):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            outbox: Queue to deliver from
+            senders: Send function per channel; returns True on success
+                (or raises PartialDelivery with the payload to retry)
+            poll_interval: Seconds an idle worker waits before looking for due retries
+        """
+        self.outbox = outbox
+        self.senders = dict(senders)
+        self.poll_interval = poll_interval
+        self._wake = {channel: threading.Event() for channel in self.senders}
+        self._stop = threading.Event()
+        self._workers: List[threading.Thread] = []
+
+    def start(self) -> None:
+        """Start one worker per channel."""
+        self._stop.clear()
+        for channel in self.senders:
+            self._start_worker(channel)
+
+    def _start_worker(self, channel: str) -> None:
+        worker = threading.Thread(target=self._work, args=(channel,), name=f"outbox-{channel}", daemon=True)
+        self._workers.append(worker)
+        worker.start()
+
+    def add_sender(self, channel: str, sender: Callable[[Dict[str, Any]], bool]) -> bool:
+        """
+        Deliver another channel; its worker starts at once if the dispatcher is running.
+
+        Args:
+            channel: Delivery channel
+            sender: Send function of the channel
+
+        Returns:
+            True if the channel was added, False if it already had a sender
+        """
+        if channel in self.senders:
+            return False
+        self.senders[channel] = sender
+        self._wake[channel] = threading.Event()
+        if self._workers and not self._stop.is_set():
+            self._start_worker(channel)
+        return True
+
+    def wake(self, channel: Optional[str] = None) -> None:
+        """Let the worker of a channel (all channels if None) look for new messages at once."""
+        for name, event in self._wake.items():
+            if channel is None or name == channel:
+                event.set()
+
+    def deliver_one(self, channel: str) -> bool:
+        """
+        Deliver the oldest due message of a channel.
+
+        Returns:
+            True if a message was processed (delivered or rescheduled)
+        """
+        message = self.outbox.claim(channel)
+        if message is None:
+            return False
+        retry_payload = None
+        try:
+            delivered = self.senders[channel](message.payload)
+            error = None if delivered else "sender reported failure"
+        except PartialDelivery as e:
+            error = str(e)
+            retry_payload = e.retry_payload
+        except Exception as e:
+            error = str(e)
+        if error is None:
+            self.outbox.mark_sent(message)
+            logger.info(f"Delivered {message.report_id} via {channel}")
+        else:
+            self.outbox.mark_failed(message, error, retry_payload)
+        return True
+
+    def _work(self, channel: str) -> None:
+        wake = self._wake[channel]
+        while not self._stop.is_set():
+            try:
+                if self.deliver_one(channel):
+                    continue
+            except Exception as e:
+                logger.error(f"Outbox worker {channel} failed: {e}")
+            wake.wait(self.poll_interval)
+            wake.clear()
+
+    def drain(self, timeout: float) -> bool:
+        """
+        Wait until no message of the dispatcher's channels is due or being delivered.
+
+        Messages scheduled for a later retry stay queued for the next run.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the queue was drained in time
+        """
+        deadline = time.monotonic() + timeout
+        self.wake()
+        while self.outbox.due_count(self.senders) > 0:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the workers after their running delivery.
+
+        Args:
+            timeout: Maximum seconds to wait per worker (unlimited if None)
+        """
+        self._stop.set()
+        self.wake()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
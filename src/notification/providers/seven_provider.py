@@ -7,8 +7,9 @@ via the seven.io HTTP REST API.
 
 import requests
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 from ..sms_provider import SmsProvider
+from ..gsm7_validator import GSM7Validator, SEGMENT_SEPTETS
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +19,12 @@ class SevenProvider(SmsProvider):
     Seven.io SMS provider implementation.
     
     This class handles SMS sending via the seven.io HTTP REST API
-    with proper authentication and error handling.
+    with proper authentication and error handling. Several recipients
+    are sent in one API request (comma-separated "to").
     """
     
+    supports_bulk = True
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize the Seven.io SMS provider.
@@ -53,7 +57,7 @@ class SevenProvider(SmsProvider):
         
         Args:
             to: Recipient phone number
-            message: Message text to send (max 160 characters)
+            message: Message text to send (max 160 GSM-7 septets)
             
         Returns:
             True if SMS sent successfully, False otherwise
@@ -66,11 +70,12 @@ class SevenProvider(SmsProvider):
             logger.warning("Empty message text provided")
             return False
         
-        # Ensure message doesn't exceed 160 characters
+        # Ensure message fits into one SMS (extension characters count twice)
         message = message.strip()
-        if len(message) > 160:
-            message = message[:160]
-            logger.info("Message truncated to 160 characters")
+        truncated = GSM7Validator().truncate_to_septets(message, SEGMENT_SEPTETS)
+        if truncated != message:
+            message = truncated
+            logger.info("Message truncated to 160 GSM-7 septets")
         
         logger.info(f"Sending SMS via seven.io to {to}: {message[:50]}...")
         
@@ -104,6 +109,79 @@ class SevenProvider(SmsProvider):
             logger.error(f"Failed to send SMS via seven.io: {e}")
             return False
     
+    def send_bulk(self, recipients: List[str], message: str) -> Dict[str, bool]:
+        """
+        Send the same SMS to several recipients in one seven.io API request.
+        
+        Args:
+            recipients: Recipient phone numbers
+            message: Message text to send (max 160 GSM-7 septets)
+            
+        Returns:
+            Delivery status per recipient (from the JSON response if available,
+            otherwise the HTTP status of the request)
+        """
+        statuses = {to: False for to in recipients}
+        if not recipients:
+            return statuses
+        if not self.is_configured():
+            logger.error("Seven.io provider not properly configured")
+            return statuses
+        
+        if not message or not message.strip():
+            logger.warning("Empty message text provided")
+            return statuses
+        
+        message = message.strip()
+        truncated = GSM7Validator().truncate_to_septets(message, SEGMENT_SEPTETS)
+        if truncated != message:
+            message = truncated
+            logger.info("Message truncated to 160 GSM-7 septets")
+        
+        logger.info(f"Sending SMS via seven.io to {len(recipients)} recipients: {message[:50]}...")
+        
+        try:
+            headers = {
+                "Authorization": f"Bearer {self.api_key}"
+            }
+            data = {
+                "to": ",".join(recipients),
+                "from": self.sender,
+                "text": message,
+                "json": 1
+            }
+            
+            response = requests.post(self.api_url, headers=headers, data=data, timeout=30)
+            
+            logger.info(f"Seven.io API response: {response.status_code}")
+            
+            if response.status_code != 200:
+                logger.error(f"Failed to send SMS via seven.io: HTTP {response.status_code}")
+                return statuses
+            
+            try:
+                messages = response.json().get("messages") or []
+            except (ValueError, AttributeError):
+                messages = []
+            if not messages:
+                # No per-message details: the request as a whole succeeded
+                return {to: True for to in recipients}
+            
+            # seven.io reports recipients without '+' or leading zeros
+            by_digits = {''.join(c for c in to if c.isdigit()).lstrip('0'): to for to in recipients}
+            for entry in messages:
+                digits = ''.join(c for c in str(entry.get("recipient", "")) if c.isdigit()).lstrip('0')
+                to = by_digits.get(digits)
+                if to is not None:
+                    statuses[to] = bool(entry.get("success"))
+                    if not statuses[to]:
+                        logger.error(f"seven.io could not deliver SMS to {to}: {entry.get('error_text') or entry.get('error')}")
+            return statuses
+                
+        except Exception as e:
+            logger.error(f"Failed to send SMS via seven.io: {e}")
+            return statuses
+    
     def is_configured(self) -> bool:
         """
         Check if the Seven.io provider is properly configured.
@@ -9,6 +9,7 @@ import requests
 import logging
 from typing import Dict, Any
 from ..sms_provider import SmsProvider
+from ..gsm7_validator import GSM7Validator, SEGMENT_SEPTETS
 
 logger = logging.getLogger(__name__)
 
@@ -55,7 +56,7 @@ class TwilioProvider(SmsProvider):
         
         Args:
             to: Recipient phone number
-            message: Message text to send (max 160 characters)
+            message: Message text to send (max 160 GSM-7 septets)
             
         Returns:
             True if SMS sent successfully, False otherwise
@@ -68,11 +69,12 @@ class TwilioProvider(SmsProvider):
             logger.warning("Empty message text provided")
             return False
         
-        # Ensure message doesn't exceed 160 characters
+        # Ensure message fits into one SMS (extension characters count twice)
         message = message.strip()
-        if len(message) > 160:
-            message = message[:160]
-            logger.info("Message truncated to 160 characters")
+        truncated = GSM7Validator().truncate_to_septets(message, SEGMENT_SEPTETS)
+        if truncated != message:
+            message = truncated
+            logger.info("Message truncated to 160 GSM-7 septets")
         
         logger.info(f"Sending SMS via Twilio to {to}: {message[:50]}...")
         
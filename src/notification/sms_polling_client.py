@@ -3,8 +3,15 @@ SMS Polling Client.
 
 This module provides functionality to poll incoming SMS messages
 from seven.io API and process configuration commands.
+
+Polling is incremental: only the inbound journal since the date of the
+last processed message is requested (the API filters by date, not by
+id), and already processed ids are skipped client-side. In long-running
+mode (run_forever) the poll interval adapts: short after a command was
+received, growing while the inbox stays quiet.
 """
 
+import asyncio
 import requests
 import logging
 import time
@@ -16,6 +23,34 @@ import os
 
 logger = logging.getLogger(__name__)
 
+INBOUND_JOURNAL_URL = "https://gateway.seven.io/api/journal/inbound"
+
+
+class AdaptivePollInterval:
+    """
+    Poll interval that drops to min_interval after activity and grows by
+    factor up to max_interval while polls find nothing.
+    """
+    
+    def __init__(self, min_interval: float = 5, max_interval: float = 300, factor: float = 2.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.factor = factor
+        self.current = min_interval
+    
+    def next(self, active: bool) -> float:
+        """
+        Return the delay before the next poll.
+        
+        Args:
+            active: True if the last poll found new messages
+        """
+        if active:
+            self.current = self.min_interval
+        else:
+            self.current = min(self.max_interval, self.current * self.factor)
+        return self.current
+
 
 class SMSPollingClient:
     """
@@ -39,8 +74,33 @@ class SMSPollingClient:
         self.processed_messages = set()  # Track processed message IDs (in-memory)
         self.last_id_file = "data/last_sms_id.txt"
         self.last_processed_id = self._load_last_processed_id()
+        self.last_processed_date = self._load_last_processed_date()
+        self.page_limit = 100
+        self.session = requests.Session()
         logger.info("SMS Polling Client initialized")
     
+    @property
+    def _last_date_file(self) -> str:
+        """Date cursor file, stored next to the last ID file."""
+        return os.path.splitext(self.last_id_file)[0] + "_date.txt"
+    
+    def _load_last_processed_date(self) -> str:
+        try:
+            if os.path.exists(self._last_date_file):
+                with open(self._last_date_file, "r", encoding="utf-8") as f:
+                    return f.read().strip()
+        except Exception as e:
+            logger.warning(f"Could not read last processed SMS date: {e}")
+        return ""
+    
+    def _save_last_processed_date(self, last_date: str):
+        try:
+            os.makedirs(os.path.dirname(self._last_date_file), exist_ok=True)
+            with open(self._last_date_file, "w", encoding="utf-8") as f:
+                f.write(last_date)
+        except Exception as e:
+            logger.warning(f"Could not save last processed SMS date: {e}")
+    
     def _load_last_processed_id(self) -> str:
         try:
             if os.path.exists(self.last_id_file):
@@ -89,20 +149,27 @@ class SMSPollingClient:
             logger.info(f"Processing {len(filtered)} new message(s) since last ID {self.last_processed_id}")
             
             # Process each message
+            # Config commands of this poll are written to config.yaml in one atomic write
             commands_processed = 0
             max_id = None
-            for message in filtered:
-                if self._process_message(message):
-                    commands_processed += 1
-                # Track max ID (only for numeric IDs)
-                msg_id = str(message.get("id", ""))
-                if msg_id.isdigit():
-                    if max_id is None or int(msg_id) > int(max_id):
-                        max_id = msg_id
-            # Save last processed ID
+            max_date = None
+            with self.config_processor.transaction():
+                for message in filtered:
+                    if self._process_message(message):
+                        commands_processed += 1
+                    # Track max ID (only for numeric IDs)
+                    msg_id = str(message.get("id", ""))
+                    if msg_id.isdigit():
+                        if max_id is None or int(msg_id) > int(max_id):
+                            max_id = msg_id
+                            max_date = str(message.get("timestamp") or "")[:10] or None
+            # Save last processed ID and the date cursor for the next fetch
             if filtered and max_id:
                 self._save_last_processed_id(max_id)
                 self.last_processed_id = max_id
+                if max_date and max_date > self.last_processed_date:
+                    self._save_last_processed_date(max_date)
+                    self.last_processed_date = max_date
             return {
                 "success": True,
                 "messages_found": len(messages),
@@ -123,24 +190,29 @@ class SMSPollingClient:
         """
         Fetch incoming SMS messages from seven.io API (journal/inbound).
         
+        Only messages since the date of the last processed message are
+        requested (date_from); without a date cursor the latest page_limit
+        messages are fetched.
+        
         Returns:
             List of message dictionaries
         """
-        api_url = "https://gateway.seven.io/api/journal/inbound"
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Accept": "application/json"
         }
+        params = {"limit": self.page_limit}
+        if self.last_processed_date:
+            params["date_from"] = self.last_processed_date
         try:
-            response = requests.get(api_url, headers=headers, timeout=30)
+            response = self.session.get(INBOUND_JOURNAL_URL, headers=headers, params=params, timeout=30)
             logger.debug(f"Seven.io API response status: {response.status_code}")
-            logger.debug(f"Seven.io API response text: {response.text}")
             try:
                 data = response.json()
-                logger.debug(f"Seven.io API response JSON: {data}")
             except Exception as e:
-                logger.warning(f"Could not parse JSON from Seven.io API response: {e}")
-                data = response.text
+                logger.warning(f"Could not parse JSON from Seven.io API response "
+                               f"(HTTP {response.status_code}, {len(response.content or b'')} bytes): {e}")
+                data = None
             # Expecting a list of messages
             if isinstance(data, list):
                 messages = data
@@ -310,6 +382,9 @@ class SMSPollingClient:
                     "message": f"INVALID MODE: Must be one of {valid_modes}"
                 }
             
+            # Write queued config changes first, the report runs in a separate process
+            self.config_processor.commit()
+            
             # Trigger the weather report
             logger.info(f"Triggering weather report in {value} mode")
             success = self._trigger_weather_report(value)
@@ -415,4 +490,35 @@ class SMSPollingClient:
         
         # For now, we'll just log the cleanup
         logger.info(f"Cleaning up message tracking (older than {max_age_hours} hours)")
-        logger.debug(f"Current processed messages count: {len(self.processed_messages)}") 
\ No newline at end of file
+        logger.debug(f"Current processed messages count: {len(self.processed_messages)}")
+    
+    async def run_forever(self, stop_event: Optional[asyncio.Event] = None,
+                          min_interval: float = 5, max_interval: float = 300) -> None:
+        """
+        Poll continuously with an adaptive interval until stop_event is set.
+        
+        After a poll that processed a command the next poll follows after
+        min_interval seconds (a command is often followed by another);
+        each quiet poll doubles the interval up to max_interval. Polls run
+        in the default executor so the event loop stays responsive.
+        
+        Args:
+            stop_event: Event that ends the loop (runs until cancelled if None)
+            min_interval: Shortest poll interval in seconds
+            max_interval: Longest poll interval in seconds
+        """
+        stop_event = stop_event or asyncio.Event()
+        interval = AdaptivePollInterval(min_interval, max_interval)
+        loop = asyncio.get_running_loop()
+        logger.info(f"SMS polling started (interval {min_interval}-{max_interval}s)")
+        
+        while not stop_event.is_set():
+            result = await loop.run_in_executor(None, self.poll_incoming_sms)
+            delay = interval.next(result["commands_processed"] > 0)
+            logger.debug(f"Next SMS poll in {delay:.0f}s")
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+        
+        logger.info("SMS polling stopped") 
\ No newline at end of file
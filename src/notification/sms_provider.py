@@ -6,7 +6,7 @@ allowing easy integration of different SMS services.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 
 class SmsProvider(ABC):
@@ -16,8 +16,13 @@ class SmsProvider(ABC):
     This class defines the interface that all SMS providers must implement.
     Concrete implementations should inherit from this class and implement
     the required methods.
+    
+    Providers whose API accepts several recipients in one request set
+    supports_bulk and override send_bulk.
     """
     
+    supports_bulk = False
+    
     @abstractmethod
     def send_sms(self, to: str, message: str) -> bool:
         """
@@ -40,4 +45,19 @@ class SmsProvider(ABC):
         Returns:
             True if provider is configured and ready to send SMS
         """
-        pass 
\ No newline at end of file
+        pass
+    
+    def send_bulk(self, recipients: List[str], message: str) -> Dict[str, bool]:
+        """
+        Send the same SMS message to several recipients.
+        
+        The default implementation sends one message per recipient.
+        
+        Args:
+            recipients: Recipient phone numbers
+            message: Message text to send
+            
+        Returns:
+            Delivery status per recipient
+        """
+        return {to: self.send_sms(to, message) for to in recipients}
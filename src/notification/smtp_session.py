@@ -0,0 +1,163 @@
+"""
+SMTP Session
+
+Reusable authenticated SMTP connection. Connecting, STARTTLS and login are
+done once per session instead of once per mail:
+
+- with idle_timeout > 0 the connection stays open between sends and is
+  closed after idle_timeout seconds without use
+- hold() keeps the connection open for a batch of sends
+- a reused connection that was dropped by the server is reconnected and
+  the send retried once
+
+With idle_timeout 0 (default) and outside hold() every send opens and
+closes its own connection, as before.
+"""
+
+import logging
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Errors of a connection the server has closed in the meantime
+_DROPPED_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class SmtpSession:
+    """
+    Lazily connected, reusable SMTP connection with STARTTLS and login.
+    """
+
+    def __init__(self, host: str, port: int, user: str, password: Optional[str] = None,
+                 idle_timeout: float = 0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the session (no connection is opened yet).
+
+        Args:
+            host: SMTP server
+            port: SMTP port
+            user: Login user
+            password: Login password (empty login if None)
+            idle_timeout: Seconds an unused connection is kept open (0: close after each send)
+            clock: Monotonic clock
+        """
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self.connect_count = 0
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._holders = 0
+        self._lock = threading.RLock()
+        self._idle_timer: Optional[threading.Timer] = None
+
+    @property
+    def connected(self) -> bool:
+        """True while a connection is open."""
+        return self._server is not None
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port)
+        try:
+            server.starttls()
+            server.login(self.user, self.password or "")
+        except Exception:
+            server.close()
+            raise
+        self.connect_count += 1
+        return server
+
+    def _close(self) -> None:
+        server, self._server = self._server, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception as e:
+            logger.debug(f"SMTP quit failed: {e}")
+            server.close()
+
+    def send(self, sender: str, recipients: Union[str, List[str]], message: str) -> None:
+        """
+        Send one message over the session.
+
+        Args:
+            sender: Envelope sender
+            recipients: Envelope recipient(s)
+            message: Complete message (headers and body)
+
+        Raises:
+            smtplib.SMTPException, OSError: If the message could not be sent
+        """
+        with self._lock:
+            self._cancel_idle_timer()
+            if self._server is not None and self.idle_timeout > 0 \
+                    and self.clock() - self._last_used > self.idle_timeout:
+                self._close()
+
+            reused = self._server is not None
+            if not reused:
+                self._server = self._connect()
+            try:
+                self._server.sendmail(sender, recipients, message)
+            except _DROPPED_CONNECTION_ERRORS as e:
+                self._close()
+                if not reused:
+                    raise
+                logger.info(f"SMTP connection dropped ({e}) - reconnecting")
+                self._server = self._connect()
+                self._server.sendmail(sender, recipients, message)
+            except Exception:
+                self._close()
+                raise
+            self._last_used = self.clock()
+            self._release()
+
+    def _release(self) -> None:
+        """Close or schedule closing of the connection after a send or batch."""
+        if self._holders:
+            return
+        if self.idle_timeout <= 0:
+            self._close()
+        else:
+            self._idle_timer = threading.Timer(self.idle_timeout, self.close_if_idle)
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    def _cancel_idle_timer(self) -> None:
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def close_if_idle(self) -> None:
+        """Close the connection if it was not used for idle_timeout seconds."""
+        with self._lock:
+            if not self._holders and self.clock() - self._last_used >= self.idle_timeout:
+                self._close()
+
+    @contextmanager
+    def hold(self) -> Iterator["SmtpSession"]:
+        """Keep one connection open for all sends within the block."""
+        with self._lock:
+            self._holders += 1
+            self._cancel_idle_timer()
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._holders -= 1
+                if self._server is not None:
+                    self._release()
+
+    def close(self) -> None:
+        """Close the connection now."""
+        with self._lock:
+            self._cancel_idle_timer()
+            self._close()
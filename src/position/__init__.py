@@ -13,6 +13,7 @@ from .etappenlogik import (
     get_day_after_tomorrow_stage,
     load_etappen_data
 )
+from .route_registry import Route, RouteRegistry
 
 __all__ = [
     'get_current_stage',
@@ -20,5 +21,7 @@ __all__ = [
     'get_stage_info',
     'get_next_stage',
     'get_day_after_tomorrow_stage',
-    'load_etappen_data'
+    'load_etappen_data',
+    'Route',
+    'RouteRegistry'
 ] 
\ No newline at end of file
@@ -0,0 +1,148 @@
+"""
+Route registry for running several itineraries in one process.
+
+Each route has its own stage file (e.g. etappen.json.GR20) and may override
+any configuration section of config.yaml, typically startdatum, recipients
+and thresholds:
+
+    routes:
+      - name: GR20
+        etappen: etappen.json.GR20
+        startdatum: '2025-08-01'
+      - name: Hermannsweg
+        etappen: etappen.json.hermannsweg
+        startdatum: '2025-09-12'
+        smtp:
+          to: someone@example.com
+        thresholds:
+          rain_amount: 1.0
+
+Without a routes section the registry contains a single route made of
+config.yaml and etappen.json.
+"""
+
+import copy
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from .etappenlogik import load_etappen_data
+
+DEFAULT_ROUTE_NAME = "default"
+
+
+def merge_config(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a deep copy of base with override merged into it section by section.
+
+    Args:
+        base: Base configuration (not modified)
+        override: Values to override, nested dictionaries are merged
+
+    Returns:
+        Merged configuration
+    """
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+@dataclass
+class Route:
+    """One itinerary with its stage file and effective configuration."""
+    name: str
+    etappen_path: str
+    config: Dict[str, Any]
+    _etappen: Optional[List[Dict[str, Any]]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def etappen(self) -> List[Dict[str, Any]]:
+        """Stages of the route (loaded on first access)."""
+        if self._etappen is None:
+            self._etappen = load_etappen_data(self.etappen_path)
+        return self._etappen
+
+    def stage_offset(self, report_date: date) -> Optional[int]:
+        """
+        Return the zero-based index of the stage walked on report_date.
+
+        Args:
+            report_date: Report date
+
+        Returns:
+            Stage index or None if the route has not started or is finished
+        """
+        startdatum = self.config.get("startdatum")
+        if not startdatum:
+            return None
+        offset = (report_date - datetime.strptime(str(startdatum), "%Y-%m-%d").date()).days
+        if offset < 0 or offset >= len(self.etappen):
+            return None
+        return offset
+
+
+class RouteRegistry:
+    """
+    Registry of all configured routes.
+    """
+
+    def __init__(self, routes: List[Route]):
+        """
+        Initialize the registry.
+
+        Args:
+            routes: Routes in configuration order
+
+        Raises:
+            ValueError: If a route name is used twice
+        """
+        names = [route.name for route in routes]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate route names: {', '.join(duplicates)}")
+        self.routes = routes
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], base_dir: str = ".") -> "RouteRegistry":
+        """
+        Create the registry from the routes section of the configuration.
+
+        Args:
+            config: Configuration dictionary from config.yaml
+            base_dir: Directory relative stage file paths are resolved against
+
+        Returns:
+            RouteRegistry with one route per entry (or a single default route)
+
+        Raises:
+            ValueError: If a route entry has no name or no stage file
+        """
+        base = {key: value for key, value in config.items() if key != "routes"}
+        entries = config.get("routes") or []
+        if not entries:
+            return cls([Route(DEFAULT_ROUTE_NAME, os.path.join(base_dir, "etappen.json"), base)])
+
+        routes = []
+        for entry in entries:
+            overrides = dict(entry)
+            name = overrides.pop("name", None)
+            etappen = overrides.pop("etappen", None)
+            if not name or not etappen:
+                raise ValueError(f"Route entry needs 'name' and 'etappen': {entry}")
+            routes.append(Route(name, os.path.join(base_dir, etappen), merge_config(base, overrides)))
+        return cls(routes)
+
+    def __iter__(self) -> Iterator[Route]:
+        return iter(self.routes)
+
+    def __len__(self) -> int:
+        return len(self.routes)
+
+    def get(self, name: str) -> Optional[Route]:
+        """Return the route with the given name or None."""
+        return next((route for route in self.routes if route.name == name), None)
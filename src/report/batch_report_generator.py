@@ -0,0 +1,206 @@
+"""
+Batch report generation for all stages.
+
+Generates reports for several stages of the route concurrently for an
+explicit report date. The stage is selected by its offset from the route
+start; each worker uses its own copy of the configuration with a matching
+startdatum, so config.yaml is never modified. All workers share one forecast
+snapshot, so each route point is fetched only once. Debug output is not
+rendered here: each report carries its debug_report, which is rendered
+when the report is sent.
+
+generate_route_reports() does the same for today's stage of every route in
+a RouteRegistry, so several itineraries share one forecast client (token and
+HTTP pool), one fire risk dataset and grid-deduplicated forecast fetches.
+"""
+
+import copy
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from weather.core.morning_evening_refactor import MorningEveningRefactor
+    from weather.core.forecast_snapshot import ForecastSnapshot
+    from fire.risk_block_formatter import shared_fire_risk_data
+    from position.etappenlogik import load_etappen_data
+    from position.route_registry import RouteRegistry
+except ImportError:
+    from src.weather.core.morning_evening_refactor import MorningEveningRefactor
+    from src.weather.core.forecast_snapshot import ForecastSnapshot
+    from src.fire.risk_block_formatter import shared_fire_risk_data
+    from src.position.etappenlogik import load_etappen_data
+    from src.position.route_registry import RouteRegistry
+
+logger = logging.getLogger(__name__)
+
+# Coordinate precision for forecasts shared between routes (0.01° ~ 1 km, the AROME grid size)
+FORECAST_GRID_PRECISION = 2
+
+
+@dataclass
+class StageReport:
+    """Generated report of one stage."""
+    stage_offset: int
+    stage_name: str
+    report_date: date
+    report_type: str
+    result_output: str = ""
+    # Only set for reports without debug_report (e.g. "NO CHANGES" or errors)
+    debug_output: str = ""
+    # Rendered into the debug output at send time (MorningEveningRefactor.write_debug_report)
+    debug_report: Optional[Dict[str, Any]] = None
+    success: bool = False
+    error: Optional[str] = None
+    route: Optional[str] = None
+    # Coordinates a dynamic report was generated from stale cache entries
+    stale_coordinates: List[Tuple[float, float]] = field(default_factory=list)
+    # Forecast fingerprint the report was generated from ("" if none was fetched)
+    fingerprint: str = ""
+
+
+@dataclass
+class _StageJob:
+    """One stage report to generate."""
+    config: Dict[str, Any]
+    etappen: List[Dict[str, Any]]
+    etappen_path: str
+    stage_offset: int
+    route: Optional[str] = None
+    # Fingerprint of a forecast this dynamic report was already compared with
+    compared_fingerprint: Optional[str] = None
+
+
+def stage_config(config: Dict[str, Any], stage_offset: int, report_date: date) -> Dict[str, Any]:
+    """
+    Return a copy of the configuration in which the given stage is today's stage.
+
+    Args:
+        config: Base configuration (not modified)
+        stage_offset: Zero-based stage index in etappen.json
+        report_date: Report date
+
+    Returns:
+        Configuration copy with startdatum = report_date - stage_offset days
+    """
+    result = copy.deepcopy(config)
+    result['startdatum'] = (report_date - timedelta(days=stage_offset)).strftime('%Y-%m-%d')
+    return result
+
+
+def _job_coordinates(job: _StageJob) -> List[Tuple[float, float]]:
+    """Points of the stage and the two following stages (used by evening and thunderstorm +1)."""
+    stages = job.etappen[job.stage_offset:job.stage_offset + 3]
+    return [(p['lat'], p['lon']) for stage in stages for p in stage.get('punkte', [])]
+
+
+def _generate_stage_reports(jobs: List[_StageJob], report_type: str, report_date: date,
+                            max_workers: int, snapshot: ForecastSnapshot) -> List[StageReport]:
+    """Generate the reports of all jobs concurrently against one snapshot."""
+    with shared_fire_risk_data():
+        snapshot.prefetch([point for job in jobs for point in _job_coordinates(job)], max_workers=max_workers,
+                          allow_stale=report_type == 'dynamic')
+
+        def generate(job: _StageJob) -> StageReport:
+            stage_name = job.etappen[job.stage_offset]['name']
+            report = StageReport(stage_offset=job.stage_offset, stage_name=stage_name,
+                                 report_date=report_date, report_type=report_type, route=job.route)
+            try:
+                refactor = MorningEveningRefactor(stage_config(job.config, job.stage_offset, report_date),
+                                                  forecast_client=snapshot, etappen_path=job.etappen_path)
+                report.result_output, report.debug_output = refactor.generate_report(
+                    stage_name, report_type, report_date.strftime('%Y-%m-%d'),
+                    compared_fingerprint=job.compared_fingerprint, render_debug=False
+                )
+                report.debug_report = refactor.debug_report
+                report.stale_coordinates = list(refactor.stale_coordinates)
+                report.fingerprint = refactor.fingerprint
+                report.success = not report.result_output.endswith((": ERROR", ": NO DATA"))
+                if not report.success:
+                    report.error = report.result_output
+            except Exception as e:
+                logger.error(f"Failed to generate {report_type} report for {stage_name}: {e}")
+                report.error = str(e)
+            return report
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            reports = list(executor.map(generate, jobs))
+
+    logger.info(f"Generated {sum(r.success for r in reports)}/{len(reports)} {report_type} reports "
+                f"with {snapshot.fetch_count} forecast fetches")
+    return reports
+
+
+def generate_all_stage_reports(config: Dict[str, Any], report_type: str = 'evening',
+                               report_date: Optional[date] = None,
+                               stage_offsets: Optional[Iterable[int]] = None,
+                               etappen_path: str = "etappen.json",
+                               max_workers: int = 4,
+                               snapshot: Optional[ForecastSnapshot] = None) -> List[StageReport]:
+    """
+    Generate reports for several stages concurrently.
+
+    Args:
+        config: Base configuration (not modified, config.yaml is not touched)
+        report_type: 'morning', 'evening' or 'dynamic'
+        report_date: Report date (defaults to today)
+        stage_offsets: Zero-based stage indices (defaults to all stages)
+        etappen_path: Path to etappen.json
+        max_workers: Number of concurrent stage workers
+        snapshot: Shared forecast snapshot (a new one is created if None)
+
+    Returns:
+        One StageReport per requested stage, in the order of stage_offsets
+    """
+    report_date = report_date or date.today()
+    etappen = load_etappen_data(etappen_path)
+
+    offsets = list(range(len(etappen)) if stage_offsets is None else stage_offsets)
+    for offset in offsets:
+        if not 0 <= offset < len(etappen):
+            raise ValueError(f"Stage offset {offset} out of range (0-{len(etappen) - 1})")
+
+    jobs = [_StageJob(config, etappen, etappen_path, offset) for offset in offsets]
+    return _generate_stage_reports(jobs, report_type, report_date, max_workers, snapshot or ForecastSnapshot())
+
+
+def generate_route_reports(registry: RouteRegistry, report_type: str,
+                           report_date: Optional[date] = None,
+                           max_workers: int = 4,
+                           snapshot: Optional[ForecastSnapshot] = None,
+                           compared_fingerprints: Optional[Dict[Tuple[str, str], str]] = None
+                           ) -> List[StageReport]:
+    """
+    Generate the report of today's stage of every route in one run.
+
+    Routes that have not started yet or are finished are skipped.
+
+    Args:
+        registry: Routes to report on
+        report_type: 'morning', 'evening' or 'dynamic'
+        report_date: Report date (defaults to today)
+        max_workers: Number of concurrent stage workers
+        snapshot: Shared forecast snapshot (a grid-deduplicating one is created if None)
+        compared_fingerprints: Forecast fingerprint per (route, stage name) a dynamic
+            report was already compared with; such a stage is not compared again
+            while its forecast is unchanged
+
+    Returns:
+        One StageReport per active route, in registry order
+    """
+    report_date = report_date or date.today()
+    compared_fingerprints = compared_fingerprints or {}
+    jobs = []
+    for route in registry:
+        offset = route.stage_offset(report_date)
+        if offset is None:
+            logger.info(f"Route {route.name} has no stage on {report_date} - skipped")
+            continue
+        stage_name = route.etappen[offset]['name']
+        jobs.append(_StageJob(route.config, route.etappen, route.etappen_path, offset, route.name,
+                              compared_fingerprints.get((route.name, stage_name))))
+
+    snapshot = snapshot or ForecastSnapshot(precision=FORECAST_GRID_PRECISION)
+    return _generate_stage_reports(jobs, report_type, report_date, max_workers, snapshot)
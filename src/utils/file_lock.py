@@ -0,0 +1,92 @@
+"""
+File locking and atomic write helpers.
+
+Several independent processes (cron runs, SMS polling, batch scripts) share
+state files below .data/ and data/. These helpers serialize access to such
+files across processes and make sure readers never see half-written JSON.
+"""
+
+import json
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+@contextmanager
+def file_lock(lock_path: str, shared: bool = False) -> Iterator[None]:
+    """
+    Hold an advisory lock on lock_path for the duration of the block.
+
+    The lock file is created if necessary and left in place afterwards.
+    On platforms without fcntl the block runs unlocked.
+
+    Args:
+        lock_path: Path of the lock file (usually "<data file>.lock")
+        shared: Take a shared (read) lock instead of an exclusive one
+    """
+    directory = os.path.dirname(lock_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(lock_path, 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write_text(file_path: str, content: str, encoding: str = 'utf-8') -> None:
+    """
+    Replace file_path with content in a single rename.
+
+    The content is written to a temporary file in the same directory and
+    then moved over the target, so concurrent readers see either the old
+    or the new file, never a partial one. An existing target keeps its
+    permissions.
+
+    Args:
+        file_path: Target file
+        content: Full new file content
+        encoding: Text encoding
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(file_path)}.", suffix=".tmp")
+    try:
+        if os.path.exists(file_path):
+            # Keep the permissions of the replaced file (mkstemp creates 0600)
+            os.chmod(temp_path, stat.S_IMODE(os.stat(file_path).st_mode))
+        with os.fdopen(fd, 'w', encoding=encoding) as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(file_path: str, data: Any, **dump_kwargs: Any) -> None:
+    """
+    Serialize data as JSON and atomically replace file_path with it.
+
+    Args:
+        file_path: Target file
+        data: JSON-serializable data
+        **dump_kwargs: Extra arguments for json.dumps (e.g. indent, default)
+    """
+    atomic_write_text(file_path, json.dumps(data, **dump_kwargs))
@@ -0,0 +1,80 @@
+"""
+Report Deadline
+
+Time budget for one report run. Every upstream fetch and section processor
+is called through Deadline.call, which gives up once the budget is spent, so
+a single slow upstream (fire risk site, vigilance, a stuck forecast point)
+cannot stall the whole report. The abandoned call keeps running in a daemon
+thread and its result is discarded.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the time budget of a report run is spent."""
+
+
+class Deadline:
+    """
+    Time budget shared by all fetches and processors of one report run.
+    """
+
+    def __init__(self, seconds: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Start the budget.
+
+        Args:
+            seconds: Budget in seconds (None = unlimited)
+            clock: Monotonic clock
+        """
+        self.seconds = seconds
+        self.clock = clock
+        self.expires_at = None if seconds is None else clock() + seconds
+
+    def remaining(self) -> Optional[float]:
+        """Return the remaining seconds (None if unlimited, never negative)."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - self.clock())
+
+    def expired(self) -> bool:
+        """Return True if the budget is spent."""
+        return self.expires_at is not None and self.remaining() <= 0
+
+    def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Call func and wait for it at most for the remaining budget.
+
+        Without a budget func is called directly in the current thread.
+
+        Returns:
+            Return value of func
+
+        Raises:
+            DeadlineExceeded: If the budget is spent before func returns
+            Exception: Any exception raised by func
+        """
+        if self.expires_at is None:
+            return func(*args, **kwargs)
+        if self.expired():
+            raise DeadlineExceeded(f"Time budget of {self.seconds}s spent")
+
+        outcome = {}
+
+        def target():
+            try:
+                outcome['value'] = func(*args, **kwargs)
+            except BaseException as e:
+                outcome['error'] = e
+
+        worker = threading.Thread(target=target, daemon=True)
+        worker.start()
+        worker.join(self.remaining())
+        if worker.is_alive():
+            raise DeadlineExceeded(f"Time budget of {self.seconds}s spent")
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['value']
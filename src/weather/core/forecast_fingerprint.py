@@ -0,0 +1,55 @@
+"""
+Forecast Fingerprint
+
+Content fingerprint of the upstream forecast used for a report. It combines
+the model run timestamps (updated_on) of all stage points with a hash of the
+hourly, daily and probability entries that fall into the report window. Two
+fetches with the same fingerprint produce the same report, so dynamic runs can
+stop before any processing when the fingerprint of the last sent report
+matches.
+"""
+
+import hashlib
+import json
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List
+
+# Report window in days starting at the target date (today + thunderstorm +1)
+FINGERPRINT_DAYS = 2
+
+
+def _window_entries(entries: Iterable[Dict[str, Any]], start: float, end: float) -> List[Dict[str, Any]]:
+    """Return entries whose 'dt' timestamp lies in [start, end)."""
+    return [entry for entry in entries
+            if isinstance(entry, dict) and start <= (entry.get('dt') or 0) < end]
+
+
+def forecast_fingerprint(weather_data: Dict[str, Any], target_date: date,
+                         days: int = FINGERPRINT_DAYS) -> str:
+    """
+    Compute the fingerprint of fetched weather data for a report.
+
+    Args:
+        weather_data: Result of MorningEveningRefactor.fetch_weather_data
+        target_date: Report date
+        days: Number of days from target_date that influence the report
+
+    Returns:
+        Hex digest (empty string if no weather data is available)
+    """
+    if not weather_data:
+        return ""
+
+    start = datetime.combine(target_date, time.min).timestamp()
+    end = datetime.combine(target_date + timedelta(days=days), time.min).timestamp()
+
+    relevant = {
+        'model_runs': weather_data.get('model_runs', []),
+        'hourly': [_window_entries(point.get('data', []), start, end)
+                   for point in weather_data.get('hourly_data', [])],
+        'daily': _window_entries(weather_data.get('daily_forecast', {}).get('daily', []), start, end),
+        'probability': [_window_entries(point.get('data', []), start, end)
+                        for point in weather_data.get('probability_forecast', [])],
+    }
+    payload = json.dumps(relevant, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
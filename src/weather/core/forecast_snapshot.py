@@ -0,0 +1,229 @@
+"""
+Forecast Snapshot
+
+Thread-safe, memoizing wrapper around MeteoFranceClient.get_forecast. All
+reports generated against one snapshot see the same forecast per coordinate,
+and each coordinate is fetched only once even if several stages (or several
+lookups within one stage) request it concurrently.
+
+ForecastCache keeps forecasts across runs of a long-running process. Entries
+younger than max_age are served as they are; older entries (up to
+stale_seconds) may be served stale-while-revalidate, i.e. returned at once
+while a background refresh updates the cache.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ForecastSnapshot:
+    """
+    Shared forecast snapshot usable as forecast client of MorningEveningRefactor.
+    """
+
+    def __init__(self, client: Optional[Any] = None, precision: int = 5):
+        """
+        Initialize the snapshot.
+
+        Args:
+            client: Forecast client with get_forecast(lat, lon) (MeteoFranceClient if None)
+            precision: Decimal places used to match coordinates
+        """
+        self._client = client
+        self.precision = precision
+        self._forecasts: Dict[Tuple[float, float], Any] = {}
+        self._locks: Dict[Tuple[float, float], threading.Lock] = {}
+        self._guard = threading.Lock()
+        self.fetch_count = 0
+
+    @property
+    def client(self) -> Any:
+        """Underlying forecast client (created on first use)."""
+        with self._guard:
+            if self._client is None:
+                from meteofrance_api import MeteoFranceClient
+                self._client = MeteoFranceClient()
+            return self._client
+
+    def _key(self, lat: float, lon: float) -> Tuple[float, float]:
+        return round(lat, self.precision), round(lon, self.precision)
+
+    def is_stale(self, lat: float, lon: float) -> bool:
+        """Return True if get_forecast(allow_stale=True) would serve stale data (never for a snapshot)."""
+        return False
+
+    def get_forecast(self, lat: float, lon: float, allow_stale: bool = False) -> Any:
+        """
+        Return the forecast for a coordinate, fetching it once per snapshot.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            allow_stale: Accepted for ForecastCache compatibility (snapshots never go stale)
+
+        Returns:
+            Forecast object of the underlying client
+        """
+        key = self._key(lat, lon)
+        with self._guard:
+            if key in self._forecasts:
+                return self._forecasts[key]
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        with lock:
+            with self._guard:
+                if key in self._forecasts:
+                    return self._forecasts[key]
+            forecast = self.client.get_forecast(lat, lon)
+            with self._guard:
+                self._forecasts[key] = forecast
+                self.fetch_count += 1
+            return forecast
+
+    def prefetch(self, coordinates: Iterable[Tuple[float, float]], max_workers: int = 4,
+                 allow_stale: bool = False) -> None:
+        """
+        Fetch all given coordinates concurrently.
+
+        Failed fetches are logged and retried on the next get_forecast call.
+
+        Args:
+            coordinates: (lat, lon) pairs
+            max_workers: Number of concurrent fetches
+            allow_stale: Passed on to get_forecast
+        """
+        unique: Dict[Tuple[float, float], Tuple[float, float]] = {}
+        for lat, lon in coordinates:
+            unique.setdefault(self._key(lat, lon), (lat, lon))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self.get_forecast, lat, lon, allow_stale): (lat, lon)
+                       for lat, lon in unique.values()}
+        for future, (lat, lon) in futures.items():
+            if future.exception():
+                logger.warning(f"Prefetch failed for ({lat}, {lon}): {future.exception()}")
+
+
+class ForecastCache(ForecastSnapshot):
+    """
+    Forecast cache with age-based expiry and stale-while-revalidate serving.
+    """
+
+    def __init__(self, client: Optional[Any] = None, precision: int = 5,
+                 max_age: float = 600, stale_seconds: float = 3600,
+                 refresh_timeout: float = 30, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            client: Forecast client with get_forecast(lat, lon) (MeteoFranceClient if None)
+            precision: Decimal places used to match coordinates
+            max_age: Seconds an entry is served without refresh
+            stale_seconds: Seconds an entry may be served stale while it is refreshed
+            refresh_timeout: Default seconds wait_for_refresh waits
+            clock: Monotonic clock
+        """
+        super().__init__(client, precision)
+        self.max_age = max_age
+        self.stale_seconds = stale_seconds
+        self.refresh_timeout = refresh_timeout
+        self.clock = clock
+        self._fetched_at: Dict[Tuple[float, float], float] = {}
+        self._refreshing: Dict[Tuple[float, float], threading.Thread] = {}
+
+    def _age(self, key: Tuple[float, float]) -> Optional[float]:
+        fetched_at = self._fetched_at.get(key)
+        return None if fetched_at is None else self.clock() - fetched_at
+
+    def _fetch(self, key: Tuple[float, float], lat: float, lon: float) -> Any:
+        forecast = self.client.get_forecast(lat, lon)
+        with self._guard:
+            self._forecasts[key] = forecast
+            self._fetched_at[key] = self.clock()
+            self.fetch_count += 1
+        return forecast
+
+    def is_stale(self, lat: float, lon: float) -> bool:
+        """Return True if the entry is older than max_age but still servable stale."""
+        with self._guard:
+            age = self._age(self._key(lat, lon))
+        return age is not None and self.max_age < age <= self.stale_seconds
+
+    def get_forecast(self, lat: float, lon: float, allow_stale: bool = False) -> Any:
+        """
+        Return the forecast for a coordinate.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            allow_stale: Serve an entry older than max_age at once and refresh it in the background
+
+        Returns:
+            Forecast object of the underlying client
+        """
+        key = self._key(lat, lon)
+        with self._guard:
+            age = self._age(key)
+            cached = self._forecasts.get(key)
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        if age is not None and age <= self.max_age:
+            return cached
+        if allow_stale and age is not None and age <= self.stale_seconds:
+            self._revalidate(key, lat, lon)
+            return cached
+
+        with lock:
+            with self._guard:
+                age = self._age(key)
+                if age is not None and age <= self.max_age:
+                    return self._forecasts[key]
+            return self._fetch(key, lat, lon)
+
+    def _revalidate(self, key: Tuple[float, float], lat: float, lon: float) -> None:
+        """Start a background refresh of one entry unless one is already running."""
+        def refresh():
+            try:
+                with self._locks[key]:
+                    self._fetch(key, lat, lon)
+            except Exception as e:
+                logger.warning(f"Background refresh failed for ({lat}, {lon}): {e}")
+            finally:
+                with self._guard:
+                    self._refreshing.pop(key, None)
+
+        with self._guard:
+            if key in self._refreshing:
+                return
+            worker = threading.Thread(target=refresh, daemon=True)
+            self._refreshing[key] = worker
+        worker.start()
+
+    def wait_for_refresh(self, timeout: Optional[float] = None,
+                         coordinates: Optional[Iterable[Tuple[float, float]]] = None) -> bool:
+        """
+        Wait for running background refreshes.
+
+        Args:
+            timeout: Maximum seconds to wait (refresh_timeout if None)
+            coordinates: Only wait for the refreshes of these (lat, lon) pairs (all if None)
+
+        Returns:
+            True if none of the awaited refreshes is running anymore
+        """
+        keys = None if coordinates is None else {self._key(lat, lon) for lat, lon in coordinates}
+        deadline = time.monotonic() + (self.refresh_timeout if timeout is None else timeout)
+        while True:
+            with self._guard:
+                workers = [worker for key, worker in self._refreshing.items() if keys is None or key in keys]
+            if not workers:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            workers[0].join(remaining)
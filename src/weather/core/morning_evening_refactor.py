@@ -7,17 +7,55 @@ This module implements the specific requirements from morning-evening-refactor.m
 - Specific output formats (N8, D24, R0.2@6(1.40@16), etc.)
 - Debug output with # DEBUG DATENEXPORT marker
 - Persistence to .data/weather_reports/YYYY-MM-DD/{etappenname}.json
+  and the report history store (.data/weather_reports/reports.sqlite)
 """
 
+import io
 import os
 import json
+import time
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, TextIO, Tuple
+from dataclasses import dataclass
 import logging
 
+from .deadline import Deadline, DeadlineExceeded
+from .forecast_fingerprint import forecast_fingerprint
+from .forecast_snapshot import ForecastSnapshot
+from .section_graph import SectionGraph, SectionNode
+
+try:
+    from notification.gsm7_validator import GSM7Validator, SEGMENT_SEPTETS
+except ImportError:
+    from src.notification.gsm7_validator import GSM7Validator, SEGMENT_SEPTETS
+
 logger = logging.getLogger(__name__)
 
+# Report sections in output order
+REPORT_SECTIONS = ('night', 'day', 'rain_mm', 'rain_percent', 'wind', 'gust',
+                   'thunderstorm', 'thunderstorm_plus_one', 'risks', 'risk_zonal')
+
+# Upstreams besides the forecast (night/day use its daily data, rain, wind,
+# gust and thunderstorm its hourly and probability data)
+SECTION_UPSTREAMS = {
+    'risks': ('vigilance',),
+    'risk_zonal': ('fire_risk',),
+}
+
+class _LineWriter:
+    """Writes lines to a stream, separated like "\\n".join(lines)."""
+    
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self._first = True
+    
+    def append(self, line: str) -> None:
+        if not self._first:
+            self.stream.write("\n")
+        self._first = False
+        self.stream.write(line)
+
+
 @dataclass
 class WeatherThresholdData:
     """Data structure for threshold and maximum values with timing."""
@@ -70,14 +108,28 @@ class MorningEveningRefactor:
     - Persistence to JSON files
     """
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], forecast_client: Optional[Any] = None,
+                 etappen_path: str = "etappen.json"):
         """
         Initialize the refactor implementation.
         
         Args:
             config: Configuration dictionary from config.yaml
+            forecast_client: Client with get_forecast(lat, lon), e.g. a shared
+                ForecastSnapshot (a new MeteoFranceClient is used if None)
+            etappen_path: Path to the stage file of the route
         """
         self.config = config
+        self.forecast_client = forecast_client
+        self.etappen_path = etappen_path
+        self.deadline = Deadline()
+        self._allow_stale = False
+        # Coordinates served stale by the last dynamic run (compared again after their refresh)
+        self.stale_coordinates: List[Tuple[float, float]] = []
+        # Forecast fingerprint of the last run ("" if no forecast was fetched)
+        self.fingerprint = ""
+        # Data to render the debug output of the last report at send time (see write_debug_report)
+        self.debug_report: Optional[Dict[str, Any]] = None
         self.thresholds = {
             'rain_amount': config.get('thresholds', {}).get('rain_amount', 0.2),
             'rain_probability': config.get('thresholds', {}).get('rain_probability', 20.0),
@@ -105,14 +157,14 @@ class MorningEveningRefactor:
         """
         try:
             from position.etappenlogik import get_stage_info
-            stage_info = get_stage_info(self.config)
+            stage_info = get_stage_info(self.config, self.etappen_path)
             
             if stage_info and stage_info.get("name") == stage_name:
                 return stage_info.get("coordinates", [])
             
-            # If not current stage, load from etappen.json
+            # If not current stage, load from the stage file
             import json
-            with open("etappen.json", "r") as f:
+            with open(self.etappen_path, "r") as f:
                 etappen_data = json.load(f)
             
             for etappe in etappen_data:
@@ -128,6 +180,27 @@ class MorningEveningRefactor:
             logger.error(f"Failed to get coordinates for stage {stage_name}: {e}")
             return []
     
+    def _get_forecast(self, client: Any, lat: float, lon: float) -> Optional[Any]:
+        """
+        Fetch the forecast of one coordinate within the time budget of the run.
+        
+        Dynamic runs accept stale entries of a ForecastCache; the coordinates
+        served stale are recorded so the caller can compare again after the
+        background refresh.
+        
+        Returns:
+            Forecast object or None if the time budget is spent
+        """
+        try:
+            if isinstance(client, ForecastSnapshot):
+                if self._allow_stale and client.is_stale(lat, lon):
+                    self.stale_coordinates.append((lat, lon))
+                return self.deadline.call(client.get_forecast, lat, lon, allow_stale=self._allow_stale)
+            return self.deadline.call(client.get_forecast, lat, lon)
+        except DeadlineExceeded:
+            logger.warning(f"Time budget spent - no forecast for ({lat}, {lon})")
+            return None
+    
     def fetch_weather_data(self, stage_name: str, target_date: date) -> Dict[str, Any]:
         """
         Fetch weather data from meteo_france API for specific data sources.
@@ -140,21 +213,25 @@ class MorningEveningRefactor:
             Dictionary with weather data from different sources
         """
         try:
-            from meteofrance_api import MeteoFranceClient
-            
-            client = MeteoFranceClient()
+            if self.forecast_client is not None:
+                client = self.forecast_client
+            else:
+                from meteofrance_api import MeteoFranceClient
+                client = MeteoFranceClient()
             coordinates = self.get_stage_coordinates(stage_name)
             
             if not coordinates:
                 logger.error(f"No coordinates found for stage {stage_name}")
                 return {}
             
-            # Fetch data for ALL coordinates (G1, G2, G3)
+            # Fetch data for ALL coordinates (G1, G2, G3), each coordinate once
+            forecasts = [self._get_forecast(client, lat, lon) for lat, lon in coordinates]
             hourly_data = []
+            model_runs = []
             
             for i, (lat, lon) in enumerate(coordinates):
-                # Fetch raw forecast data for this coordinate
-                forecast = client.get_forecast(lat, lon)
+                forecast = forecasts[i]
+                model_runs.append(getattr(forecast, 'updated_on', None))
                 
                 if hasattr(forecast, 'forecast') and forecast.forecast:
                     hourly_data.append({
@@ -171,13 +248,14 @@ class MorningEveningRefactor:
             weather_data = {
                 'daily_forecast': {'daily': []},  # Will be populated from first coordinate
                 'hourly_data': hourly_data,
-                'probability_forecast': []  # Will be populated for all coordinates
+                'probability_forecast': [],  # Will be populated for all coordinates
+                'model_runs': model_runs  # Upstream model run timestamps (updated_on) per coordinate
             }
             
             # Add daily forecast from ALL coordinates
             daily_forecast_data = []
             for i, (lat, lon) in enumerate(coordinates):
-                forecast = client.get_forecast(lat, lon)
+                forecast = forecasts[i]
                 if hasattr(forecast, 'daily_forecast') and forecast.daily_forecast:
                     daily_forecast_data.extend(forecast.daily_forecast)
                 else:
@@ -188,7 +266,7 @@ class MorningEveningRefactor:
             # Add probability forecast for all coordinates
             probability_forecast = []
             for i, (lat, lon) in enumerate(coordinates):
-                forecast = client.get_forecast(lat, lon)
+                forecast = forecasts[i]
                 if hasattr(forecast, 'probability_forecast') and forecast.probability_forecast:
                     probability_forecast.append({
                         'data': forecast.probability_forecast
@@ -224,7 +302,7 @@ class MorningEveningRefactor:
         try:
             # Get stage coordinates to find the last point (T1G3)
             import json
-            with open("etappen.json", "r") as f:
+            with open(self.etappen_path, "r") as f:
                 etappen_data = json.load(f)
             
             # Find current stage
@@ -331,7 +409,7 @@ class MorningEveningRefactor:
             
             # Get stage coordinates
             import json
-            with open("etappen.json", "r") as f:
+            with open(self.etappen_path, "r") as f:
                 etappen_data = json.load(f)
             
             if stage_idx >= len(etappen_data):
@@ -472,7 +550,7 @@ class MorningEveningRefactor:
             
             # Get stage coordinates
             import json
-            with open("etappen.json", "r") as f:
+            with open(self.etappen_path, "r") as f:
                 etappen_data = json.load(f)
             
             if stage_idx >= len(etappen_data):
@@ -947,16 +1025,16 @@ class MorningEveningRefactor:
                 logger.warning(f"No department mapping available for coordinates {lat}, {lon}")
                 return result
             
-            # Import API client locally
-            from meteofrance_api.client import MeteoFranceClient
-            client = MeteoFranceClient()
+            # Department bulletins are shared across stages and report types
+            from wetter.vigilance_cache import get_vigilance_cache
+            vigilance_cache = get_vigilance_cache(self.config)
             
             # For evening, prefer D+1 from full warnings; for morning, use current
             warning_data = None
             tomorrow_available = True
             if report_type == 'evening':
                 try:
-                    full = client.get_warning_full(department)
+                    full = vigilance_cache.get_warning_full(department)
                     # Try to read timelaps/timeline for target date
                     days = getattr(full, 'timelaps', None) or getattr(full, 'timelapse', None) or getattr(full, 'time_laps', None)
                     found = False
@@ -980,7 +1058,7 @@ class MorningEveningRefactor:
                     tomorrow_available = False
             else:
                 try:
-                    warning_data = client.get_warning_current_phenomenons(department)
+                    warning_data = vigilance_cache.get_current_phenomenons(department)
                 except Exception as e:
                     logger.warning(f"Failed to fetch current phenomenons for department {department}: {e}")
                     return result
@@ -1156,6 +1234,46 @@ class MorningEveningRefactor:
         # For morning/evening reports, use standard format
         return self._format_standard_result_output(report_data)
     
+    def _fit_sms(self, result: str, suffix: str = "") -> str:
+        """
+        Shorten a result output to one SMS of 160 GSM-7 septets.
+        
+        The length is measured on the GSM-7 normalized text the SMS client
+        will send, with extension characters (e.g. | [ ] €) counting twice.
+        
+        Returns:
+            result itself if it fits, otherwise the truncated normalized text
+        """
+        validator = GSM7Validator()
+        sms_text = validator.normalize_to_gsm7(result)
+        septets = validator.septet_length(sms_text)
+        if septets <= SEGMENT_SEPTETS:
+            return result
+        logger.warning(f"Result output exceeds 160 septets: {septets}")
+        return validator.truncate_to_septets(sms_text, SEGMENT_SEPTETS, suffix)
+    
+    def _fit_budget(self, report_data: WeatherReportData, result: str) -> str:
+        """
+        Re-encode a standard result output that exceeds result_output_budget septets.
+        
+        Instead of cutting off the end (usually the zonal risk), the report is
+        encoded with per-field compression; the compressed fields are recorded
+        in debug_info['result_output_compression'].
+        
+        Returns:
+            result itself if it fits, otherwise the budgeted encoding
+        """
+        budget = self.config.get('result_output_budget', SEGMENT_SEPTETS)
+        validator = GSM7Validator()
+        if validator.septet_length(validator.normalize_to_gsm7(result)) <= budget:
+            return result
+        
+        from .report_encoder import encode_for_budget
+        encoded = encode_for_budget(report_data, budget, original=result)
+        report_data.debug_info['result_output_compression'] = encoded.compressed
+        logger.info(f"Result output compressed to {encoded.septets}/{budget} septets: {encoded.compressed}")
+        return encoded.text
+    
     def _format_dynamic_result_output(self, report_data: WeatherReportData) -> str:
         """
         Format dynamic report result output showing only changes.
@@ -1164,7 +1282,7 @@ class MorningEveningRefactor:
             report_data: Weather report data
             
         Returns:
-            Formatted dynamic result string (max 160 characters)
+            Formatted dynamic result string (max 160 GSM-7 septets)
         """
         try:
             from logic.dynamic_report_comparator import DynamicReportComparator
@@ -1258,12 +1376,8 @@ class MorningEveningRefactor:
             stage_name = report_data.stage_name[:10]  # Max 10 characters
             result = f"{stage_name} - {', '.join(changes)}"
             
-            # Ensure we don't exceed 160 characters
-            if len(result) > 160:
-                # Truncate if necessary
-                result = result[:157] + "..."
-            
-            return result
+            # Ensure we don't exceed one SMS
+            return self._fit_sms(result, "...")
             
         except Exception as e:
             logger.error(f"Error formatting dynamic result output: {e}")
@@ -1278,7 +1392,7 @@ class MorningEveningRefactor:
             report_data: Complete weather report data
             
         Returns:
-            Formatted result string (max 160 chars)
+            Formatted result string (max 160 GSM-7 septets)
         """
         try:
             parts = []
@@ -1514,13 +1628,8 @@ class MorningEveningRefactor:
             
             result = f"{report_data.stage_name}: {' '.join(parts)}"
             
-            # Ensure max 160 characters
-            if len(result) > 160:
-                logger.warning(f"Result output exceeds 160 characters: {len(result)}")
-                # Truncate to 160 characters
-                result = result[:160]
-            
-            return result
+            # Ensure the output fits the character budget (one SMS by default)
+            return self._fit_budget(report_data, result)
             
         except Exception as e:
             logger.error(f"Failed to format result output: {e}")
@@ -1551,7 +1660,7 @@ class MorningEveningRefactor:
             days_since_start = (today - start_date).days
             
             import json
-            with open("etappen.json", "r") as f:
+            with open(self.etappen_path, "r") as f:
                 etappen_data = json.load(f)
             
             if data_type == 'night':
@@ -1684,19 +1793,103 @@ class MorningEveningRefactor:
         Returns:
             Debug output string
         """
+        buffer = io.StringIO()
         try:
-            debug_lines = []
+            self.write_debug_output(report_data, buffer)
+        except Exception:
+            return "# DEBUG DATENEXPORT\nError generating debug output"
+        return buffer.getvalue()
+    
+    def encode_debug_report(self, report_data: WeatherReportData) -> Dict[str, Any]:
+        """
+        Encode what the debug output of a report is rendered from.
+        
+        The result is JSON-ready, so it can be queued with the report and the
+        debug output rendered only when it is sent (see write_debug_report).
+        
+        Args:
+            report_data: Complete weather report data
+            
+        Returns:
+            Dictionary with the encoded report, the debug info of its elements,
+            the forecast tables of the last fetch and the settings used
+        """
+        from .report_codec import encode_report
+        
+        debug_enabled = self.config.get('debug', {}).get('enabled', False)
+        weather_data = self._last_weather_data if debug_enabled and hasattr(self, '_last_weather_data') else None
+        return {
+            'report': encode_report(report_data),
+            'element_debug_info': {name: getattr(report_data, name).debug_info for name in REPORT_SECTIONS
+                                   if getattr(getattr(report_data, name), 'debug_info', None)},
+            'weather_data': {key: weather_data.get(key) for key in ('hourly_data', 'probability_forecast')}
+                            if weather_data else None,
+            'config': {key: self.config[key] for key in ('startdatum', 'debug', 'thresholds') if key in self.config},
+            'etappen_path': self.etappen_path
+        }
+    
+    @classmethod
+    def write_debug_report(cls, debug_report: Dict[str, Any], stream: TextIO) -> None:
+        """
+        Write the debug output of a report encoded by encode_debug_report line by line to stream.
+        
+        Args:
+            debug_report: Result of encode_debug_report
+            stream: Text stream to write to
+            
+        Raises:
+            Exception: If the debug output could not be generated
+        """
+        from .report_codec import decode_report
+        
+        report_data = decode_report(debug_report['report'])
+        for name, debug_info in (debug_report.get('element_debug_info') or {}).items():
+            getattr(report_data, name).debug_info = debug_info
+        refactor = cls(debug_report.get('config') or {}, etappen_path=debug_report.get('etappen_path', 'etappen.json'))
+        refactor._last_weather_data = debug_report.get('weather_data')
+        refactor.write_debug_output(report_data, stream)
+    
+    def write_debug_output(self, report_data: WeatherReportData, stream: TextIO) -> None:
+        """
+        Write the debug output (see generate_debug_output) line by line to stream.
+        
+        The debug tables run to hundreds of lines; writing them to a file
+        (e.g. a compressed mail attachment) avoids building the whole text
+        in memory.
+        
+        Args:
+            report_data: Complete weather report data
+            stream: Text stream to write to
+            
+        Raises:
+            Exception: If the debug output could not be generated (the
+                output written so far is incomplete)
+        """
+        try:
+            debug_lines = _LineWriter(stream)
             debug_lines.append("# DEBUG DATENEXPORT")
             debug_lines.append("")
             
+            # Sections cut by the time budget (always reported)
+            deadline_info = report_data.debug_info.get('deadline')
+            if deadline_info:
+                debug_lines.append(f"Zeitbudget {deadline_info['budget_seconds']}s überschritten - "
+                                   f"abgeschnittene Abschnitte: {', '.join(deadline_info['cut_sections'])}")
+                debug_lines.append("")
+            
             # Check if debug is enabled in config
             if not self.config.get('debug', {}).get('enabled', False):
-                return "\n".join(debug_lines)
+                return
             
             # Berichts-Typ
             debug_lines.append(f"Berichts-Typ: {report_data.report_type}")
             debug_lines.append("")
             
+            # Laufzeit je Abschnitt (Profiling)
+            if report_data.debug_info.get('section_timings'):
+                debug_lines.append(f"Abschnittszeiten: {report_data.debug_info['section_timings']}")
+                debug_lines.append("")
+            
             # Calculate stage information based on start date
             start_date = datetime.strptime(self.config.get('startdatum', '2025-07-27'), '%Y-%m-%d').date()
             today = report_data.report_date
@@ -1704,7 +1897,7 @@ class MorningEveningRefactor:
             
             # Get stage information
             import json
-            with open("etappen.json", "r") as f:
+            with open(self.etappen_path, "r") as f:
                 etappen_data = json.load(f)
             
             # Calculate stage indices
@@ -2004,7 +2197,7 @@ class MorningEveningRefactor:
                 stage_idx = days_since_start  # Today's stage
             
             import json
-            with open("etappen.json", "r") as f:
+            with open(self.etappen_path, "r") as f:
                 etappen_data = json.load(f)
             
             if stage_idx < len(etappen_data):
@@ -2554,18 +2747,20 @@ class MorningEveningRefactor:
             
 
             
-            return "\n".join(debug_lines)
+            return
             
         except Exception as e:
             logger.error(f"Failed to generate debug output: {e}")
-            return "# DEBUG DATENEXPORT\nError generating debug output"
+            raise
     
-    def save_persistence_data(self, report_data: WeatherReportData) -> bool:
+    def save_persistence_data(self, report_data: WeatherReportData,
+                              metadata: Optional[Dict[str, Any]] = None) -> bool:
         """
         Save weather report data to JSON file for persistence.
         
         Args:
             report_data: Complete weather report data
+            metadata: Additional fields stored with the report (e.g. forecast_fingerprint)
             
         Returns:
             True if saved successfully, False otherwise
@@ -2580,36 +2775,127 @@ class MorningEveningRefactor:
             filename = f"{report_data.stage_name}.json"
             filepath = os.path.join(date_dir, filename)
             
-            # Convert to dictionary
-            data_dict = asdict(report_data)
+            # Convert to dictionary (schema-versioned, no deep copy)
+            from .report_codec import encode_report
+            data_dict = encode_report(report_data)
             
             # Add metadata
             data_dict['generated_at'] = datetime.now().isoformat()
             data_dict['version'] = 'morning-evening-refactor-v1'
+            if metadata:
+                data_dict.update(metadata)
             
             # Save to file
             with open(filepath, 'w') as f:
-                json.dump(data_dict, f, indent=2, default=str)
+                json.dump(data_dict, f, separators=(',', ':'), default=str)
             
             logger.info(f"Saved persistence data to {filepath}")
+            
+            # Append to report history (keeps every report, indexed by stage and date)
+            try:
+                from logic.report_store import ReportStore, REPORT_STORE_FILENAME
+                
+                ReportStore(os.path.join(self.data_dir, REPORT_STORE_FILENAME)).append(
+                    report_data.stage_name, report_data.report_date, report_data.report_type, data_dict
+                )
+            except Exception as e:
+                logger.error(f"Failed to append report to history store: {e}")
+            
             return True
             
         except Exception as e:
             logger.error(f"Failed to save persistence data: {e}")
             return False
     
-    def generate_report(self, stage_name: str, report_type: str, target_date: str) -> Tuple[str, str]:
+    def _section_graph(self, stage_name: str, target_date: date, report_type: str) -> SectionGraph:
+        """
+        Build the dependency graph of the report sections.
+        
+        The 'forecast' input (daily, hourly and probability data of all stage
+        points) is fetched before the graph runs. The vigilance bulletin and
+        the fire risk dataset are fetched by their own nodes, so each upstream
+        is requested once and the sections that need it start when it is ready.
+        """
+        def section(processor):
+            return lambda inputs: processor(inputs['forecast'], stage_name, target_date, report_type)
+        
+        nodes = [
+            SectionNode('vigilance', lambda inputs: self._prefetch_vigilance(stage_name, report_type)),
+            SectionNode('fire_risk', lambda inputs: self._prefetch_fire_risk()),
+        ]
+        for name in REPORT_SECTIONS:
+            processor = getattr(self, f'process_{name}_data')
+            upstream = SECTION_UPSTREAMS.get(name, ())
+            nodes.append(SectionNode(name, section(processor), ('forecast',) + upstream))
+        return SectionGraph(nodes)
+    
+    def _prefetch_vigilance(self, stage_name: str, report_type: str) -> None:
+        """Load the department vigilance bulletin used by the risks section into the cache."""
+        coordinates = self.get_stage_coordinates(stage_name)
+        if not coordinates:
+            return
+        from wetter.department_mapper import get_department_from_coordinates
+        from wetter.vigilance_cache import get_vigilance_cache
+        department = get_department_from_coordinates(*coordinates[0])
+        if not department:
+            return
+        vigilance_cache = get_vigilance_cache(self.config)
+        if report_type == 'evening':
+            vigilance_cache.get_warning_full(department)
+        else:
+            vigilance_cache.get_current_phenomenons(department)
+    
+    def _prefetch_fire_risk(self) -> None:
+        """Load today's fire risk dataset used by the risk_zonal section."""
+        try:
+            from fire.risk_block_formatter import load_fire_risk_data
+        except ImportError:
+            from src.fire.risk_block_formatter import load_fire_risk_data
+        load_fire_risk_data(datetime.now().strftime("%Y%m%d"))
+    
+    def _time_budget(self, report_type: str) -> Optional[float]:
+        """
+        Return the configured time budget in seconds for a report type.
+        
+        report_time_budget_seconds is either one number for all report types
+        or a mapping per report type; None means unlimited.
+        """
+        budget = self.config.get('report_time_budget_seconds')
+        if isinstance(budget, dict):
+            budget = budget.get(report_type)
+        return float(budget) if budget is not None else None
+    
+    def generate_report(self, stage_name: str, report_type: str, target_date: str,
+                        time_budget: Optional[float] = None,
+                        compared_fingerprint: Optional[str] = None,
+                        render_debug: bool = True) -> Tuple[str, str]:
         """
         Generate complete weather report with result and debug output.
         
+        Fetches and section processors share one deadline. Sections that are
+        not finished when it expires are left empty (shown as "-") and listed
+        in the debug output.
+        
         Args:
             stage_name: Name of the stage
             report_type: 'morning', 'evening', or 'dynamic'
             target_date: Target date for the report (string format YYYY-MM-DD)
+            time_budget: Time budget in seconds (defaults to report_time_budget_seconds)
+            compared_fingerprint: Fingerprint of a forecast this dynamic report was
+                already compared with (a revalidation skips the comparison if unchanged)
+            render_debug: Render the debug output; if False, an empty debug output is
+                returned and debug_report is set for rendering at send time
             
         Returns:
             Tuple of (result_output, debug_output)
         """
+        if time_budget is None:
+            time_budget = self._time_budget(report_type)
+        self.deadline = Deadline(time_budget)
+        self._allow_stale = report_type == 'dynamic'
+        self.stale_coordinates = []
+        self.fingerprint = ""
+        self.debug_report = None
         try:
             # Convert target_date string to date object
             if isinstance(target_date, str):
@@ -2618,18 +2904,27 @@ class MorningEveningRefactor:
                 target_date_obj = target_date
             
             logger.info(f"Generating {report_type} report for {stage_name} on {target_date_obj}")
-            
-            # For dynamic reports, check if we should actually send
-            if report_type == 'dynamic':
-                logger.info(f"Checking dynamic report conditions for {stage_name}")
-                should_send = self._check_dynamic_report_conditions(stage_name, target_date_obj)
-                logger.info(f"Dynamic report conditions result: {should_send}")
-                if not should_send:
-                    logger.info(f"Dynamic report conditions not met for {stage_name}")
-                    return f"{stage_name}: NO CHANGES", "# DEBUG DATENEXPORT\nNo significant changes detected"
+            started = time.perf_counter()
             
             # Fetch weather data
             weather_data = self.fetch_weather_data(stage_name, target_date_obj)
+            fingerprint = forecast_fingerprint(weather_data, target_date_obj)
+            self.fingerprint = fingerprint
+            
+            # For dynamic reports, check if we should actually send
+            if report_type == 'dynamic':
+                if fingerprint and fingerprint == compared_fingerprint:
+                    logger.info(f"Forecast of {stage_name} unchanged by the refresh - not compared again")
+                    return f"{stage_name}: NO CHANGES", "# DEBUG DATENEXPORT\nForecast unchanged by the refresh"
+                no_change_reason = self._dynamic_no_change_reason(stage_name, target_date_obj, weather_data, fingerprint)
+                
+                # Stale cache data was compared: the caller compares again once the refresh is done
+                if self.stale_coordinates:
+                    logger.info(f"Stale forecast served for {len(self.stale_coordinates)} point(s) of "
+                                f"{stage_name} - revalidation follows")
+                
+                if no_change_reason:
+                    return f"{stage_name}: NO CHANGES", f"# DEBUG DATENEXPORT\n{no_change_reason}"
             
             # Store weather data for debug output
             self._last_weather_data = weather_data
@@ -2638,42 +2933,53 @@ class MorningEveningRefactor:
                 logger.error(f"No weather data available for {stage_name}")
                 return f"{stage_name}: NO DATA", "# DEBUG DATENEXPORT\nNo weather data available"
             
-            # Process weather elements
-            night_data = self.process_night_data(weather_data, stage_name, target_date_obj, report_type)
-            day_data = self.process_day_data(weather_data, stage_name, target_date_obj, report_type)
-            rain_mm_data = self.process_rain_mm_data(weather_data, stage_name, target_date_obj, report_type)
-            rain_percent_data = self.process_rain_percent_data(weather_data, stage_name, target_date_obj, report_type)
-
-            wind_data = self.process_wind_data(weather_data, stage_name, target_date_obj, report_type)
-            gust_data = self.process_gust_data(weather_data, stage_name, target_date_obj, report_type)
-            thunderstorm_data = self.process_thunderstorm_data(weather_data, stage_name, target_date_obj, report_type)
-            thunderstorm_plus_one_data = self.process_thunderstorm_plus_one_data(weather_data, stage_name, target_date_obj, report_type)
-            risks_data = self.process_risks_data(weather_data, stage_name, target_date_obj, report_type)
-            risk_zonal_data = self.process_risk_zonal_data(weather_data, stage_name, target_date_obj, report_type)
+            # Process weather elements as dependency graph within the time budget
+            graph = self._section_graph(stage_name, target_date_obj, report_type)
+            try:
+                from fire.risk_block_formatter import shared_fire_risk_data
+            except ImportError:
+                from src.fire.risk_block_formatter import shared_fire_risk_data
+            with shared_fire_risk_data():
+                graph_run = graph.run({'forecast': weather_data},
+                                      max_workers=self.config.get('report_section_workers', 4),
+                                      deadline=self.deadline)
+            
+            sections = {}
+            cut_sections = [section for section in REPORT_SECTIONS if section in graph_run.cut]
+            for section in REPORT_SECTIONS:
+                sections[section] = graph_run.results.get(section)
+                if sections[section] is None:
+                    sections[section] = WeatherThresholdData()
+                    sections[section].debug_info = {}
             
             # Create report data structure
             report_data = WeatherReportData(
                 stage_name=stage_name,
                 report_date=target_date_obj,
                 report_type=report_type,
-                night=night_data,
-                day=day_data,
-                rain_mm=rain_mm_data,
-                rain_percent=rain_percent_data,
-                wind=wind_data,
-                gust=gust_data,
-                thunderstorm=thunderstorm_data,
-                thunderstorm_plus_one=thunderstorm_plus_one_data,
-                risks=risks_data,
-                risk_zonal=risk_zonal_data
+                **sections
             )
+            if cut_sections:
+                logger.warning(f"Time budget of {time_budget}s spent for {stage_name}, "
+                               f"sections cut: {', '.join(cut_sections)}")
+                report_data.debug_info['deadline'] = {'budget_seconds': time_budget, 'cut_sections': cut_sections}
+                # A partial report must not make later dynamic runs skip as "unchanged"
+                fingerprint = ""
+            report_data.debug_info['section_timings'] = graph_run.format_timings()
             
             # Generate outputs
             result_output = self.format_result_output(report_data)
-            debug_output = self.generate_debug_output(report_data)
+            if render_debug:
+                debug_output = self.generate_debug_output(report_data)
+            else:
+                debug_output = ""
+                self.debug_report = self.encode_debug_report(report_data)
             
             # Save persistence data
-            self.save_persistence_data(report_data)
+            self.save_persistence_data(report_data, {
+                'forecast_fingerprint': fingerprint,
+                'processing_seconds': round(time.perf_counter() - started, 3)
+            })
             
             logger.info(f"Generated {report_type} report for {stage_name}")
             return result_output, debug_output
@@ -2682,13 +2988,67 @@ class MorningEveningRefactor:
             logger.error(f"Failed to generate report: {e}")
             return f"{stage_name}: ERROR", f"# DEBUG DATENEXPORT\nError: {str(e)}" 
     
-    def _check_dynamic_report_conditions(self, stage_name: str, target_date: date) -> bool:
+    def _dynamic_no_change_reason(self, stage_name: str, target_date: date,
+                                  weather_data: Dict[str, Any], fingerprint: str) -> Optional[str]:
+        """
+        Decide whether a dynamic report is needed for the given weather data.
+        
+        Returns:
+            Reason for the debug output if no report is needed, None otherwise
+        """
+        if self._forecast_unchanged(stage_name, target_date, fingerprint):
+            return "Forecast unchanged since last report"
+        
+        logger.info(f"Checking dynamic report conditions for {stage_name}")
+        should_send = self._check_dynamic_report_conditions(stage_name, target_date, weather_data)
+        logger.info(f"Dynamic report conditions result: {should_send}")
+        if not should_send:
+            logger.info(f"Dynamic report conditions not met for {stage_name}")
+            return "No significant changes detected"
+        return None
+    
+    def _forecast_unchanged(self, stage_name: str, target_date: date, fingerprint: str) -> bool:
+        """
+        Check whether the forecast fingerprint matches the last sent report.
+        
+        Args:
+            stage_name: Name of the stage
+            target_date: Target date for the report
+            fingerprint: Fingerprint of the freshly fetched forecast
+            
+        Returns:
+            True if the dynamic run can be skipped without processing
+        """
+        if not fingerprint:
+            return False
+        try:
+            from logic.dynamic_report_comparator import DynamicReportComparator
+            
+            comparator = DynamicReportComparator(self.config)
+            comparator.data_dir = self.data_dir
+            previous_report = comparator.load_last_report(stage_name, target_date)
+        except Exception as e:
+            logger.error(f"Error loading last report for fingerprint check: {e}")
+            return False
+        
+        if not previous_report or previous_report.get('forecast_fingerprint') != fingerprint:
+            return False
+        
+        saved = previous_report.get('processing_seconds')
+        saved_text = f"{saved:.2f}s" if isinstance(saved, (int, float)) else "unknown time"
+        logger.info(f"Skipping dynamic report for {stage_name}: forecast fingerprint {fingerprint[:12]} "
+                    f"unchanged since last report (saved {saved_text} of processing)")
+        return True
+    
+    def _check_dynamic_report_conditions(self, stage_name: str, target_date: date,
+                                         weather_data: Optional[Dict[str, Any]] = None) -> bool:
         """
         Check if a dynamic report should be sent based on comparison with previous report.
         
         Args:
             stage_name: Name of the stage
             target_date: Target date for the report
+            weather_data: Already fetched weather data (fetched if None)
             
         Returns:
             True if dynamic report should be sent, False otherwise
@@ -2700,7 +3060,7 @@ class MorningEveningRefactor:
             comparator = DynamicReportComparator(self.config)
             
             # Generate current report data (without sending)
-            current_report_data = self._generate_report_data_only(stage_name, target_date)
+            current_report_data = self._generate_report_data_only(stage_name, target_date, weather_data)
             
             # Load previous report
             previous_report = comparator.load_last_report(stage_name, target_date)
@@ -2717,20 +3077,23 @@ class MorningEveningRefactor:
             logger.error(f"Error checking dynamic report conditions: {e}")
             return True  # Default to sending if comparison fails
     
-    def _generate_report_data_only(self, stage_name: str, target_date: date) -> Dict[str, Any]:
+    def _generate_report_data_only(self, stage_name: str, target_date: date,
+                                   weather_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Generate report data without sending, for comparison purposes.
         
         Args:
             stage_name: Name of the stage
             target_date: Target date for the report
+            weather_data: Already fetched weather data (fetched if None)
             
         Returns:
             Dictionary with report data
         """
         try:
             # Fetch weather data
-            weather_data = self.fetch_weather_data(stage_name, target_date)
+            if weather_data is None:
+                weather_data = self.fetch_weather_data(stage_name, target_date)
             
             if not weather_data:
                 logger.error(f"No weather data available for {stage_name}")
@@ -2767,8 +3130,8 @@ class MorningEveningRefactor:
             )
             
             # Convert to dictionary for comparison
-            from dataclasses import asdict
-            return asdict(report_data)
+            from .report_codec import encode_report
+            return encode_report(report_data)
             
         except Exception as e:
             logger.error(f"Error generating report data for comparison: {e}")
@@ -2931,7 +3294,7 @@ class MorningEveningRefactor:
                 if report_type and data_type:
                     # Get stage coordinates to find the last point
                     import json
-                    with open("etappen.json", "r") as f:
+                    with open(self.etappen_path, "r") as f:
                         etappen_data = json.load(f)
                     
                     # Find current stage
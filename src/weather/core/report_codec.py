@@ -0,0 +1,121 @@
+"""
+Report Codec
+
+Hand-written, schema-versioned encoding of WeatherReportData for persistence
+and comparison. Unlike dataclasses.asdict the encoder does not deep-copy the
+report tree: geo point lists and debug info are referenced as they are, so
+the encoded dictionary must be treated as read-only (it is normally dumped or
+compared right away).
+"""
+
+import json
+from datetime import date
+from typing import Any, Dict, Union
+
+from .morning_evening_refactor import WeatherReportData, WeatherThresholdData
+
+SCHEMA_VERSION = 1
+
+ELEMENT_FIELDS = (
+    'night', 'day', 'rain_mm', 'rain_percent', 'wind', 'gust',
+    'thunderstorm', 'thunderstorm_plus_one', 'risks', 'risk_zonal'
+)
+
+
+def _encode_threshold(data: WeatherThresholdData) -> Dict[str, Any]:
+    """Encode one weather element without copying its geo points."""
+    return {
+        'threshold_value': data.threshold_value,
+        'threshold_time': data.threshold_time,
+        'max_value': data.max_value,
+        'max_time': data.max_time,
+        'geo_points': data.geo_points
+    }
+
+
+def _decode_threshold(data: Dict[str, Any]) -> WeatherThresholdData:
+    """Decode one weather element."""
+    return WeatherThresholdData(
+        threshold_value=data.get('threshold_value'),
+        threshold_time=data.get('threshold_time'),
+        max_value=data.get('max_value'),
+        max_time=data.get('max_time'),
+        geo_points=data.get('geo_points') or []
+    )
+
+
+def encode_report(report: WeatherReportData) -> Dict[str, Any]:
+    """
+    Encode a report into a JSON-ready dictionary.
+
+    The layout matches dataclasses.asdict (plus schema_version), with the
+    report date as ISO string.
+
+    Args:
+        report: Weather report data
+
+    Returns:
+        Dictionary sharing nested geo point and debug containers with the report
+    """
+    data = {
+        'schema_version': SCHEMA_VERSION,
+        'stage_name': report.stage_name,
+        'report_date': report.report_date.isoformat() if isinstance(report.report_date, date) else report.report_date,
+        'report_type': report.report_type
+    }
+    for name in ELEMENT_FIELDS:
+        data[name] = _encode_threshold(getattr(report, name))
+    data['debug_info'] = report.debug_info
+    return data
+
+
+def decode_report(data: Dict[str, Any]) -> WeatherReportData:
+    """
+    Decode a dictionary created by encode_report (or by asdict in older files).
+
+    Args:
+        data: Encoded report
+
+    Returns:
+        WeatherReportData instance
+
+    Raises:
+        ValueError: If the schema version is newer than supported
+    """
+    version = data.get('schema_version', 1)
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"Unsupported report schema version {version} (supported: {SCHEMA_VERSION})")
+
+    report_date = data.get('report_date')
+    if isinstance(report_date, str):
+        report_date = date.fromisoformat(report_date[:10])
+
+    elements = {name: _decode_threshold(data.get(name) or {}) for name in ELEMENT_FIELDS}
+    return WeatherReportData(
+        stage_name=data['stage_name'],
+        report_date=report_date,
+        report_type=data.get('report_type'),
+        debug_info=data.get('debug_info') or {},
+        **elements
+    )
+
+
+def dumps_report(report: WeatherReportData, **metadata: Any) -> bytes:
+    """
+    Serialize a report to compact UTF-8 JSON.
+
+    Args:
+        report: Weather report data
+        **metadata: Additional top-level fields (e.g. generated_at)
+
+    Returns:
+        Encoded bytes
+    """
+    data = encode_report(report)
+    data.update(metadata)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+
+def loads_report(raw: Union[bytes, str]) -> WeatherReportData:
+    """Deserialize a report created by dumps_report."""
+    return decode_report(json.loads(raw))
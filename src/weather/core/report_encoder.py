@@ -0,0 +1,257 @@
+"""
+Report Encoder
+
+Budgeted text encoding of WeatherReportData for satellite delivery (Garmin
+inReach via SOTAmāt), where every character costs money and airtime. The
+report is rendered in the result output format (N8 D24 R0.2@6(1.4@16) ...)
+and, while it exceeds the budget, compressed step by step: lossless steps
+first (compact numbers, merge repeated hours, omit empty fields, drop
+separators), then lossy ones (shorten the stage name, round values, drop
+maxima and finally whole low-priority fields). Length is measured in GSM-7
+septets of the normalized text, as sent by the SMS gateway.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .morning_evening_refactor import WeatherReportData, WeatherThresholdData
+
+try:
+    from notification.gsm7_validator import GSM7Validator, SEGMENT_SEPTETS
+except ImportError:
+    from src.notification.gsm7_validator import GSM7Validator, SEGMENT_SEPTETS
+
+THUNDERSTORM_LEVELS = {'low': 'L', 'med': 'M', 'high': 'H'}
+
+# (field, prefix, unit, text when empty) in output order
+ELEMENTS = (
+    ('night', 'N', '', 'N-'),
+    ('day', 'D', '', 'D-'),
+    ('rain_mm', 'R', '', 'R-'),
+    ('rain_percent', 'PR', '%', 'PR-'),
+    ('wind', 'W', '', 'W-'),
+    ('gust', 'G', '', 'G-'),
+    ('thunderstorm', 'TH:', '', 'TH-'),
+    ('thunderstorm_plus_one', 'TH+:', '', 'TH+:-'),
+)
+
+# Fields rounded to whole numbers by the lossy 'round' step (rain amounts keep their decimals)
+ROUNDED_FIELDS = ('night', 'day', 'wind', 'gust')
+
+# Fields whose maximum is dropped first, least important first
+MAX_DROP_ORDER = ('gust', 'wind', 'rain_percent', 'thunderstorm_plus_one', 'risks', 'rain_mm', 'thunderstorm')
+
+# Fields dropped entirely as last resort, least important first
+FIELD_DROP_ORDER = ('thunderstorm_plus_one', 'night', 'rain_percent', 'gust', 'risks', 'day')
+
+
+@dataclass
+class EncodedReport:
+    """Budgeted report text."""
+    text: str
+    septets: int
+    budget: int
+    compressed: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def fits(self) -> bool:
+        """True if the text is within the budget."""
+        return self.septets <= self.budget
+
+    @property
+    def lossy(self) -> bool:
+        """True if information was dropped or rounded."""
+        return any(step in LOSSY_STEPS for steps in self.compressed.values() for step in steps)
+
+
+@dataclass
+class _Options:
+    compact_numbers: bool = False
+    merge_hours: bool = False
+    omit_empty: bool = False
+    separator: str = ' '
+    leading_zero: bool = True
+    stage_chars: Optional[int] = None
+    round_values: bool = False
+    without_max: set = field(default_factory=set)
+    dropped: set = field(default_factory=set)
+
+
+def _number(value: Any, options: _Options, name: str = '') -> str:
+    if isinstance(value, str):
+        return THUNDERSTORM_LEVELS.get(value, value)
+    if options.round_values and name in ROUNDED_FIELDS and isinstance(value, float):
+        value = round(value)
+    if options.compact_numbers and isinstance(value, float):
+        text = f"{value:g}"
+        if not options.leading_zero and text.startswith('0.'):
+            text = text[1:]
+        return text
+    return str(value)
+
+
+def _element(data: WeatherThresholdData, prefix: str, unit: str, name: str,
+             options: _Options) -> Optional[str]:
+    """Render one element like the result output, None if it has no value."""
+    value, time, max_value, max_time = data.threshold_value, data.threshold_time, data.max_value, data.max_time
+    if name == 'rain_percent' and value is not None and value <= 0:
+        value = None
+    if value is None and name.startswith('thunderstorm') and max_value is not None:
+        value, time = max_value, max_time
+    if value is None:
+        return None
+    if options.compact_numbers and unit == '%':
+        unit = ''
+
+    text = f"{prefix}{_number(value, options, name)}{unit}"
+    if name in ('night', 'day'):
+        return text
+
+    has_max = max_value is not None and max_value != value and name not in options.without_max
+    if not has_max:
+        return f"{text}@{time}"
+    max_text = f"{_number(max_value, options, name)}{unit}"
+    if _number(max_value, options, name) == _number(value, options, name):
+        # Equal after rounding
+        return f"{text}@{time}"
+    if options.merge_hours and max_time == time:
+        return f"{text}({max_text})@{time}"
+    return f"{text}@{time}({max_text}@{max_time})"
+
+
+def _risks(report: WeatherReportData, options: _Options) -> Optional[str]:
+    """Render the HR/TH warning field like the result output."""
+    info = getattr(report.risks, 'debug_info', None) or {}
+    if report.report_type == 'evening' and info.get('tomorrow_available') is False:
+        return None
+    parts = []
+    for key in ('hrain', 'storm'):
+        value, max_value = info.get(f'{key}_threshold_value'), info.get(f'{key}_max_value')
+        if value is None:
+            parts.append('-')
+        elif max_value is not None and max_value != value and 'risks' not in options.without_max:
+            parts.append(f"{_number(value, options)}({_number(max_value, options)})")
+        else:
+            parts.append(_number(value, options))
+    if parts == ['-', '-']:
+        return None
+    return f"HR:{parts[0]}TH:{parts[1]}"
+
+
+def _render(report: WeatherReportData, options: _Options) -> Tuple[str, Dict[str, str]]:
+    """Render the report, returning the text and the token of every field."""
+    tokens: Dict[str, str] = {}
+    for name, prefix, unit, empty in ELEMENTS:
+        if name not in options.dropped:
+            tokens[name] = _element(getattr(report, name), prefix, unit, name, options) or empty
+    if 'risks' not in options.dropped:
+        tokens['risks'] = _risks(report, options) or 'HR:-TH:-'
+    risk_block = (getattr(report.risk_zonal, 'debug_info', None) or {}).get('risk_block')
+    tokens['risk_zonal'] = f"Z:{risk_block}" if risk_block else 'Z:-'
+
+    empty_tokens = {empty for _, _, _, empty in ELEMENTS} | {'HR:-TH:-', 'Z:-'}
+    shown = [token for token in tokens.values() if not (options.omit_empty and token in empty_tokens)]
+    stage = report.stage_name
+    if options.stage_chars is not None:
+        stage = stage[:options.stage_chars]
+    tokens['stage_name'] = stage
+    return f"{stage}:{' ' if options.separator else ''}{options.separator.join(shown)}", tokens
+
+
+def _steps() -> List[Tuple[str, Callable[[_Options], bool]]]:
+    """Compression steps in order; each changes the options and returns False if it has no effect left."""
+    def set_flag(name, value):
+        def apply(options):
+            if getattr(options, name) == value:
+                return False
+            setattr(options, name, value)
+            return True
+        return apply
+
+    def add_to(name, item):
+        def apply(options):
+            target = getattr(options, name)
+            if item in target:
+                return False
+            target.add(item)
+            return True
+        return apply
+
+    steps = [
+        ('compact_numbers', set_flag('compact_numbers', True)),
+        ('merge_hours', set_flag('merge_hours', True)),
+        ('omit_empty', set_flag('omit_empty', True)),
+        ('leading_zero', set_flag('leading_zero', False)),
+        ('no_separator', set_flag('separator', '')),
+        ('stage_name', set_flag('stage_chars', 10)),
+        ('round', set_flag('round_values', True)),
+        ('stage_name', set_flag('stage_chars', 4)),
+    ]
+    steps += [('drop_max', add_to('without_max', name)) for name in MAX_DROP_ORDER]
+    steps += [('drop_field', add_to('dropped', name)) for name in FIELD_DROP_ORDER]
+    return steps
+
+
+LOSSY_STEPS = {'stage_name', 'round', 'drop_max', 'drop_field', 'truncate'}
+
+
+def _lost_fields(original: str, tokens: Dict[str, str]) -> List[str]:
+    """Fields the original output shows that the encoder renders empty (values derived from raw data)."""
+    shown = original.split(': ', 1)[-1].split()
+    lost = []
+    for name, prefix, _, empty in ELEMENTS:
+        token = next((t for t in shown if t == empty or t.startswith(prefix)), empty)
+        if token != empty and tokens.get(name) == empty:
+            lost.append(name)
+    return lost
+
+
+def encode_for_budget(report: WeatherReportData, budget: int = SEGMENT_SEPTETS,
+                      original: Optional[str] = None) -> EncodedReport:
+    """
+    Encode a report in at most budget septets with as little loss as possible.
+
+    Args:
+        report: Weather report data
+        budget: Maximum length in GSM-7 septets
+        original: Result output the report is re-encoded from; fields it shows
+            that the report data leaves empty are recorded as 'drop_field'
+
+    Returns:
+        EncodedReport with the text and, per field, the compression steps
+        that changed it ('truncate' if even the smallest form did not fit)
+    """
+    validator = GSM7Validator()
+
+    def measure(text: str) -> Tuple[str, int]:
+        normalized = validator.normalize_to_gsm7(text)
+        return normalized, validator.septet_length(normalized)
+
+    options = _Options()
+    text, tokens = _render(report, options)
+    text, septets = measure(text)
+    compressed: Dict[str, List[str]] = {}
+    if original is not None:
+        for name in _lost_fields(original, tokens):
+            compressed[name] = ['drop_field']
+
+    for step, apply in _steps():
+        if septets <= budget:
+            break
+        if not apply(options):
+            continue
+        new_text, new_tokens = _render(report, options)
+        for name, token in tokens.items():
+            if new_tokens.get(name) != token and step not in compressed.get(name, []):
+                compressed.setdefault(name, []).append(step)
+        if step == 'omit_empty' or step == 'no_separator':
+            compressed.setdefault('layout', []).append(step)
+        text, septets = measure(new_text)
+        tokens = new_tokens
+
+    if septets > budget:
+        text = validator.truncate_to_septets(text, budget)
+        septets = validator.septet_length(text)
+        compressed.setdefault('layout', []).append('truncate')
+
+    return EncodedReport(text=text, septets=septets, budget=budget, compressed=compressed)
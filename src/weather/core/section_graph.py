@@ -0,0 +1,143 @@
+"""
+Section Graph
+
+Small dependency-graph executor for the report sections. Each node names
+the nodes whose results it needs; a node starts as soon as all of them are
+done, so independent sections run concurrently and every upstream (forecast,
+vigilance bulletin, fire dataset) is fetched once by its own node. The wall
+time of every node is recorded for profiling.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from .deadline import Deadline
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SectionNode:
+    """One node: func receives the results of deps as a dictionary."""
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    deps: Sequence[str] = ()
+
+
+@dataclass
+class GraphRun:
+    """Outcome of one graph run."""
+    results: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    cut: List[str] = field(default_factory=list)
+
+    def format_timings(self) -> str:
+        """Return the node timings as 'name 0.12s, ...' in execution order."""
+        return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.timings.items())
+
+
+class SectionGraph:
+    """
+    Dependency graph of report sections.
+    """
+
+    def __init__(self, nodes: Iterable[SectionNode]):
+        """
+        Build the graph.
+
+        Args:
+            nodes: Graph nodes; dependencies may also name initial values passed to run()
+
+        Raises:
+            ValueError: If a node name is used twice or the graph has a cycle
+        """
+        self.nodes: Dict[str, SectionNode] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Duplicate section node: {node.name}")
+            self.nodes[node.name] = node
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        visiting, done = set(), set()
+
+        def visit(name: str) -> None:
+            if name in done or name not in self.nodes:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle in section graph at {name}")
+            visiting.add(name)
+            for dep in self.nodes[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.nodes:
+            visit(name)
+
+    def run(self, initial: Optional[Dict[str, Any]] = None, max_workers: int = 4,
+            deadline: Optional[Deadline] = None) -> GraphRun:
+        """
+        Execute all nodes, each as soon as its dependencies are done.
+
+        A node that raises yields None to its dependents and is listed in
+        errors. Nodes not finished when the deadline expires are listed in cut.
+
+        Args:
+            initial: Already available results (e.g. fetched forecast data)
+            max_workers: Number of nodes running concurrently
+            deadline: Time budget of the run (unlimited if None)
+
+        Returns:
+            GraphRun with results, per-node timings, errors and cut nodes
+        """
+        run = GraphRun(results=dict(initial or {}))
+        for name, node in self.nodes.items():
+            missing = [dep for dep in node.deps if dep not in self.nodes and dep not in run.results]
+            if missing:
+                raise ValueError(f"Section node {name} depends on unknown {', '.join(missing)}")
+
+        deadline = deadline or Deadline()
+        pending = {name: node for name, node in self.nodes.items() if name not in run.results}
+        running: Dict[Future, str] = {}
+
+        def execute(node: SectionNode, inputs: Dict[str, Any]) -> Any:
+            started = time.perf_counter()
+            try:
+                return node.func(inputs)
+            finally:
+                run.timings[node.name] = time.perf_counter() - started
+
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="section")
+        try:
+            while pending or running:
+                for name in [n for n, node in pending.items() if all(d in run.results for d in node.deps)]:
+                    node = pending.pop(name)
+                    inputs = {dep: run.results[dep] for dep in node.deps}
+                    running[executor.submit(execute, node, inputs)] = name
+
+                if not running:
+                    break
+                done, _ = wait(running, timeout=deadline.remaining(), return_when=FIRST_COMPLETED)
+                if not done:
+                    break
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        run.results[name] = future.result()
+                    except Exception as e:
+                        logger.error(f"Section {name} failed: {e}")
+                        run.errors[name] = str(e)
+                        run.results[name] = None
+        finally:
+            run.cut = [name for name in self.nodes if name in pending or name in running.values()]
+            executor.shutdown(wait=not run.cut, cancel_futures=True)
+
+        if run.cut:
+            logger.warning(f"Time budget spent, sections cut: {', '.join(run.cut)}")
+        logger.info(f"Section timings: {run.format_timings()}")
+        return run
@@ -12,6 +12,11 @@ import logging
 from meteofrance_api.client import MeteoFranceClient
 from meteofrance_api.model import Forecast, Place
 
+try:
+    from src.wetter.vigilance_cache import get_vigilance_cache
+except ImportError:
+    from wetter.vigilance_cache import get_vigilance_cache
+
 try:
     from src.wetter.fetch_openmeteo import fetch_openmeteo_forecast
 except ImportError:
@@ -252,7 +257,7 @@ def get_alerts(lat: float, lon: float) -> List[Alert]:
     try:
         client = MeteoFranceClient()
         department = _get_department_from_coordinates(lat, lon)
-        warnings = client.get_warning_current_phenomenons(department)
+        warnings = get_vigilance_cache().get_current_phenomenons(department, client)
         alerts = []
         max_colors = getattr(warnings, 'phenomenons_max_colors', None)
         if isinstance(max_colors, dict):
@@ -0,0 +1,310 @@
+"""
+Department-level vigilance bulletin cache.
+
+Météo-France publishes vigilance bulletins per department only a few times a
+day (regularly at 06:00 and 16:00, plus ad-hoc updates). Report generation,
+debug output and the monitor script used to request the same department
+bulletin again for every stage, position and report type.
+
+This module keeps one entry per (bulletin kind, department) on disk below
+.data/vigilance_cache/ together with the bulletin timestamp (update_time)
+and its end of validity. An entry is reused by all processes until the next
+scheduled bulletin is due or the bulletin validity ends. Refreshes send
+If-None-Match / If-Modified-Since when the endpoint returned validators, so
+an unchanged bulletin costs a 304 instead of a full download.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import requests
+from meteofrance_api.model import CurrentPhenomenons, Full
+
+try:
+    from src.utils.file_lock import file_lock, atomic_write_json
+except ImportError:
+    from utils.file_lock import file_lock, atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = ".data/vigilance_cache"
+DEFAULT_BULLETIN_TIMES = ("06:00", "16:00")
+
+# Bulletin kinds and their meteofrance-api REST paths
+KIND_CURRENT = "currentphenomenons"
+KIND_FULL = "full"
+METEOFRANCE_PATHS = {
+    KIND_CURRENT: "v3/warning/currentphenomenons",
+    KIND_FULL: "v3/warning/full",
+}
+
+# fetcher(conditional_headers) -> (payload or None if not modified, validators)
+Fetcher = Callable[[Dict[str, str]], Tuple[Optional[Dict[str, Any]], Dict[str, str]]]
+
+
+def validators_from_headers(headers: Any) -> Dict[str, str]:
+    """
+    Extract HTTP cache validators from response headers.
+
+    Args:
+        headers: Response headers mapping
+
+    Returns:
+        Dictionary with 'etag' and/or 'last_modified' if present
+    """
+    validators = {}
+    if headers is None:
+        return validators
+    etag = headers.get('ETag')
+    last_modified = headers.get('Last-Modified')
+    if isinstance(etag, str) and etag:
+        validators['etag'] = etag
+    if isinstance(last_modified, str) and last_modified:
+        validators['last_modified'] = last_modified
+    return validators
+
+
+def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Build conditional request headers from a cached entry.
+
+    Args:
+        entry: Cached entry or None
+
+    Returns:
+        Headers dictionary (empty if no validators are known)
+    """
+    headers = {}
+    if not entry:
+        return headers
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+class VigilanceCache:
+    """
+    Cross-process cache for department vigilance bulletins.
+
+    Entries are stored as JSON files named <kind>_<department>.json and
+    carry the bulletin timestamp, so a refresh that returns the same
+    bulletin is recognized as unchanged.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 bulletin_times: Sequence[str] = DEFAULT_BULLETIN_TIMES,
+                 clock: Callable[[], datetime] = datetime.now):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for cache files
+            bulletin_times: Local times ("HH:MM") at which new bulletins are published
+            clock: Function returning the current local time
+        """
+        self.cache_dir = cache_dir
+        self.bulletin_times = sorted(
+            tuple(int(part) for part in str(t).split(':')) for t in bulletin_times
+        )
+        self.clock = clock
+        self._memory: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.fetch_count = 0
+
+    def get_current_phenomenons(self, department: str, client: Any = None) -> CurrentPhenomenons:
+        """
+        Get the current phenomenons bulletin for a department.
+
+        Args:
+            department: Department code (e.g. "2A")
+            client: Optional MeteoFranceClient to use for fetching
+
+        Returns:
+            CurrentPhenomenons bulletin
+        """
+        return self._get_meteofrance(KIND_CURRENT, department, client, CurrentPhenomenons)
+
+    def get_warning_full(self, department: str, client: Any = None) -> Full:
+        """
+        Get the full vigilance bulletin (including timelaps) for a department.
+
+        Args:
+            department: Department code (e.g. "2A")
+            client: Optional MeteoFranceClient to use for fetching
+
+        Returns:
+            Full bulletin
+        """
+        return self._get_meteofrance(KIND_FULL, department, client, Full)
+
+    def get(self, kind: str, department: str, fetcher: Fetcher) -> Optional[Dict[str, Any]]:
+        """
+        Get a raw bulletin payload, fetching it only if no current entry exists.
+
+        Args:
+            kind: Bulletin kind, used as part of the cache key
+            department: Department code
+            fetcher: Callable performing the (conditional) request
+
+        Returns:
+            Raw bulletin payload or None if nothing could be fetched
+        """
+        key = (kind, str(department))
+        now = self.clock()
+
+        entry = self._memory.get(key)
+        if entry and self._is_fresh(entry, now):
+            return entry['payload']
+
+        path = self._entry_path(kind, department)
+        with file_lock(f"{path}.lock"):
+            # Another process may have refreshed the entry while we waited
+            entry = self._read_entry(path)
+            if entry and self._is_fresh(entry, now):
+                logger.debug(f"Vigilance {kind} for department {department} served from cache "
+                             f"(bulletin {entry.get('update_time')})")
+                self._memory[key] = entry
+                return entry['payload']
+
+            payload, validators = fetcher(conditional_headers(entry))
+            self.fetch_count += 1
+
+            if payload is None:
+                if not entry:
+                    return None
+                logger.info(f"Vigilance {kind} for department {department} not modified")
+            else:
+                previous_update = entry.get('update_time') if entry else None
+                metadata = payload if isinstance(payload, dict) else {}
+                entry = {
+                    'kind': kind,
+                    'department': str(department),
+                    'update_time': metadata.get('update_time'),
+                    'end_validity_time': metadata.get('end_validity_time'),
+                    'payload': payload,
+                }
+                if previous_update is not None and previous_update == entry['update_time']:
+                    logger.info(f"Vigilance {kind} for department {department} unchanged "
+                                f"(bulletin {previous_update})")
+                else:
+                    logger.info(f"Fetched vigilance {kind} for department {department} "
+                                f"(bulletin {entry['update_time']})")
+
+            entry['fetched_at'] = now.isoformat()
+            entry.update(validators)
+            self._write_entry(path, entry)
+            self._memory[key] = entry
+            return entry['payload']
+
+    def clear(self) -> None:
+        """Drop the in-memory layer (disk entries remain valid for other processes)."""
+        self._memory.clear()
+
+    def _get_meteofrance(self, kind: str, department: str, client: Any, model: type) -> Any:
+        """Fetch a meteofrance-api warning bulletin through the cache."""
+        if client is None:
+            from meteofrance_api.client import MeteoFranceClient
+            client = MeteoFranceClient()
+
+        session = getattr(client, 'session', None)
+        if not isinstance(session, requests.Session):
+            # Without raw HTTP access there are no payloads to store
+            if kind == KIND_FULL:
+                return client.get_warning_full(department)
+            return client.get_warning_current_phenomenons(department)
+
+        def fetch(headers: Dict[str, str]) -> Tuple[Optional[Dict[str, Any]], Dict[str, str]]:
+            response = session.request(
+                "get", METEOFRANCE_PATHS[kind], params={"domain": department}, headers=headers
+            )
+            if response.status_code == 304:
+                return None, validators_from_headers(response.headers)
+            return response.json(), validators_from_headers(response.headers)
+
+        payload = self.get(kind, department, fetch)
+        if payload is None:
+            raise RuntimeError(f"No vigilance {kind} bulletin available for department {department}")
+        return model(payload)
+
+    def _is_fresh(self, entry: Dict[str, Any], now: datetime) -> bool:
+        """Check whether an entry still holds the latest scheduled bulletin."""
+        end_validity = entry.get('end_validity_time')
+        if isinstance(end_validity, (int, float)) and now.timestamp() >= end_validity:
+            return False
+        try:
+            fetched_at = datetime.fromisoformat(entry['fetched_at'])
+        except (KeyError, TypeError, ValueError):
+            return False
+        return fetched_at >= self._last_bulletin_time(now)
+
+    def _last_bulletin_time(self, now: datetime) -> datetime:
+        """Return the most recent scheduled bulletin time at or before now."""
+        for hour, minute in reversed(self.bulletin_times):
+            slot = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if slot <= now:
+                return slot
+        hour, minute = self.bulletin_times[-1]
+        return (now - timedelta(days=1)).replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+    def _entry_path(self, kind: str, department: str) -> str:
+        """Return the cache file path for a bulletin."""
+        return os.path.join(self.cache_dir, f"{kind}_{department}.json")
+
+    def _read_entry(self, path: str) -> Optional[Dict[str, Any]]:
+        """Read a cache entry, ignoring missing or corrupted files."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable vigilance cache entry {path}: {e}")
+            return None
+
+    def _write_entry(self, path: str, entry: Dict[str, Any]) -> None:
+        """Persist a cache entry; failures only cost a later refetch."""
+        try:
+            atomic_write_json(path, entry)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to write vigilance cache entry {path}: {e}")
+
+
+_default_cache: Optional[VigilanceCache] = None
+
+
+def get_vigilance_cache(config: Optional[Dict[str, Any]] = None) -> VigilanceCache:
+    """
+    Get the process-wide vigilance cache.
+
+    The optional config section 'vigilance_cache' may set 'directory' and
+    'bulletin_times'; it is only evaluated when the cache is first created.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        Shared VigilanceCache instance
+    """
+    global _default_cache
+    if _default_cache is None:
+        settings = (config or {}).get('vigilance_cache', {}) or {}
+        _default_cache = VigilanceCache(
+            cache_dir=settings.get('directory', DEFAULT_CACHE_DIR),
+            bulletin_times=settings.get('bulletin_times', DEFAULT_BULLETIN_TIMES),
+        )
+    return _default_cache
+
+
+def reset_vigilance_cache(cache: Optional[VigilanceCache] = None) -> None:
+    """
+    Replace the process-wide vigilance cache (mainly for tests).
+
+    Args:
+        cache: New cache instance or None to create a default one lazily
+    """
+    global _default_cache
+    _default_cache = cache
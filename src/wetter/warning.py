@@ -9,6 +9,13 @@ try:
 except ImportError:
     from auth.meteo_token_provider import MeteoTokenProvider
 
+try:
+    from src.wetter.department_mapper import get_department_from_coordinates
+    from src.wetter.vigilance_cache import get_vigilance_cache, validators_from_headers
+except ImportError:
+    from wetter.department_mapper import get_department_from_coordinates
+    from wetter.vigilance_cache import get_vigilance_cache, validators_from_headers
+
 
 @dataclass
 class WeatherAlert:
@@ -22,6 +29,9 @@ def fetch_warnings(lat: float, lon: float) -> List[WeatherAlert]:
     """
     Fetch weather warnings from Météo-France Vigilance API using OAuth2.
     
+    The bulletin is department-wide, so it is fetched through the shared
+    vigilance cache keyed by the department of the position.
+    
     Args:
         lat: Latitude in decimal degrees (-90 to 90)
         lon: Longitude in decimal degrees (-180 to 180)
@@ -33,19 +43,29 @@ def fetch_warnings(lat: float, lon: float) -> List[WeatherAlert]:
         RuntimeError: If OAuth token is missing or API request fails
         Exception: If HTTP request fails or other errors occur
     """
-    # Get OAuth token using the centralized token provider
-    token_provider = MeteoTokenProvider()
-    token = token_provider.get_token()
+    url = f"https://portail-api.meteofrance.fr/vigilance/public/bulletin?lat={lat}&lon={lon}"
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json"
-    }
+    def fetch_bulletin(conditional: dict) -> tuple:
+        # Get OAuth token using the centralized token provider
+        token_provider = MeteoTokenProvider()
+        token = token_provider.get_token()
 
-    url = f"https://portail-api.meteofrance.fr/vigilance/public/bulletin?lat={lat}&lon={lon}"
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-    data = response.json()
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/json",
+            **conditional
+        }
+        response = requests.get(url, headers=headers)
+        if response.status_code == 304:
+            return None, validators_from_headers(response.headers)
+        response.raise_for_status()
+        return response.json(), validators_from_headers(response.headers)
+
+    department = get_department_from_coordinates(lat, lon)
+    if department:
+        data = get_vigilance_cache().get("bulletin", department, fetch_bulletin) or {}
+    else:
+        data, _ = fetch_bulletin({})
 
     results = []
     for entry in data.get("timelaps", []):
@@ -1,5 +1,24 @@
 import sys
 import os
+import importlib
+
+import pytest
 
 # Add src directory to Python path for imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))) 
\ No newline at end of file
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+
+@pytest.fixture(autouse=True)
+def isolated_vigilance_cache(tmp_path):
+    """Keep cached vigilance bulletins from leaking between tests."""
+    modules = []
+    for name in ('wetter.vigilance_cache', 'src.wetter.vigilance_cache'):
+        try:
+            modules.append(importlib.import_module(name))
+        except ImportError:
+            continue
+    for module in modules:
+        module.reset_vigilance_cache(module.VigilanceCache(cache_dir=str(tmp_path / "vigilance_cache")))
+    yield
+    for module in modules:
+        module.reset_vigilance_cache()
@@ -0,0 +1,132 @@
+"""
+Tests for the parallel all-stages batch report generation.
+"""
+
+import copy
+import json
+import threading
+import time
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+
+from src.report.batch_report_generator import generate_all_stage_reports, stage_config
+from src.weather.core.forecast_snapshot import ForecastSnapshot
+
+
+GENERATE_REPORT = "src.report.batch_report_generator.MorningEveningRefactor.generate_report"
+
+ETAPPEN = [
+    {"name": "Conca", "punkte": [{"lat": 41.7, "lon": 9.3}, {"lat": 41.8, "lon": 9.2}]},
+    {"name": "Asinau", "punkte": [{"lat": 41.8, "lon": 9.2}, {"lat": 41.9, "lon": 9.1}]},
+    {"name": "Corte", "punkte": [{"lat": 42.3, "lon": 9.1}]},
+]
+
+
+class FakeClient:
+    """Forecast client that counts fetches per coordinate."""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get_forecast(self, lat, lon):
+        time.sleep(0.01)
+        with self.lock:
+            self.calls.append((lat, lon))
+        return {"lat": lat, "lon": lon}
+
+
+@pytest.fixture
+def etappen_path(tmp_path):
+    path = tmp_path / "etappen.json"
+    path.write_text(json.dumps(ETAPPEN), encoding="utf-8")
+    return str(path)
+
+
+class TestForecastSnapshot:
+    """Test cases for ForecastSnapshot."""
+
+    def test_concurrent_requests_fetch_once(self):
+        client = FakeClient()
+        snapshot = ForecastSnapshot(client)
+        threads = [threading.Thread(target=snapshot.get_forecast, args=(41.7, 9.3)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert client.calls == [(41.7, 9.3)]
+        assert snapshot.fetch_count == 1
+
+    def test_prefetch_deduplicates_coordinates(self):
+        client = FakeClient()
+        snapshot = ForecastSnapshot(client)
+
+        snapshot.prefetch([(41.7, 9.3), (41.8, 9.2), (41.700000001, 9.3)])
+
+        assert sorted(client.calls) == [(41.7, 9.3), (41.8, 9.2)]
+        assert snapshot.get_forecast(41.8, 9.2) == {"lat": 41.8, "lon": 9.2}
+        assert snapshot.fetch_count == 2
+
+
+class TestBatchReportGenerator:
+    """Test cases for generate_all_stage_reports."""
+
+    def test_stage_config_is_a_copy(self):
+        config = {"startdatum": "2025-07-01", "thresholds": {"rain_amount": 0.2}}
+        original = copy.deepcopy(config)
+
+        result = stage_config(config, 2, date(2025, 8, 10))
+
+        assert result["startdatum"] == "2025-08-08"
+        assert config == original
+
+    def test_generates_all_stages_with_shared_snapshot(self, etappen_path):
+        config = {"startdatum": "2025-07-01"}
+        client = FakeClient()
+        seen = []
+
+        def fake_generate(refactor, stage_name, report_type, target_date, compared_fingerprint=None, render_debug=True):
+            seen.append((stage_name, refactor.config["startdatum"], target_date, refactor.forecast_client))
+            return f"{stage_name}: evening", "debug"
+
+        with patch(GENERATE_REPORT, fake_generate):
+            reports = generate_all_stage_reports(
+                config, "evening", date(2025, 8, 10), etappen_path=etappen_path,
+                snapshot=ForecastSnapshot(client)
+            )
+
+        assert [r.stage_name for r in reports] == ["Conca", "Asinau", "Corte"]
+        assert all(r.success and r.result_output == f"{r.stage_name}: evening" for r in reports)
+        assert sorted((name, start, target) for name, start, target, _ in seen) == [
+            ("Asinau", "2025-08-09", "2025-08-10"),
+            ("Conca", "2025-08-10", "2025-08-10"),
+            ("Corte", "2025-08-08", "2025-08-10"),
+        ]
+        assert len({id(forecast_client) for *_, forecast_client in seen}) == 1
+        assert len(client.calls) == 4
+        assert config == {"startdatum": "2025-07-01"}
+
+    def test_failed_stage_is_reported(self, etappen_path):
+        def fake_generate(refactor, stage_name, report_type, target_date, compared_fingerprint=None, render_debug=True):
+            if stage_name == "Asinau":
+                raise RuntimeError("boom")
+            return f"{stage_name}: NO DATA", ""
+
+        with patch(GENERATE_REPORT, fake_generate):
+            reports = generate_all_stage_reports(
+                {}, "evening", date(2025, 8, 10), stage_offsets=[1, 2], etappen_path=etappen_path,
+                snapshot=ForecastSnapshot(FakeClient())
+            )
+
+        assert [(r.stage_offset, r.success, r.error) for r in reports] == [
+            (1, False, "boom"),
+            (2, False, "Corte: NO DATA"),
+        ]
+
+    def test_invalid_stage_offset(self, etappen_path):
+        with pytest.raises(ValueError):
+            generate_all_stage_reports({}, stage_offsets=[5], etappen_path=etappen_path,
+                                       snapshot=ForecastSnapshot(FakeClient()))
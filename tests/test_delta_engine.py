@@ -0,0 +1,108 @@
+"""
+Tests for the vectorized delta engine.
+"""
+
+import random
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.logic.delta_engine import COMPARED_ELEMENTS, SLOTS, DeltaEngine, feature_vector
+from src.logic.dynamic_report_comparator import DynamicReportComparator
+from src.logic.report_store import ReportStore, REPORT_STORE_FILENAME
+
+
+DELTA_THRESHOLDS = {
+    'rain_amount': 0.5,
+    'rain_probability': 10,
+    'wind_speed': 5,
+    'thunderstorm': 1,
+}
+
+
+def random_report(rng):
+    """Create a random report with optional values and mixed time formats."""
+    report = {}
+    for element, _ in COMPARED_ELEMENTS:
+        if rng.random() < 0.1:
+            continue
+        hour = rng.choice([None, 12, 13, "14", "15:00"])
+        report[element] = {
+            'threshold_value': rng.choice([None, 1.0, 2.0]),
+            'threshold_time': hour,
+            'max_value': rng.choice([None, 0.0, 0.4, 1.0, 5.0, 12.0]),
+            'max_time': rng.choice([None, 16, "17", "18:00"]),
+        }
+    return report
+
+
+class TestDeltaEngine:
+    """Test cases for DeltaEngine."""
+
+    def test_feature_vector_layout(self):
+        vector = feature_vector({'wind': {'max_value': 20, 'threshold_time': '14:00', 'max_time': 16}})
+
+        assert vector.shape == (len(SLOTS),)
+        assert vector[SLOTS.index(('wind', 'max_value'))] == 20
+        assert vector[SLOTS.index(('wind', 'threshold_time'))] == 14
+        assert vector[SLOTS.index(('wind', 'max_time'))] == 16
+        assert np.isnan(vector[SLOTS.index(('rain_mm', 'max_value'))])
+
+    def test_changed_slots(self):
+        engine = DeltaEngine(DELTA_THRESHOLDS)
+        previous = feature_vector({'wind': {'max_value': 10, 'max_time': 14}, 'rain_mm': {'max_value': 1.0}})
+        current = feature_vector({'wind': {'max_value': 12, 'max_time': 16}, 'rain_mm': {'max_value': 2.0}})
+
+        assert engine.changed_slots(current, previous) == [('rain_mm', 'max_value'), ('wind', 'max_time')]
+
+    def test_zero_threshold_disables_element(self):
+        engine = DeltaEngine({'wind_speed': 0})
+        previous = feature_vector({'wind': {'max_value': 10}})
+        current = feature_vector({'wind': {'max_value': 50}})
+
+        assert engine.changed_slots(current, previous) == []
+
+    def test_many_reports_in_one_pass(self):
+        engine = DeltaEngine(DELTA_THRESHOLDS)
+        current = feature_vector({'wind': {'max_value': 20}})
+        earlier = [feature_vector({'wind': {'max_value': value}}) for value in (10, 18, 30)]
+
+        assert engine.changed_slots_many(current, earlier) == [
+            [('wind', 'max_value')], [], [('wind', 'max_value')]
+        ]
+
+
+class TestComparatorEquivalence:
+    """compare_reports gives the same result as the per-element comparison."""
+
+    def test_matches_element_comparison(self):
+        comparator = DynamicReportComparator({'delta_thresholds': DELTA_THRESHOLDS})
+        rng = random.Random(42)
+
+        for _ in range(500):
+            current, previous = random_report(rng), random_report(rng)
+            expected = {}
+            for element, threshold_key in COMPARED_ELEMENTS:
+                changed, details = comparator._compare_element(current, previous, element, threshold_key)
+                if changed:
+                    expected[element] = details
+
+            should_send, change_details = comparator.compare_reports(current, previous)
+
+            assert should_send == bool(expected)
+            assert [c['element'] for c in change_details['changes']] == list(expected)
+            for element, details in expected.items():
+                assert change_details[element] == details
+
+    def test_compare_with_history(self, tmp_path):
+        comparator = DynamicReportComparator({'delta_thresholds': DELTA_THRESHOLDS})
+        comparator.data_dir = str(tmp_path)
+        store = ReportStore(str(tmp_path / REPORT_STORE_FILENAME))
+        for value in (10, 20):
+            store.append('Corte', date(2025, 8, 1), 'dynamic', {'wind': {'max_value': value}})
+        store.append('Corte', date(2025, 8, 2), 'morning', {'wind': {'max_value': 50}})
+
+        result = comparator.compare_with_history({'wind': {'max_value': 21}}, 'Corte', date(2025, 8, 1))
+
+        assert [entry['changed_slots'] for entry in result] == [['wind.max_value'], []]
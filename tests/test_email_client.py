@@ -114,7 +114,7 @@ class TestEmailClient:
         with pytest.raises(ValueError, match="SMTP configuration is required"):
             EmailClient(config)
     
-    @patch('src.notification.email_client.smtplib.SMTP')
+    @patch('src.notification.smtp_session.smtplib.SMTP')
     def test_send_email_success(self, mock_smtp):
         """Test successful email sending."""
         config = {
@@ -142,7 +142,7 @@ class TestEmailClient:
         mock_smtp_instance.sendmail.assert_called_once()
         mock_smtp_instance.quit.assert_called_once()
     
-    @patch('src.notification.email_client.smtplib.SMTP')
+    @patch('src.notification.smtp_session.smtplib.SMTP')
     def test_send_email_smtp_error(self, mock_smtp):
         """Test email sending with SMTP error."""
         config = {
@@ -834,4 +834,195 @@ class TestGenerateGR20ReportText:
         
         # Test case insensitive phenomenon
         alerts = [{"phenomenon": "THUNDERSTORM", "level": "orange"}]
-        assert _format_vigilance_warning(alerts) == "ORANGE Gewitter" 
\ No newline at end of file
+        assert _format_vigilance_warning(alerts) == "ORANGE Gewitter" 
+
+class TestDebugAttachment:
+    """Debug output is sent as gzip attachment when debug is enabled."""
+
+    CONFIG = {
+        "smtp": {
+            "host": "smtp.gmail.com",
+            "port": 587,
+            "user": "test@example.com",
+            "to": "recipient@example.com",
+            "subject": "GR20 Wetter",
+            "password": "test_password"
+        },
+        "debug": {"enabled": True}
+    }
+
+    REPORT = {
+        "location": "Corte",
+        "report_type": "morning",
+        "report_time": datetime(2025, 8, 1, 4, 30),
+        "result_output": "Corte: N8 D24 R0.2@6",
+        "debug_output": "# DEBUG DATENEXPORT\n\n" + "\n".join(f"T1G1 | {h}:00 | 0.2" for h in range(500))
+    }
+
+    @patch("src.notification.smtp_session.smtplib.SMTP")
+    def test_debug_output_is_attached_compressed(self, mock_smtp):
+        import email
+        import gzip
+
+        client = EmailClient(self.CONFIG)
+        assert client.send_gr20_report(dict(self.REPORT)) is True
+
+        raw = mock_smtp.return_value.sendmail.call_args[0][2]
+        parts = [part for part in email.message_from_string(raw).walk() if not part.is_multipart()]
+        body = parts[0].get_payload(decode=True).decode("utf-8")
+        assert body.startswith("Corte: N8 D24 R0.2@6")
+        assert "T1G1 |" not in body
+        assert parts[1].get_filename() == "debug_2025-08-01_morning_Corte.txt.gz"
+        assert gzip.decompress(parts[1].get_payload(decode=True)).decode("utf-8") == self.REPORT["debug_output"]
+        assert len(raw) < len(self.REPORT["debug_output"])
+
+    @patch("src.notification.smtp_session.smtplib.SMTP")
+    def test_debug_inline_when_attachment_disabled(self, mock_smtp):
+        config = dict(self.CONFIG, debug={"enabled": True, "email_attachment": False})
+
+        with patch.object(EmailClient, "send_email", return_value=True) as mock_send:
+            EmailClient(config).send_gr20_report(dict(self.REPORT))
+
+        assert "T1G1 | 499:00" in mock_send.call_args[0][0]
+        assert mock_send.call_args[1]["attachments"] == []
+
+    def test_debug_report_is_rendered_at_send_time(self, tmp_path):
+        import gzip
+        import json
+        from src.notification.email_client import render_debug_attachment
+        from src.weather.core.morning_evening_refactor import (MorningEveningRefactor, WeatherReportData,
+                                                                WeatherThresholdData)
+
+        etappen_path = tmp_path / "etappen.json"
+        etappen_path.write_text(json.dumps([{"name": "Corte", "punkte": [{"lat": 42.3, "lon": 9.15}]}]))
+        refactor = MorningEveningRefactor({"startdatum": "2025-08-01", "debug": {"enabled": True}},
+                                          etappen_path=str(etappen_path))
+        refactor._last_weather_data = {"hourly_data": [{"data": [
+            {"dt": int(datetime(2025, 8, 1, hour).timestamp()), "rain": {"1h": 0.4 if hour == 14 else 0}}
+            for hour in range(24)
+        ]}]}
+        risks = WeatherThresholdData()
+        risks.debug_info = {"hrain_threshold_value": 20, "hrain_max_value": 35}
+        report = WeatherReportData(
+            stage_name="Corte", report_date=datetime(2025, 8, 1).date(), report_type="morning",
+            night=WeatherThresholdData(8.0), day=WeatherThresholdData(24.0),
+            rain_mm=WeatherThresholdData(0.4, "14", 0.4, "14", [{"T1G1": {"14:00": 0.4}}]),
+            rain_percent=WeatherThresholdData(), wind=WeatherThresholdData(), gust=WeatherThresholdData(),
+            thunderstorm=WeatherThresholdData(), thunderstorm_plus_one=WeatherThresholdData(),
+            risks=risks, risk_zonal=WeatherThresholdData()
+        )
+        # Queued as JSON in the outbox
+        debug_report = json.loads(json.dumps(refactor.encode_debug_report(report)))
+
+        path = render_debug_attachment(dict(self.REPORT, debug_output=None, debug_report=debug_report), self.CONFIG)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as attachment:
+                rendered = attachment.read()
+        finally:
+            os.remove(path)
+
+        assert rendered == refactor.generate_debug_output(report)
+        assert "14:00 | 0.4" in rendered
+
+    def test_debug_not_generated_without_include_debug(self):
+        report = {"location": "Corte", "report_type": "morning", "result_output": "Corte: N8"}
+
+        with patch("src.notification.email_client.generate_debug_email_append") as mock_debug:
+            text = generate_gr20_report_text(report, self.CONFIG, include_debug=False)
+
+        assert text == "Corte: N8"
+        mock_debug.assert_not_called()
+
+
+class TestDigest:
+    """Reports of a batch are sent as digest mails with one section per stage."""
+
+    CONFIG = {
+        "smtp": {
+            "host": "smtp.gmail.com",
+            "port": 587,
+            "user": "test@example.com",
+            "to": "recipient@example.com",
+            "subject": "GR20 Wetter",
+            "password": "test_password"
+        }
+    }
+
+    @staticmethod
+    def make_report(stage, debug_lines=0):
+        return {
+            "location": stage,
+            "report_type": "evening",
+            "report_time": datetime(2025, 8, 1, 19, 0),
+            "result_output": f"{stage}: N8 D24 R0.2@6",
+            "debug_output": "# DEBUG DATENEXPORT\n" + "\n".join(f"{stage} | {h}:00" for h in range(debug_lines))
+        }
+
+    @staticmethod
+    def sent_messages(mock_smtp):
+        import email
+        return [email.message_from_string(call[0][2]) for call in mock_smtp.return_value.sendmail.call_args_list]
+
+    @patch("src.notification.smtp_session.smtplib.SMTP")
+    def test_one_mail_with_section_per_stage(self, mock_smtp):
+        client = EmailClient(self.CONFIG)
+
+        results = client.send_digest(self.make_report(stage) for stage in ("Calenzana", "Ortu", "Carrozzu"))
+
+        assert results == [True]
+        assert mock_smtp.call_count == 1
+        message = self.sent_messages(mock_smtp)[0]
+        assert message["Subject"] == "GR20 Wetter Digest: 3 Etappen (evening)"
+        body = message.get_payload()[0].get_payload(decode=True).decode("utf-8")
+        assert body.index("=== Calenzana (evening) ===\nCalenzana: N8 D24 R0.2@6") < body.index("=== Ortu (evening) ===")
+        assert "=== Carrozzu (evening) ===" in body
+
+    @patch("src.notification.smtp_session.smtplib.SMTP")
+    def test_split_by_size_over_one_connection(self, mock_smtp):
+        client = EmailClient(dict(self.CONFIG, smtp=dict(self.CONFIG["smtp"], digest_max_bytes=3000)))
+
+        results = client.send_digest(self.make_report(f"Stage{i}", debug_lines=100) for i in range(4))
+
+        assert results == [True, True, True, True]
+        assert mock_smtp.call_count == 1
+        subjects = [message["Subject"] for message in self.sent_messages(mock_smtp)]
+        assert subjects[0] == "GR20 Wetter Digest: 1 Etappen (evening) [1/4]"
+        assert subjects[3].endswith("[4/4]")
+
+    @patch("src.notification.smtp_session.smtplib.SMTP")
+    def test_debug_output_in_one_attachment(self, mock_smtp):
+        import gzip
+
+        config = dict(self.CONFIG, debug={"enabled": True})
+
+        assert EmailClient(config).send_digest([self.make_report("Corte", 50), self.make_report("Vizzavona", 50)]) == [True]
+
+        parts = [part for part in self.sent_messages(mock_smtp)[0].walk() if not part.is_multipart()]
+        body = parts[0].get_payload(decode=True).decode("utf-8")
+        assert "Corte | 49:00" not in body
+        assert body.endswith("# DEBUG DATENEXPORT: debug_digest_evening_1.txt.gz")
+        debug = gzip.decompress(parts[1].get_payload(decode=True)).decode("utf-8")
+        assert debug.index("=== Corte (evening) ===") < debug.index("Corte | 49:00") < debug.index("Vizzavona | 0:00")
+
+    def test_temporary_files_are_removed(self):
+        from tempfile import mkstemp as real_mkstemp
+
+        created = []
+
+        def mkstemp(**kwargs):
+            fd, path = real_mkstemp(**kwargs)
+            created.append(path)
+            return fd, path
+
+        config = dict(self.CONFIG, debug={"enabled": True})
+        with patch.object(EmailClient, "send_email", return_value=False), \
+                patch("src.notification.email_client.tempfile.mkstemp", side_effect=mkstemp):
+            assert EmailClient(config).send_digest([self.make_report("Corte", 5)]) == [False]
+
+        assert len(created) == 2
+        assert not any(os.path.exists(path) for path in created)
+
+    def test_no_reports_no_mail(self):
+        with patch.object(EmailClient, "send_email") as mock_send:
+            assert EmailClient(self.CONFIG).send_digest([]) == []
+        mock_send.assert_not_called()
@@ -0,0 +1,126 @@
+"""
+Tests for the fire risk change watcher.
+"""
+
+import json
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from src.fire.fire_risk_watcher import FireRiskWatcher, diff_fire_risk, format_fire_risk_changes
+from src.logic.dynamic_report_comparator import DynamicReportComparator
+
+
+CONFIG = {
+    'delta_thresholds': {'fire_risk_level': 1},
+    'fire_risk_levels': {
+        'zone_risk_mapping': {1: "LOW", 2: "HIGH", 3: "HIGH", 4: "MAX"},
+        'minimum_display_level': 2,
+        'massif_restriction_threshold': 1
+    }
+}
+
+
+def make_response(status_code, data=None, headers=None):
+    """Create a fake HTTP response for the fire dataset."""
+    response = Mock()
+    response.status_code = status_code
+    response.content = json.dumps(data).encode() if data is not None else b""
+    response.headers = headers or {}
+    return response
+
+
+def dataset(zone_208=2, massif_6=(2, 0)):
+    """Create a fire dataset with one GR20 zone and massif set."""
+    return {
+        'zm': {'208': zone_208, '217': 1, '999': 4},
+        'massifs': {'6': list(massif_6), '3': [1, 0]}
+    }
+
+
+@pytest.fixture
+def session():
+    return Mock()
+
+
+@pytest.fixture
+def watcher(tmp_path, session):
+    return FireRiskWatcher(CONFIG, snapshot_path=str(tmp_path / "snapshot.json"), session=session)
+
+
+class TestFireRiskWatcher:
+    """Test polling, snapshots and diffs."""
+
+    NOW = datetime(2025, 8, 1, 10, 0)
+
+    def test_first_poll_stores_snapshot_without_changes(self, watcher, session):
+        session.get.return_value = make_response(200, dataset(), {'ETag': '"v1"'})
+
+        assert watcher.poll(self.NOW) == []
+        snapshot = watcher.load_snapshot()
+        assert snapshot['date'] == "20250801"
+        assert snapshot['etag'] == '"v1"'
+        assert session.get.call_args[0][0].endswith("/20250801.json")
+
+    def test_not_modified_uses_validators(self, watcher, session):
+        session.get.return_value = make_response(200, dataset(), {'ETag': '"v1"'})
+        watcher.poll(self.NOW)
+
+        session.get.return_value = make_response(304)
+        assert watcher.poll(self.NOW) == []
+        assert session.get.call_args[1]['headers'] == {'If-None-Match': '"v1"'}
+
+    def test_same_content_is_detected_by_hash(self, watcher, session):
+        session.get.return_value = make_response(200, dataset())
+        watcher.poll(self.NOW)
+        fetched_at = watcher.load_snapshot()['fetched_at']
+
+        assert watcher.poll(datetime(2025, 8, 1, 11, 0)) == []
+        assert watcher.load_snapshot()['fetched_at'] == fetched_at
+
+    def test_changed_zone_and_massif_are_reported(self, watcher, session):
+        session.get.return_value = make_response(200, dataset())
+        watcher.poll(self.NOW)
+
+        session.get.return_value = make_response(200, dataset(zone_208=4, massif_6=(3, 1)))
+        changes = watcher.poll(self.NOW)
+
+        assert [(c.kind, c.id) for c in changes] == [('zone', 208), ('massif', 6)]
+        assert (changes[0].old_level, changes[0].new_level) == (2, 4)
+        assert (changes[1].old_procedure, changes[1].new_procedure) == (0, 1)
+        assert watcher.load_snapshot()['zm']['208'] == 4
+
+    def test_non_gr20_entries_are_ignored(self):
+        previous = dataset()
+        current = dict(previous, zm={'208': 2, '217': 1, '999': 1})
+
+        assert diff_fire_risk(previous, current, zone_ids=[208, 217]) == []
+        assert len(diff_fire_risk(previous, current)) == 1
+
+
+class TestFireRiskComparison:
+    """Test significance rules and formatting of fire risk changes."""
+
+    def test_level_change_below_display_level_is_ignored(self):
+        changes = [{'kind': 'zone', 'id': 217, 'old_level': 0, 'new_level': 1}]
+
+        should_send, details = DynamicReportComparator(CONFIG).compare_fire_risk(changes)
+
+        assert not should_send
+        assert details['changes'] == []
+
+    def test_restriction_flip_triggers_report(self):
+        changes = [
+            {'kind': 'zone', 'id': 208, 'old_level': 2, 'new_level': 4},
+            {'kind': 'massif', 'id': 6, 'old_level': 2, 'new_level': 3, 'old_procedure': 0, 'new_procedure': 1},
+            {'kind': 'massif', 'id': 3, 'old_level': 1, 'new_level': 2, 'old_procedure': 0, 'new_procedure': 0},
+        ]
+
+        should_send, details = DynamicReportComparator(CONFIG).compare_fire_risk(changes)
+
+        assert should_send
+        assert details['changes'] == [{'element': 'risk_zonal', 'threshold_key': 'fire_risk_level'}]
+        fire_changes = details['risk_zonal']['fire_changes']
+        assert [c['id'] for c in fire_changes] == [208, 6]
+        assert format_fire_risk_changes(fire_changes, CONFIG) == "Z:HIGH208 -> Z:MAX208, M:+6"
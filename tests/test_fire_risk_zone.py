@@ -63,6 +63,25 @@ class TestFireZoneMapper:
             assert zone_num in zones
 
 
+    def test_failed_reload_is_retried(self, tmp_path):
+        """Test that a zone file that could not be read is read again."""
+        from unittest.mock import patch
+        
+        mapper = FireZoneMapper()
+        geojson = tmp_path / "fire_zones.geojson"
+        geojson.write_text(mapper.geojson_path.read_text(encoding="utf-8"), encoding="utf-8")
+        mapper.geojson_path = geojson
+        loaded = mapper.gdf
+        
+        with patch("src.fire.fire_zone_mapper.gpd.read_file", side_effect=ValueError("truncated")):
+            with pytest.raises(ValueError):
+                mapper.reload_if_changed()
+        
+        assert mapper.gdf is loaded
+        assert mapper.reload_if_changed() is True
+        assert mapper.reload_if_changed() is False
+
+
 class TestFireRiskZone:
     """Test the fire risk zone functionality."""
     
@@ -101,6 +120,19 @@ class TestFireRiskZone:
             assert 'description' in alert
             assert isinstance(alert['level'], int)
             
+    def test_zone_polygons_are_reloaded_before_lookup(self):
+        """Test that a newly published zone file is picked up."""
+        from unittest.mock import patch
+        
+        with patch("src.fire.fire_risk_zone.FireZoneMapper") as mapper_class:
+            fire_risk = FireRiskZone()
+            mapper = mapper_class.return_value
+            mapper.get_zone_for_coordinates.return_value = None
+            
+            assert fire_risk.get_zone_fire_alert_for_location(42.4653, 8.9070) is None
+            
+            mapper.reload_if_changed.assert_called_once()
+            
     def test_format_fire_warnings(self):
         """Test formatting of fire warnings."""
         fire_risk = FireRiskZone()
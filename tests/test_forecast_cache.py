@@ -0,0 +1,114 @@
+"""
+Tests for the stale-while-revalidate forecast cache.
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+from src.weather.core.forecast_snapshot import ForecastCache
+from src.weather.core.morning_evening_refactor import MorningEveningRefactor
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_forecast(self, lat, lon):
+        self.release.wait(5)
+        self.calls += 1
+        return f"forecast-{self.calls}"
+
+
+class TestForecastCache:
+    """Test cases for ForecastCache."""
+
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.client = CountingClient()
+        self.cache = ForecastCache(self.client, max_age=60, stale_seconds=600, clock=self.clock)
+
+    def test_fresh_entry_is_served_without_fetch(self):
+        assert self.cache.get_forecast(42.0, 9.0) == "forecast-1"
+        self.clock.now = 30
+
+        assert self.cache.get_forecast(42.0, 9.0, allow_stale=True) == "forecast-1"
+        assert self.client.calls == 1
+        assert not self.cache.is_stale(42.0, 9.0)
+
+    def test_stale_entry_is_served_while_refreshing(self):
+        self.cache.get_forecast(42.0, 9.0)
+        self.clock.now = 120
+        self.client.release.clear()
+
+        assert self.cache.is_stale(42.0, 9.0)
+        assert self.cache.get_forecast(42.0, 9.0, allow_stale=True) == "forecast-1"
+        assert not self.cache.wait_for_refresh(0.05)
+
+        self.client.release.set()
+        assert self.cache.wait_for_refresh(5)
+        assert self.cache.get_forecast(42.0, 9.0) == "forecast-2"
+        assert self.cache.fetch_count == 2
+
+    def test_stale_entry_is_fetched_synchronously_for_scheduled_reports(self):
+        self.cache.get_forecast(42.0, 9.0)
+        self.clock.now = 120
+
+        assert self.cache.get_forecast(42.0, 9.0) == "forecast-2"
+
+    def test_expired_entry_is_never_served(self):
+        self.cache.get_forecast(42.0, 9.0)
+        self.clock.now = 700
+
+        assert not self.cache.is_stale(42.0, 9.0)
+        assert self.cache.get_forecast(42.0, 9.0, allow_stale=True) == "forecast-2"
+
+
+class TestDynamicRevalidation:
+    """Dynamic reports return the stale-based result at once."""
+
+    def test_stale_result_is_returned_without_waiting(self, tmp_path):
+        refactor = MorningEveningRefactor({})
+        refactor.data_dir = str(tmp_path)
+
+        def fetch(stage_name, target_date):
+            if refactor._allow_stale:
+                refactor.stale_coordinates.append((42.0, 9.0))
+            return {'fp': 'stale'}
+
+        reason = MagicMock(return_value="No significant changes detected")
+        with patch.object(refactor, 'fetch_weather_data', side_effect=fetch) as mock_fetch, \
+                patch.object(refactor, '_dynamic_no_change_reason', reason), \
+                patch('src.weather.core.morning_evening_refactor.forecast_fingerprint',
+                      side_effect=lambda data, target_date: data['fp']):
+            result, _ = refactor.generate_report('Corte', 'dynamic', '2025-08-01')
+
+        assert result == "Corte: NO CHANGES"
+        assert mock_fetch.call_count == 1
+        assert reason.call_count == 1
+        assert refactor.stale_coordinates == [(42.0, 9.0)]
+
+    def test_wait_only_for_given_coordinates(self):
+        clock = FakeClock()
+        client = CountingClient()
+        cache = ForecastCache(client, max_age=60, stale_seconds=600, clock=clock)
+        cache.get_forecast(42.0, 9.0)
+        cache.get_forecast(43.0, 9.0)
+        clock.now = 120
+        client.release.clear()
+
+        cache.get_forecast(43.0, 9.0, allow_stale=True)
+
+        assert cache.wait_for_refresh(0.05, coordinates=[(42.0, 9.0)])
+        assert not cache.wait_for_refresh(0.05, coordinates=[(43.0, 9.0)])
+        client.release.set()
+        assert cache.wait_for_refresh(5, coordinates=[(43.0, 9.0)])
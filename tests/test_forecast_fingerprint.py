@@ -0,0 +1,97 @@
+"""
+Tests for the forecast fingerprint and the dynamic skip fast path.
+"""
+
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+from src.logic.report_store import ReportStore, REPORT_STORE_FILENAME
+from src.weather.core.forecast_fingerprint import forecast_fingerprint
+from src.weather.core.morning_evening_refactor import MorningEveningRefactor
+
+
+TARGET = date(2025, 8, 1)
+
+
+def weather_data(rain=0.0, model_run=1000, extra_day_rain=0.0):
+    """Create fetched weather data with entries on the target day and 3 days later."""
+    today = int(datetime(2025, 8, 1, 14).timestamp())
+    later = int((datetime(2025, 8, 1, 14) + timedelta(days=3)).timestamp())
+    return {
+        'model_runs': [model_run],
+        'hourly_data': [{'data': [{'dt': today, 'rain': {'1h': rain}}, {'dt': later, 'rain': {'1h': extra_day_rain}}]}],
+        'daily_forecast': {'daily': [{'dt': today, 'T': {'min': 10, 'max': 25}}]},
+        'probability_forecast': [{'data': []}],
+    }
+
+
+class TestForecastFingerprint:
+    """Test cases for forecast_fingerprint."""
+
+    def test_same_data_same_fingerprint(self):
+        assert forecast_fingerprint(weather_data(), TARGET) == forecast_fingerprint(weather_data(), TARGET)
+
+    def test_model_run_and_values_change_fingerprint(self):
+        base = forecast_fingerprint(weather_data(), TARGET)
+
+        assert forecast_fingerprint(weather_data(model_run=2000), TARGET) != base
+        assert forecast_fingerprint(weather_data(rain=1.5), TARGET) != base
+
+    def test_entries_outside_window_are_ignored(self):
+        assert forecast_fingerprint(weather_data(extra_day_rain=5.0), TARGET) == forecast_fingerprint(weather_data(), TARGET)
+
+    def test_empty_data(self):
+        assert forecast_fingerprint({}, TARGET) == ""
+
+
+class TestDynamicSkip:
+    """The dynamic path exits before processing if the forecast is unchanged."""
+
+    def make_refactor(self, tmp_path, fingerprint):
+        refactor = MorningEveningRefactor({})
+        refactor.data_dir = str(tmp_path)
+        ReportStore(str(tmp_path / REPORT_STORE_FILENAME)).append(
+            'Corte', TARGET, 'morning',
+            {'stage_name': 'Corte', 'forecast_fingerprint': fingerprint, 'processing_seconds': 2.5}
+        )
+        return refactor
+
+    def test_unchanged_forecast_skips_processing(self, tmp_path, caplog):
+        refactor = self.make_refactor(tmp_path, forecast_fingerprint(weather_data(), TARGET))
+        caplog.set_level("INFO")
+
+        with patch.object(refactor, 'fetch_weather_data', return_value=weather_data()), \
+             patch.object(refactor, '_check_dynamic_report_conditions') as check, \
+             patch.object(refactor, 'process_night_data') as process:
+            result, _ = refactor.generate_report('Corte', 'dynamic', '2025-08-01')
+
+        assert result == "Corte: NO CHANGES"
+        check.assert_not_called()
+        process.assert_not_called()
+        assert "saved 2.50s of processing" in caplog.text
+
+    def test_changed_forecast_runs_comparison(self, tmp_path):
+        refactor = self.make_refactor(tmp_path, forecast_fingerprint(weather_data(), TARGET))
+
+        with patch.object(refactor, 'fetch_weather_data', return_value=weather_data(model_run=2000)), \
+             patch.object(refactor, '_check_dynamic_report_conditions', return_value=False) as check:
+            result, _ = refactor.generate_report('Corte', 'dynamic', '2025-08-01')
+
+        assert result == "Corte: NO CHANGES"
+        check.assert_called_once()
+        assert check.call_args[0][2] == weather_data(model_run=2000)
+
+
+    def test_identical_refresh_is_not_compared_again(self, tmp_path):
+        refactor = self.make_refactor(tmp_path, "previous")
+
+        with patch.object(refactor, 'fetch_weather_data', return_value=weather_data()), \
+             patch.object(refactor, '_check_dynamic_report_conditions', return_value=False) as check:
+            refactor.generate_report('Corte', 'dynamic', '2025-08-01')
+            stale_fingerprint = refactor.fingerprint
+            result, _ = refactor.generate_report('Corte', 'dynamic', '2025-08-01',
+                                                 compared_fingerprint=stale_fingerprint)
+
+        assert stale_fingerprint == forecast_fingerprint(weather_data(), TARGET)
+        assert result == "Corte: NO CHANGES"
+        check.assert_called_once()
@@ -0,0 +1,138 @@
+"""
+Tests for GPX ingestion and route point selection in generate_etappen_json.py.
+"""
+
+import json
+import math
+import time
+import zipfile
+
+import pytest
+from geopy.distance import geodesic
+
+from generate_etappen_json import (
+    finde_gpx_im_zip,
+    finde_hochpunkte_und_zwischenpunkte,
+    haversine_km,
+    iter_gpx_punkte,
+    konvertiere_gpx_zu_json,
+    konvertiere_zip_zu_json,
+    lade_gpx_punkte,
+)
+
+
+def reference_selection(punkte, min_abstand_start=1.0, min_abstand_ziel=1.0, min_abstand_punkte=5.0, max_luecke=8.0):
+    """Original geodesic implementation used as reference."""
+    def distanz(p1, p2):
+        return geodesic((p1[0], p1[1]), (p2[0], p2[1])).kilometers
+
+    start, ziel = punkte[0], punkte[-1]
+    kandidaten = [p for p in punkte[1:-1]
+                  if distanz(start, p) >= min_abstand_start and distanz(p, ziel) >= min_abstand_ziel]
+    ausgewaehlt = []
+    for hp in sorted(kandidaten, key=lambda p: p[2], reverse=True):
+        if all(distanz(hp, p) >= min_abstand_punkte for p in ausgewaehlt):
+            ausgewaehlt.append(hp)
+    ausgewaehlt = sorted(ausgewaehlt, key=lambda p: punkte.index(p))
+    alle_punkte = [start] + ausgewaehlt + [ziel]
+    final = [alle_punkte[0]]
+    for i in range(1, len(alle_punkte)):
+        a, b = alle_punkte[i - 1], alle_punkte[i]
+        if distanz(a, b) > max_luecke:
+            final.append(((a[0] + b[0]) / 2, (a[1] + b[1]) / 2, (a[2] + b[2]) / 2))
+        final.append(b)
+    return final
+
+
+def synthetic_track(anzahl, laenge_km=20.0):
+    """Create a winding mountain track in Corsica with several summits."""
+    punkte = []
+    for i in range(anzahl):
+        t = i / (anzahl - 1)
+        lat = 42.10 + t * laenge_km / 111.0
+        lon = 9.00 + 0.02 * math.sin(t * 6 * math.pi)
+        ele = 1200 + 800 * math.sin(t * 7 * math.pi) ** 2 + 50 * math.sin(t * 97 * math.pi)
+        punkte.append((lat, lon, ele))
+    return punkte
+
+
+def gpx_text(punkte):
+    """Create a GPX 1.1 document with one track segment."""
+    trkpts = "".join(
+        f'<trkpt lat="{lat}" lon="{lon}"><ele>{ele}</ele><time>2025-06-26T08:00:00Z</time></trkpt>'
+        for lat, lon, ele in punkte
+    )
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+            '<gpx version="1.1" creator="test" xmlns="http://www.topografix.com/GPX/1/1">'
+            f'<trk><name>Test</name><trkseg>{trkpts}</trkseg></trk></gpx>')
+
+
+class TestFindeHochpunkte:
+    """Test the vectorized point selection."""
+
+    def test_haversine_matches_geodesic(self):
+        d = haversine_km(42.0, 9.0, 42.1, 9.1)
+        assert d == pytest.approx(geodesic((42.0, 9.0), (42.1, 9.1)).kilometers, rel=5e-3)
+
+    def test_matches_reference_selection(self):
+        punkte = synthetic_track(2000, laenge_km=40.0)
+
+        result = finde_hochpunkte_und_zwischenpunkte(punkte)
+        expected = reference_selection(punkte)
+
+        assert len(result) == len(expected)
+        for p, q in zip(result, expected):
+            assert p == pytest.approx(q, abs=1e-9)
+
+    def test_short_track_is_returned_unchanged(self):
+        punkte = [(42.0, 9.0, 100.0)]
+        assert finde_hochpunkte_und_zwischenpunkte(punkte) == punkte
+
+    @pytest.mark.slow
+    def test_large_track_is_fast(self):
+        """Loose timing bound; deselect with -m "not slow" on loaded machines."""
+        punkte = synthetic_track(100_000, laenge_km=60.0)
+
+        started = time.perf_counter()
+        result = finde_hochpunkte_und_zwischenpunkte(punkte)
+        elapsed = time.perf_counter() - started
+
+        assert result[0] == punkte[0] and result[-1] == punkte[-1]
+        assert elapsed < 10.0
+
+
+class TestStreamingIngestion:
+    """Test the iterparse reader and zip ingestion."""
+
+    def test_stream_reader_matches_gpxpy(self, tmp_path):
+        pfad = tmp_path / "E1 Test.gpx"
+        pfad.write_text(gpx_text(synthetic_track(500)), encoding="utf-8")
+
+        assert list(iter_gpx_punkte(str(pfad))) == lade_gpx_punkte(str(pfad))
+
+    def test_missing_elevation_defaults_to_zero(self, tmp_path):
+        pfad = tmp_path / "E1 Test.gpx"
+        pfad.write_text(gpx_text([(42.0, 9.0, 1.0)]).replace("<ele>1.0</ele>", ""), encoding="utf-8")
+
+        assert list(iter_gpx_punkte(str(pfad))) == [(42.0, 9.0, 0.0)]
+
+    def test_zip_matches_directory(self, tmp_path):
+        gpx_dir = tmp_path / "gpx"
+        gpx_dir.mkdir()
+        zip_pfad = tmp_path / "archiv.zip"
+        with zipfile.ZipFile(zip_pfad, "w") as archiv:
+            for nummer in (2, 1):
+                text = gpx_text(synthetic_track(300, laenge_km=10.0 * nummer))
+                (gpx_dir / f"E{nummer} Ort{nummer}.gpx").write_text(text, encoding="utf-8")
+                archiv.writestr(f"E{nummer} Ort{nummer}.gpx", text)
+                archiv.writestr(f"__MACOSX/._E{nummer} Ort{nummer}.gpx", "metadata")
+
+        assert finde_gpx_im_zip(str(zip_pfad)) == ["E1 Ort1.gpx", "E2 Ort2.gpx"]
+
+        aus_zip = konvertiere_zip_zu_json(str(zip_pfad), str(tmp_path / "zip.json"), workers=2)
+        aus_verzeichnis = konvertiere_gpx_zu_json(str(gpx_dir), str(tmp_path / "dir.json"), workers=2)
+
+        assert aus_zip == aus_verzeichnis
+        assert [e["name"] for e in aus_zip] == ["Ort1", "Ort2"]
+        with open(tmp_path / "zip.json", encoding="utf-8") as f:
+            assert json.load(f) == aus_zip
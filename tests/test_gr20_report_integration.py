@@ -157,7 +157,7 @@ class TestGR20ReportIntegration:
         assert scheduler.current_state.daily_dynamic_report_count == 2
         assert scheduler.current_state.last_risk_value == current_risk
     
-    @patch('src.notification.email_client.smtplib.SMTP')
+    @patch('src.notification.smtp_session.smtplib.SMTP')
     def test_email_client_integration(self, mock_smtp):
         """Test email client integration with scheduler."""
         config = {
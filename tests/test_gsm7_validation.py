@@ -230,4 +230,65 @@ class TestGSM7Validator:
         assert validator.is_valid("\n\r\n\r") is True
         
         # Test message with only special GSM-7 characters (without ä, ö, ü, Ä, Ö, Ü, ß, æ, Æ)
-        assert validator.is_valid("@£$¥èéùìòÇØøÅå_É") is True 
\ No newline at end of file
+        assert validator.is_valid("@£$¥èéùìòÇØøÅå_É") is True 
+
+class TestGSM7Septets:
+    """Test cases for septet length and segment calculation."""
+    
+    def test_septet_length_counts_extension_characters_twice(self):
+        """Extension characters are sent as escape + character."""
+        validator = GSM7Validator()
+        
+        assert validator.septet_length("Corte N8") == 8
+        assert validator.septet_length("Z:HIGH|201") == 11
+        assert validator.septet_length("€10 [x]") == 10
+        assert validator.septet_length("") == 0
+    
+    def test_segment_count(self):
+        """Single SMS up to 160 septets, 153 per part beyond."""
+        validator = GSM7Validator()
+        
+        assert validator.segment_count("") == 0
+        assert validator.segment_count("A" * 160) == 1
+        assert validator.segment_count("A" * 161) == 2
+        assert validator.segment_count("A" * 306) == 2
+        assert validator.segment_count("A" * 307) == 3
+        assert validator.segment_count("€" * 80) == 1
+        # 76 escape pairs fill 152 septets; the 77th does not fit into a 153 septet part
+        assert validator.segment_count("€" * 81) == 2
+        assert validator.segment_count("AA" + "€" * 152) == 3
+    
+    def test_truncate_to_septets(self):
+        """Truncation never splits an escape sequence."""
+        validator = GSM7Validator()
+        
+        assert validator.truncate_to_septets("A" * 200) == "A" * 160
+        assert validator.truncate_to_septets("A" * 159 + "€B") == "A" * 159
+        assert validator.truncate_to_septets("A" * 158 + "|B") == "A" * 158 + "|"
+        assert validator.truncate_to_septets("A" * 170, 160, "...") == "A" * 157 + "..."
+        assert validator.truncate_to_septets("short") == "short"
+    
+    def test_measure(self):
+        """Normalization and size in one call."""
+        validator = GSM7Validator()
+        
+        result = validator.measure("Höhe € 25°")
+        
+        assert result["normalized_text"] == "Hoehe € 25deg"
+        assert result["septets"] == 14
+        assert result["segments"] == 1
+        assert result["remaining"] == 146
+    
+    def test_translate_table_matches_character_loop(self):
+        """The single-pass table gives the same result as checking every character."""
+        validator = GSM7Validator()
+        message = "Grüße → Gipfel 2°C ≤ 5mm ⚡ ünd €|{}" * 3
+        
+        expected = ""
+        for char in message:
+            if char in validator.GSM7_SET:
+                expected += char
+            elif char in validator.CHAR_REPLACEMENTS:
+                expected += validator.CHAR_REPLACEMENTS[char]
+        
+        assert validator.normalize_to_gsm7(message) == expected
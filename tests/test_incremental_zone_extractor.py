@@ -0,0 +1,163 @@
+"""
+Tests for the incremental fire zone extractor.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.fire.fire_zone_extractor import FireZoneExtractor
+from src.fire.incremental_zone_extractor import (
+    IncrementalFireZoneExtractor,
+    iter_zone_objects,
+)
+
+
+OFFICIAL_ZONES_JS = Path(__file__).parent.parent / "data" / "official_zones.js"
+
+
+def zone_js(level_201: int = 0, with_202: bool = True) -> str:
+    """Build a small zones.js with two zones."""
+    zones = [f"""{{
+        type: "Feature",
+        properties: {{
+            numero_zon: "201",
+            level: {level_201},
+            Zonage_Feu: "Zone {{test}}"
+        }},
+        geometry: {{
+            type: "Polygon",
+            coordinates: [[[9.0, 42.0], [9.1, 42.0], [9.1, 42.1], [9.0, 42.0]]]
+        }}
+    }}"""]
+    if with_202:
+        zones.append("""{
+        type: "Feature",
+        properties: {
+            numero_zon: "202",
+            level: 1,
+            Zonage_Feu: "Zone B"
+        },
+        geometry: {
+            type: "Polygon",
+            coordinates: [[[8.0, 41.0], [8.1, 41.0], [8.1, 41.1]]]
+        }
+    }""")
+    return "var id = 20;\nvar zones = [" + ", ".join(zones) + "\n];\n"
+
+
+@pytest.fixture
+def extractor(tmp_path):
+    js_path = tmp_path / "zones.js"
+    js_path.write_text(zone_js(), encoding="utf-8")
+    return IncrementalFireZoneExtractor(
+        zones_js_path=str(js_path),
+        output_dir=str(tmp_path / "fire_zones"),
+        publish_path=str(tmp_path / "fire_zones.geojson"),
+    )
+
+
+class TestIterZoneObjects:
+    """Test the streaming zone object scanner."""
+
+    def test_braces_in_strings_are_ignored(self):
+        objects = list(iter_zone_objects(iter(zone_js().splitlines(True))))
+        assert len(objects) == 2
+        assert '"Zone {test}"' in objects[0]
+
+    def test_missing_array_raises(self):
+        with pytest.raises(ValueError):
+            list(iter_zone_objects(iter(["var other = [];\n"])))
+
+    @pytest.mark.skipif(not OFFICIAL_ZONES_JS.exists(), reason="official_zones.js not available")
+    def test_matches_full_extractor_on_official_file(self, tmp_path):
+        full = FireZoneExtractor(str(OFFICIAL_ZONES_JS)).extract_zones_from_js()
+        incremental = IncrementalFireZoneExtractor(
+            zones_js_path=str(OFFICIAL_ZONES_JS),
+            output_dir=str(tmp_path / "out"),
+            publish_path=None,
+        )
+        result = incremental.update()
+
+        with open(result.output_path, encoding="utf-8") as f:
+            features = json.load(f)["features"]
+        assert features == full
+
+
+class TestIncrementalFireZoneExtractor:
+    """Test versioning and change detection."""
+
+    def test_first_run_adds_all_zones(self, extractor):
+        result = extractor.update()
+
+        assert result.version == 1
+        assert result.added == ["201", "202"]
+        assert Path(result.output_path).name == "fire_zones_v1.geojson"
+        assert extractor.publish_path.read_text(encoding="utf-8") == Path(result.output_path).read_text(encoding="utf-8")
+
+    def test_unchanged_file_keeps_version(self, extractor):
+        extractor.update()
+        result = extractor.update()
+
+        assert result.version == 1
+        assert not result.has_changes
+        assert result.unchanged == ["201", "202"]
+        assert len(extractor.read_changelog()) == 1
+
+    def test_only_changed_zone_is_reparsed(self, extractor, monkeypatch):
+        extractor.update()
+        extractor.zones_js_path.write_text(zone_js(level_201=3), encoding="utf-8")
+
+        parsed = []
+        original = extractor._parse_zone_object
+
+        def tracking_parse(zone_text):
+            parsed.append(zone_text)
+            return original(zone_text)
+
+        monkeypatch.setattr(extractor, "_parse_zone_object", tracking_parse)
+        result = extractor.update()
+
+        assert len(parsed) == 1
+        assert result.version == 2
+        assert result.changed == ["201"]
+        assert result.unchanged == ["202"]
+
+        with open(result.output_path, encoding="utf-8") as f:
+            levels = {f["properties"]["numero_zon"]: f["properties"]["level"] for f in json.load(f)["features"]}
+        assert levels == {"201": 3, "202": 1}
+
+    def test_removed_zone_is_logged(self, extractor):
+        extractor.update()
+        extractor.zones_js_path.write_text(zone_js(with_202=False), encoding="utf-8")
+
+        result = extractor.update()
+
+        assert result.removed == ["202"]
+        changelog = extractor.read_changelog()
+        assert changelog[-1]["version"] == 2
+        assert changelog[-1]["removed"] == ["202"]
+        assert extractor.load_manifest()["zones"].keys() == {"201"}
+
+    def test_zone_without_number_is_not_reparsed(self, extractor):
+        unnumbered = """{
+        type: "Feature",
+        properties: {
+            level: 2,
+            Zonage_Feu: "Zone sans numero"
+        },
+        geometry: {
+            type: "Polygon",
+            coordinates: [[[7.0, 40.0], [7.1, 40.0], [7.1, 40.1]]]
+        }
+    }"""
+        extractor.zones_js_path.write_text(zone_js().replace("\n];", ", " + unnumbered + "\n];"), encoding="utf-8")
+
+        first = extractor.update()
+        second = extractor.update()
+
+        assert len(first.added) == 3
+        assert second.version == first.version == 1
+        assert not second.has_changes
+        assert sorted(second.unchanged) == sorted(first.added)
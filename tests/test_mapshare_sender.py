@@ -4,7 +4,9 @@ from src.mapshare_sender.send_mapshare_message import (
     send_mapshare_message,
     MapShareSender,
     MapShareConfig,
-    MapShareResult
+    MapShareReceiptLog,
+    MapShareResult,
+    MapShareRetryScheduler
 )
 import requests
 
@@ -45,7 +47,7 @@ class TestMapShareSender:
         assert "Content-Type" in headers
         assert headers["Content-Type"] == "application/x-www-form-urlencoded"
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_send_message_success(self, mock_post, basic_config):
         """Test successful message sending."""
         mock_response = Mock()
@@ -65,7 +67,7 @@ class TestMapShareSender:
             timeout=30
         )
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_send_message_http_error(self, mock_post, basic_config):
         """Test handling of HTTP error responses."""
         mock_response = Mock()
@@ -79,7 +81,7 @@ class TestMapShareSender:
         assert result.success is False
         assert result.status_code == 500
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_send_message_retries_on_timeout(self, mock_post, basic_config):
         """Test that the sender retries on a timeout."""
         mock_post.side_effect = [
@@ -94,7 +96,7 @@ class TestMapShareSender:
         assert result.success is True
         assert mock_post.call_count == 3
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_send_message_fails_after_all_retries(self, mock_post, basic_config):
         """Test that the sender fails after all retries are exhausted."""
         mock_post.side_effect = requests.exceptions.Timeout("Timeout")
@@ -119,4 +121,63 @@ class TestSendMapShareMessageFunction:
         result = send_mapshare_message("ext-id", "adr", "text")
         
         assert result.success is True
-        mock_send.assert_called_once() 
\ No newline at end of file
+        mock_send.assert_called_once() 
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMapShareReceiptsAndRetries:
+    """Tests the receipt log and the non-blocking retry scheduler."""
+
+    @patch('requests.Session.post')
+    def test_delivered_report_is_not_sent_again(self, mock_post, basic_config, tmp_path):
+        """Test that a report delivered before a restart is skipped."""
+        mock_post.return_value = Mock(status_code=200, text="Success")
+        log_path = str(tmp_path / "receipts.jsonl")
+
+        first = MapShareSender(basic_config, receipts=MapShareReceiptLog(log_path)).send_message("r1")
+        # New process: fresh sender and receipt log reading the same file
+        again = MapShareSender(basic_config, receipts=MapShareReceiptLog(log_path)).send_message("r1")
+        other = MapShareSender(basic_config, receipts=MapShareReceiptLog(log_path)).send_message("r2")
+
+        assert first.success and not first.skipped
+        assert again.success and again.skipped
+        assert not other.skipped
+        assert mock_post.call_count == 2
+
+    @patch('requests.Session.post')
+    def test_failed_send_is_retried_later(self, mock_post, basic_config, tmp_path):
+        """Test that a timeout schedules a retry instead of blocking."""
+        mock_post.side_effect = [requests.exceptions.Timeout("Timeout"), Mock(status_code=200, text="Success")]
+        clock = FakeClock()
+        scheduler = MapShareRetryScheduler(base_delay=30, clock=clock)
+        receipts = MapShareReceiptLog(str(tmp_path / "receipts.jsonl"))
+        sender = MapShareSender(basic_config, receipts=receipts, scheduler=scheduler)
+
+        result = sender.send_message("r1")
+
+        assert result.success is False
+        assert result.retry_scheduled is True
+        assert scheduler.run_due() == []
+        clock.now = 30
+        retried = scheduler.run_due()
+        assert [r.success for r in retried] == [True]
+        assert receipts.is_delivered("r1", "test-ext-id")
+        assert scheduler.pending_count == 0
+
+    @patch('requests.Session.post')
+    def test_client_error_is_not_retried(self, mock_post, basic_config):
+        """Test that a rejected message is not scheduled again."""
+        mock_post.return_value = Mock(status_code=400, text="Bad Request")
+        scheduler = MapShareRetryScheduler(clock=FakeClock())
+
+        result = MapShareSender(basic_config, scheduler=scheduler).send_message("r1")
+
+        assert result.success is False
+        assert result.retry_scheduled is False
+        assert scheduler.pending_count == 0
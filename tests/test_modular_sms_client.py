@@ -6,6 +6,7 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
 from src.notification.modular_sms_client import ModularSmsClient
+from src.notification.outbox import PartialDelivery
 
 
 class TestModularSmsClient:
@@ -419,5 +420,97 @@ class TestModularSmsClient:
         result = client.send_gr20_report(report_data)
         
         assert result is True
-        mock_generate_text.assert_called_once_with(report_data, config)
-        mock_provider.send_sms.assert_called_once_with("+49123456789", "Generated report text") 
\ No newline at end of file
+        mock_generate_text.assert_called_once_with(report_data, config, include_debug=False)
+        mock_provider.send_sms.assert_called_once_with("+49123456789", "Generated report text") 
+
+class TestModularSmsFanOut:
+    """Test cases for sending to a recipient list."""
+    
+    def make_config(self, provider="twilio", mode="production"):
+        return {
+            "sms": {
+                "enabled": True,
+                "provider": provider,
+                "test_number": "+49123456789",
+                "production_number": "+49987654321",
+                "recipients": ["+49111111111", "+49987654321", "+49222222222"],
+                "max_concurrency": 2,
+                "mode": mode
+            }
+        }
+    
+    @patch('src.notification.sms_factory.SmsProviderFactory.create_provider')
+    def test_recipients_from_config(self, mock_create_provider):
+        client = ModularSmsClient(self.make_config())
+        
+        assert client.recipients == ["+49987654321", "+49111111111", "+49222222222"]
+        assert client.recipient_number == "+49987654321"
+        assert ModularSmsClient(self.make_config(mode="test")).recipients == ["+49123456789"]
+    
+    @patch('src.notification.sms_factory.SmsProviderFactory.create_provider')
+    def test_pool_fan_out_with_per_recipient_status(self, mock_create_provider):
+        mock_provider = Mock()
+        mock_provider.supports_bulk = False
+        mock_provider.is_configured.return_value = True
+        mock_provider.send_sms.side_effect = lambda to, text: to != "+49111111111"
+        mock_create_provider.return_value = mock_provider
+        client = ModularSmsClient(self.make_config())
+        
+        statuses = client.send_to_recipients("Corte: N8 D24")
+        
+        assert statuses == {"+49987654321": True, "+49111111111": False, "+49222222222": True}
+        assert mock_provider.send_sms.call_count == 3
+        assert client.send_sms("Corte: N8 D24") is True
+        assert client.last_delivery_status["+49111111111"] is False
+    
+    @patch('src.notification.sms_factory.SmsProviderFactory.create_provider')
+    def test_bulk_provider_gets_one_call(self, mock_create_provider):
+        mock_provider = Mock()
+        mock_provider.supports_bulk = True
+        mock_provider.is_configured.return_value = True
+        mock_provider.send_bulk.return_value = {"+49987654321": True, "+49111111111": True}
+        mock_create_provider.return_value = mock_provider
+        client = ModularSmsClient(self.make_config(provider="seven"))
+        
+        statuses = client.send_to_recipients("Corte: N8 D24")
+        
+        mock_provider.send_bulk.assert_called_once_with(client.recipients, "Corte: N8 D24")
+        mock_provider.send_sms.assert_not_called()
+        assert statuses["+49222222222"] is False
+    
+    @patch('src.notification.sms_factory.SmsProviderFactory.create_provider')
+    def test_queued_report_fans_out_and_retries_failed_numbers(self, mock_create_provider):
+        mock_provider = Mock()
+        mock_provider.supports_bulk = True
+        mock_provider.is_configured.return_value = True
+        mock_provider.send_bulk.return_value = {"+49987654321": True, "+49111111111": False}
+        mock_create_provider.return_value = mock_provider
+        client = ModularSmsClient(self.make_config(provider="seven"))
+        report = {"result_output": "Corte: N8 D24",
+                  "recipients": ["+49987654321", "+49111111111", "+49000000000"]}
+        
+        with pytest.raises(PartialDelivery) as partial:
+            client.send_gr20_report(report)
+        
+        # One bulk request; the number removed from the config is dropped
+        mock_provider.send_bulk.assert_called_once_with(["+49987654321", "+49111111111"], "Corte: N8 D24")
+        assert partial.value.retry_payload["recipients"] == ["+49111111111"]
+        mock_provider.send_sms.return_value = False
+        assert client.send_gr20_report(partial.value.retry_payload) is False
+        mock_provider.send_sms.assert_called_once_with("+49111111111", "Corte: N8 D24")
+        assert client.send_gr20_report(dict(report, recipients=["+49000000000"])) is True
+    
+    @patch('src.notification.sms_factory.SmsProviderFactory.create_provider')
+    def test_single_number_string_is_one_recipient(self, mock_create_provider):
+        mock_provider = Mock()
+        mock_provider.supports_bulk = True
+        mock_provider.is_configured.return_value = True
+        mock_provider.send_sms.return_value = True
+        mock_create_provider.return_value = mock_provider
+        client = ModularSmsClient(self.make_config(provider="seven"))
+        
+        assert client.send_sms("Corte: N8 D24", recipients="+49111111111") is True
+        
+        mock_provider.send_sms.assert_called_once_with("+49111111111", "Corte: N8 D24")
+        with pytest.raises(TypeError):
+            client.send_sms("Corte: N8 D24", "+49111111111")
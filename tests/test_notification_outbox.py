@@ -0,0 +1,186 @@
+"""
+Tests for the persistent notification outbox.
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from src.notification.outbox import (FAILED, PENDING, SENT, Outbox, OutboxDispatcher,
+                                     channel_name, PartialDelivery, report_id)
+
+
+REPORT = {
+    "location": "Corte",
+    "report_time": datetime(2025, 8, 1, 4, 30),
+    "report_type": "morning",
+    "result_output": "Corte: N8 D24 R0.2@6",
+    "debug_output": ""
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestOutbox:
+    """Test cases for Outbox."""
+
+    def setup_method(self):
+        self.clock = FakeClock()
+
+    def make_outbox(self, tmp_path, **kwargs):
+        return Outbox(str(tmp_path / "outbox.sqlite"), base_delay=30, clock=self.clock, **kwargs)
+
+    def test_report_id(self):
+        assert report_id(REPORT).startswith("2025-08-01/default/morning/Corte/")
+        assert report_id(REPORT, "west") != report_id(REPORT)
+        assert report_id(dict(REPORT, result_output="Corte: N8 D25")) != report_id(REPORT)
+        assert channel_name("sms", "default") == "sms"
+        assert channel_name("sms", "west") == "sms:west"
+
+    def test_same_report_is_queued_once(self, tmp_path):
+        outbox = self.make_outbox(tmp_path)
+
+        assert outbox.enqueue("r1", "email", REPORT)
+        assert not outbox.enqueue("r1", "email", REPORT)
+        assert outbox.enqueue("r1", "sms", REPORT)
+        assert outbox.due_count() == 2
+
+    def test_delivered_report_is_queued_again(self, tmp_path):
+        outbox = self.make_outbox(tmp_path)
+        outbox.enqueue("r1", "email", REPORT)
+        outbox.mark_sent(outbox.claim("email"))
+
+        assert outbox.enqueue("r1", "email", REPORT)
+        assert outbox.status("r1", "email") == PENDING
+        assert outbox.claim("email").attempts == 1
+
+    def test_partial_delivery_retries_the_rest(self, tmp_path):
+        outbox = self.make_outbox(tmp_path)
+        sent = []
+
+        def send(payload):
+            sent.append(payload["recipients"])
+            if len(payload["recipients"]) > 1:
+                raise PartialDelivery(dict(payload, recipients=["+492"]), "not delivered to +492")
+            return True
+
+        dispatcher = OutboxDispatcher(outbox, {"sms": send})
+        outbox.enqueue("r1", "sms", dict(REPORT, recipients=["+491", "+492"]))
+        assert dispatcher.deliver_one("sms")
+        assert outbox.status("r1", "sms") == PENDING
+
+        self.clock.now += 30
+        assert dispatcher.deliver_one("sms")
+        assert outbox.status("r1", "sms") == SENT
+        assert sent == [["+491", "+492"], ["+492"]]
+
+    def test_added_sender_is_delivered(self, tmp_path):
+        outbox = self.make_outbox(tmp_path)
+        dispatcher = OutboxDispatcher(outbox, {"email": lambda payload: True})
+        sms = MagicMock(return_value=True)
+
+        assert dispatcher.add_sender("sms", sms)
+        assert not dispatcher.add_sender("sms", MagicMock())
+        outbox.enqueue("r1", "sms", REPORT)
+        assert dispatcher.deliver_one("sms")
+
+        sms.assert_called_once()
+        assert outbox.status("r1", "sms") == SENT
+
+    def test_payload_round_trip(self, tmp_path):
+        outbox = self.make_outbox(tmp_path)
+        outbox.enqueue("r1", "email", dict(REPORT, analysis=object()))
+
+        message = outbox.claim("email")
+
+        assert message.payload["report_time"] == datetime(2025, 8, 1, 4, 30)
+        assert message.payload["result_output"] == REPORT["result_output"]
+        assert isinstance(message.payload["analysis"], str)
+        assert outbox.claim("email") is None
+
+    def test_retry_backoff_and_give_up(self, tmp_path):
+        outbox = self.make_outbox(tmp_path, max_attempts=3)
+        outbox.enqueue("r1", "email", REPORT)
+
+        outbox.mark_failed(outbox.claim("email"), "timeout")
+        assert outbox.claim("email") is None
+        self.clock.now += 30
+        message = outbox.claim("email")
+        assert message.attempts == 2
+
+        outbox.mark_failed(message, "timeout")
+        self.clock.now += 59
+        assert outbox.claim("email") is None
+        self.clock.now += 1
+        outbox.mark_failed(outbox.claim("email"), "timeout")
+
+        assert outbox.status("r1", "email") == FAILED
+        assert outbox.due_count() == 0
+
+    def test_abandoned_delivery_is_retried(self, tmp_path):
+        outbox = self.make_outbox(tmp_path, claim_timeout=600)
+        outbox.enqueue("r1", "email", REPORT)
+        outbox.claim("email")
+
+        assert outbox.claim("email") is None
+        self.clock.now += 600
+        assert outbox.claim("email").attempts == 2
+
+
+class TestOutboxDispatcher:
+    """Test cases for OutboxDispatcher."""
+
+    def test_workers_deliver_and_retry_later(self, tmp_path):
+        outbox = Outbox(str(tmp_path / "outbox.sqlite"))
+        email = MagicMock(return_value=True)
+        sms = MagicMock(side_effect=ConnectionError("gateway down"))
+        outbox.enqueue("r1", "email", REPORT)
+        outbox.enqueue("r1", "sms", REPORT)
+
+        dispatcher = OutboxDispatcher(outbox, {"email": email, "sms": sms}, poll_interval=0.05)
+        dispatcher.start()
+        try:
+            assert dispatcher.drain(5)
+        finally:
+            dispatcher.stop()
+
+        email.assert_called_once()
+        assert email.call_args[0][0]["location"] == "Corte"
+        assert outbox.status("r1", "email") == SENT
+        assert outbox.status("r1", "sms") == PENDING
+        assert sms.call_count == 1
+
+
+class TestDaemonOutbox:
+    """The report daemon queues reports instead of sending them."""
+
+    def test_reports_are_queued_once_and_delivered(self, tmp_path):
+        from src.logic.report_daemon import ReportDaemon
+        from src.report.batch_report_generator import StageReport
+
+        daemon = ReportDaemon({"startdatum": "2025-08-01"}, state_dir=str(tmp_path))
+        email_client, sms_client = MagicMock(), MagicMock()
+        email_client.send_gr20_report.return_value = True
+        sms_client.send_gr20_report.return_value = True
+        sms_client.recipients = ["+49987654321"]
+        report = StageReport(stage_offset=0, stage_name="Corte", report_date=datetime(2025, 8, 1).date(),
+                             report_type="morning", result_output="Corte: N8", success=True, route="default")
+        now = datetime(2025, 8, 1, 4, 30)
+
+        with patch.object(daemon, "notification_clients", return_value=(email_client, sms_client)):
+            assert daemon._send(report, "morning", now)
+            assert not daemon._send(report, "morning", now)
+            email_client.send_gr20_report.assert_not_called()
+
+            assert daemon.deliver_queued(5)
+
+        email_client.send_gr20_report.assert_called_once()
+        sms_client.send_gr20_report.assert_called_once()
+        assert sms_client.send_gr20_report.call_args[0][0]["recipients"] == ["+49987654321"]
+        assert "debug_report" in email_client.send_gr20_report.call_args[0][0]
+        assert "debug_report" not in sms_client.send_gr20_report.call_args[0][0]
@@ -0,0 +1,111 @@
+"""
+Tests for the WeatherReportData codec.
+"""
+
+import json
+import time
+from dataclasses import asdict
+from datetime import date
+
+import pytest
+
+from src.weather.core.morning_evening_refactor import WeatherReportData, WeatherThresholdData
+from src.weather.core.report_codec import (
+    SCHEMA_VERSION,
+    decode_report,
+    dumps_report,
+    encode_report,
+    loads_report,
+)
+
+
+def make_report(points=3, hours=24):
+    """Create a report with geo points carrying hourly data."""
+    def element(value):
+        return WeatherThresholdData(
+            threshold_value=value,
+            threshold_time="14",
+            max_value=value * 2,
+            max_time="16",
+            geo_points=[
+                {f'G{i + 1}': value + i, 'hourly_data': {str(h): value + h / 10 for h in range(hours)}}
+                for i in range(points)
+            ]
+        )
+
+    return WeatherReportData(
+        stage_name="Corte",
+        report_date=date(2025, 8, 1),
+        report_type="morning",
+        night=element(8),
+        day=element(24),
+        rain_mm=element(0.2),
+        rain_percent=element(20),
+        wind=element(10),
+        gust=element(20),
+        thunderstorm=element(1),
+        thunderstorm_plus_one=element(2),
+        risks=WeatherThresholdData(),
+        risk_zonal=WeatherThresholdData(),
+        debug_info={'risk_block': 'Z:HIGH208'}
+    )
+
+
+class TestReportCodec:
+    """Test cases for the report codec."""
+
+    def test_round_trip(self):
+        report = make_report()
+
+        assert loads_report(dumps_report(report)) == report
+
+    def test_encoding_matches_asdict_layout(self):
+        report = make_report()
+        encoded = encode_report(report)
+        expected = asdict(report)
+        expected['report_date'] = '2025-08-01'
+        expected['schema_version'] = SCHEMA_VERSION
+
+        assert encoded == expected
+
+    def test_legacy_asdict_file_is_decoded(self):
+        report = make_report()
+        legacy = json.loads(json.dumps(asdict(report), indent=2, default=str))
+        legacy['version'] = 'morning-evening-refactor-v1'
+
+        assert decode_report(legacy) == report
+
+    def test_metadata_and_compact_output(self):
+        raw = dumps_report(make_report(points=1, hours=1), generated_at='2025-08-01T04:00:00')
+
+        assert b'\n' not in raw and b', ' not in raw
+        assert json.loads(raw)['generated_at'] == '2025-08-01T04:00:00'
+
+    def test_newer_schema_is_rejected(self):
+        encoded = encode_report(make_report())
+        encoded['schema_version'] = SCHEMA_VERSION + 1
+
+        with pytest.raises(ValueError):
+            decode_report(encoded)
+
+    def test_large_report_round_trip(self):
+        report = make_report(points=20, hours=48)
+
+        assert loads_report(dumps_report(report)) == report
+
+    @pytest.mark.slow
+    def test_encode_is_faster_than_asdict(self):
+        """Loose timing bound; deselect with -m "not slow" on loaded machines."""
+        report = make_report(points=20, hours=48)
+
+        started = time.perf_counter()
+        for _ in range(50):
+            asdict(report)
+        asdict_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(50):
+            encode_report(report)
+        encode_time = time.perf_counter() - started
+
+        assert encode_time < asdict_time
@@ -0,0 +1,213 @@
+"""
+Tests for the long-running report daemon.
+"""
+
+import asyncio
+import os
+import signal
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from src.logic.report_daemon import ReportDaemon, next_occurrence
+from src.report.batch_report_generator import StageReport
+
+
+CONFIG = {
+    "startdatum": "2025-08-01",
+    "send_schedule": {"morning_time": "04:30", "evening_time": "19:00"},
+    "delta_thresholds": {"max_daily_reports": 2, "min_interval_min": 90},
+}
+
+
+def make_daemon(tmp_path, config=CONFIG, clock=datetime.now):
+    daemon = ReportDaemon(config, state_dir=str(tmp_path), clock=clock)
+    daemon._forecast_client = MagicMock()
+    return daemon
+
+
+def stage_report(result_output, success=True):
+    return StageReport(stage_offset=0, stage_name="Corte", report_date=date(2025, 8, 1),
+                       report_type="dynamic", result_output=result_output, success=success, route="default")
+
+
+class TestSchedule:
+    """Test cases for the job timer."""
+
+    def test_next_occurrence(self):
+        assert next_occurrence("04:30", datetime(2025, 8, 1, 3, 0)) == datetime(2025, 8, 1, 4, 30)
+        assert next_occurrence("04:30", datetime(2025, 8, 1, 4, 30)) == datetime(2025, 8, 2, 4, 30)
+
+    def test_due_jobs_are_rescheduled(self, tmp_path):
+        daemon = make_daemon(tmp_path)
+        start = datetime(2025, 8, 1, 4, 0)
+        daemon.plan(start)
+
+        assert daemon.due_jobs(start) == []
+        assert daemon.due_jobs(datetime(2025, 8, 1, 4, 30)) == ["morning", "dynamic"]
+        assert daemon.next_run["morning"] == datetime(2025, 8, 2, 4, 30)
+        assert daemon.next_run["dynamic"] == datetime(2025, 8, 1, 5, 0)
+        assert daemon.next_run["fire"] == datetime(2025, 8, 1, 5, 0)
+
+    def test_dynamic_limits(self, tmp_path):
+        daemon = make_daemon(tmp_path)
+        scheduler = daemon.schedulers["default"]
+        now = datetime(2025, 8, 1, 10, 0)
+
+        assert scheduler.dynamic_report_allowed(now)
+        scheduler.update_state_after_report(now, 0.0, is_dynamic=True)
+        assert not scheduler.dynamic_report_allowed(now + timedelta(minutes=60))
+        assert scheduler.dynamic_report_allowed(now + timedelta(minutes=120))
+        scheduler.update_state_after_report(now + timedelta(minutes=120), 0.0, is_dynamic=True)
+        assert not scheduler.dynamic_report_allowed(now + timedelta(minutes=300))
+        assert scheduler.dynamic_report_allowed(datetime(2025, 8, 2, 8, 0))
+
+
+class TestRunReports:
+    """Test cases for ReportDaemon.run_reports."""
+
+    def test_only_changed_dynamic_reports_are_sent(self, tmp_path):
+        daemon = make_daemon(tmp_path)
+        reports = [stage_report("Corte: NO CHANGES"), stage_report("Corte: ERROR", success=False),
+                   stage_report("Corte - R0.2@14")]
+
+        with patch("src.logic.report_daemon.generate_route_reports", return_value=reports), \
+             patch.object(daemon, "_send", return_value=True) as send:
+            sent = daemon.run_reports("dynamic", datetime(2025, 8, 1, 10, 0))
+
+        assert sent == 1
+        assert send.call_args[0][0].result_output == "Corte - R0.2@14"
+        assert daemon.schedulers["default"].current_state.daily_dynamic_report_count == 1
+
+    def test_stale_dynamic_check_is_revalidated(self, tmp_path):
+        daemon = make_daemon(tmp_path)
+        now = datetime(2025, 8, 1, 10, 0)
+        daemon.plan(now)
+        stale = stage_report("Corte: NO CHANGES")
+        stale.stale_coordinates = [(42.3, 9.1)]
+
+        with patch("src.logic.report_daemon.generate_route_reports", return_value=[stale]):
+            assert daemon.run_reports("dynamic", now) == 0
+
+        assert daemon.next_run["revalidate"] == now + timedelta(seconds=15)
+        later = now + timedelta(seconds=15)
+        assert daemon.due_jobs(later) == ["revalidate"]
+        assert "revalidate" not in daemon.next_run
+
+        daemon._forecast_cache = MagicMock()
+        with patch("src.logic.report_daemon.generate_route_reports",
+                   return_value=[stage_report("Corte - R0.2@14")]), \
+             patch.object(daemon, "_send", return_value=True) as send:
+            assert daemon.run_job("revalidate", later) == 1
+
+        daemon._forecast_cache.wait_for_refresh.assert_called_once_with(coordinates=[(42.3, 9.1)])
+        send.assert_called_once()
+        assert daemon.run_revalidation(later) == 0
+
+    def test_revalidation_passes_the_stale_fingerprints(self, tmp_path):
+        daemon = make_daemon(tmp_path)
+        now = datetime(2025, 8, 1, 10, 0)
+        stale = stage_report("Corte: NO CHANGES")
+        stale.stale_coordinates = [(42.3, 9.1)]
+        stale.fingerprint = "3f2a9c1e"
+
+        with patch("src.logic.report_daemon.generate_route_reports", return_value=[stale]):
+            daemon.run_reports("dynamic", now)
+
+        daemon._forecast_cache = MagicMock()
+        with patch("src.logic.report_daemon.generate_route_reports",
+                   return_value=[stage_report("Corte: NO CHANGES")]) as generate:
+            assert daemon.run_revalidation(now + timedelta(seconds=15)) == 0
+
+        assert generate.call_args[1]["compared_fingerprints"] == {("default", "Corte"): "3f2a9c1e"}
+        assert daemon._stale_fingerprints == {}
+
+    def test_clients_are_reused(self, tmp_path):
+        daemon = make_daemon(tmp_path)
+        route = daemon.registry.get("default")
+
+        with patch("notification.email_client.EmailClient") as email_client, \
+             patch("notification.modular_sms_client.ModularSmsClient", side_effect=ValueError("disabled")):
+            first = daemon.notification_clients(route)
+            second = daemon.notification_clients(route)
+
+        assert first is second
+        assert first[1] is None
+        email_client.assert_called_once()
+
+
+class TestConfigReload:
+    """The daemon applies configuration changes of its config source."""
+
+    def test_changed_config_is_applied(self, tmp_path):
+        current = {"config": CONFIG}
+        daemon = ReportDaemon(CONFIG, state_dir=str(tmp_path), config_source=lambda: current["config"])
+        now = datetime(2025, 8, 1, 4, 0)
+        daemon.plan(now)
+        scheduler = daemon.schedulers["default"]
+        daemon._clients["default"] = (MagicMock(), None)
+
+        assert not daemon.refresh_config(now)
+        assert "default" in daemon._clients
+
+        current["config"] = dict(CONFIG, send_schedule={"morning_time": "05:00", "evening_time": "19:00"},
+                                 daemon={"dynamic_interval_min": 15}, sms={"mode": "production"})
+        assert daemon.refresh_config(now)
+
+        assert daemon.config["sms"] == {"mode": "production"}
+        assert daemon.registry.get("default").config["sms"] == {"mode": "production"}
+        assert daemon.schedulers["default"] is scheduler
+        assert scheduler.config["sms"] == {"mode": "production"}
+        assert daemon._clients == {}
+        assert daemon.intervals["dynamic"] == timedelta(minutes=15)
+        assert daemon.next_run["morning"] == datetime(2025, 8, 1, 5, 0)
+        assert daemon.next_run["evening"] == datetime(2025, 8, 1, 19, 0)
+
+    def test_new_route_gets_delivery_workers(self, tmp_path):
+        current = {"config": CONFIG}
+        daemon = ReportDaemon(CONFIG, state_dir=str(tmp_path), config_source=lambda: current["config"])
+        dispatcher = daemon.dispatcher
+        dispatcher.start()
+        try:
+            current["config"] = dict(CONFIG, routes=[{"name": "default", "etappen": "etappen.json"},
+                                                     {"name": "GR5", "etappen": "gr5.json"}])
+            assert daemon.refresh_config(datetime(2025, 8, 1, 4, 0))
+
+            assert daemon.dispatcher is dispatcher
+            assert set(dispatcher.senders) == {"email", "sms", "email:GR5", "sms:GR5"}
+            assert "outbox-sms:GR5" in [worker.name for worker in dispatcher._workers]
+        finally:
+            dispatcher.stop(timeout=5)
+
+    def test_failing_source_keeps_config(self, tmp_path):
+        daemon = ReportDaemon(CONFIG, state_dir=str(tmp_path), config_source=MagicMock(side_effect=KeyError("x")))
+
+        assert not daemon.refresh_config(datetime(2025, 8, 1, 4, 0))
+        assert daemon.config is CONFIG
+
+
+class TestDaemonLoop:
+    """Test cases for the asyncio loop and shutdown."""
+
+    def test_sigterm_stops_after_running_job(self, tmp_path):
+        config = dict(CONFIG, daemon={"dynamic_interval_min": 0.001, "fire_interval_min": 60})
+        daemon = make_daemon(tmp_path, config)
+        finished = []
+
+        def run_job(job, now):
+            os.kill(os.getpid(), signal.SIGTERM)
+            finished.append(job)
+            return 0
+
+        with patch.object(daemon, "run_job", side_effect=run_job):
+            asyncio.run(asyncio.wait_for(daemon.run(), timeout=5))
+
+        assert finished == ["dynamic"]
+
+    def test_stop_before_start(self, tmp_path):
+        daemon = make_daemon(tmp_path)
+        daemon.stop()
+
+        with patch.object(daemon, "run_job") as run_job:
+            asyncio.run(asyncio.wait_for(daemon.run(), timeout=5))
+
+        run_job.assert_not_called()
@@ -0,0 +1,101 @@
+"""
+Tests for time-budgeted report generation.
+"""
+
+import time
+from contextlib import ExitStack
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.weather.core.deadline import Deadline, DeadlineExceeded
+from src.weather.core.morning_evening_refactor import MorningEveningRefactor, WeatherThresholdData
+
+
+SECTIONS = ['night', 'day', 'rain_mm', 'rain_percent', 'wind', 'gust',
+            'thunderstorm', 'thunderstorm_plus_one', 'risks', 'risk_zonal']
+
+
+class TestDeadline:
+    """Test cases for Deadline."""
+
+    def test_unlimited_calls_directly(self):
+        deadline = Deadline()
+
+        assert deadline.remaining() is None
+        assert not deadline.expired()
+        assert deadline.call(lambda x: x * 2, 21) == 42
+
+    def test_slow_call_is_abandoned(self):
+        deadline = Deadline(0.1)
+        started = time.monotonic()
+
+        with pytest.raises(DeadlineExceeded):
+            deadline.call(time.sleep, 2)
+
+        assert time.monotonic() - started < 1
+        assert deadline.expired()
+        with pytest.raises(DeadlineExceeded):
+            deadline.call(lambda: 1)
+
+    def test_errors_are_propagated(self):
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            Deadline(5).call(fail)
+
+
+class TestTimeBudgetedReport:
+    """Sections not finished within the budget are cut."""
+
+    def generate(self, tmp_path, slow_section, time_budget):
+        refactor = MorningEveningRefactor({})
+        refactor.data_dir = str(tmp_path)
+
+        def fast(*args):
+            data = WeatherThresholdData(threshold_value=5, threshold_time="12", max_value=5, max_time="12")
+            data.debug_info = {}
+            return data
+
+        def slow(*args):
+            time.sleep(1)
+            return fast()
+
+        with ExitStack() as stack:
+            stack.enter_context(patch.object(refactor, 'fetch_weather_data', return_value={'hourly_data': []}))
+            stack.enter_context(patch.object(refactor, '_prefetch_vigilance'))
+            stack.enter_context(patch.object(refactor, '_prefetch_fire_risk'))
+            for section in SECTIONS:
+                processor = slow if section == slow_section else fast
+                stack.enter_context(patch.object(refactor, f'process_{section}_data', side_effect=processor))
+            return refactor.generate_report('Corte', 'morning', '2025-08-01', time_budget=time_budget)
+
+    def test_unfinished_section_is_cut(self, tmp_path):
+        started = time.monotonic()
+        result, debug = self.generate(tmp_path, 'wind', 0.3)
+
+        assert time.monotonic() - started < 1
+        assert result.startswith("Corte: N5 D5 R5@12 PR5%@12 W- G5@12")
+        assert "abgeschnittene Abschnitte: wind\n" in debug
+
+    def test_no_cut_within_budget(self, tmp_path):
+        result, debug = self.generate(tmp_path, None, 5)
+
+        assert "W5@12" in result
+        assert "Zeitbudget" not in debug
+
+    def test_budget_from_config(self, tmp_path):
+        refactor = MorningEveningRefactor({'report_time_budget_seconds': {'morning': 90, 'evening': 300}})
+
+        assert refactor._time_budget('morning') == 90
+        assert refactor._time_budget('dynamic') is None
+        assert MorningEveningRefactor({'report_time_budget_seconds': 60})._time_budget('evening') == 60
+
+    def test_stuck_forecast_point_is_skipped(self):
+        refactor = MorningEveningRefactor({})
+        refactor.deadline = Deadline(0.2)
+        client = MagicMock()
+        client.get_forecast.side_effect = lambda lat, lon: time.sleep(1)
+
+        assert refactor._get_forecast(client, 42.0, 9.0) is None
@@ -0,0 +1,110 @@
+"""
+Tests for the budgeted report encoder.
+"""
+
+from datetime import date
+
+from src.weather.core.morning_evening_refactor import (MorningEveningRefactor, WeatherReportData,
+                                                        WeatherThresholdData)
+from src.weather.core.report_encoder import encode_for_budget
+
+
+def make_report(stage_name="Refuge d'Ortu di u Piobbu"):
+    risk_zonal = WeatherThresholdData()
+    risk_zonal.debug_info = {'risk_block': 'HIGH201,204 MAX208'}
+    risks = WeatherThresholdData()
+    risks.debug_info = {'hrain_threshold_value': 20, 'hrain_max_value': 35, 'storm_threshold_value': None}
+    return WeatherReportData(
+        stage_name=stage_name,
+        report_date=date(2025, 8, 1),
+        report_type='morning',
+        night=WeatherThresholdData(8.0),
+        day=WeatherThresholdData(24.0),
+        rain_mm=WeatherThresholdData(0.2, '6', 1.4, '6'),
+        rain_percent=WeatherThresholdData(20, '11', 60, '15'),
+        wind=WeatherThresholdData(12.4, '10', 25.0, '14'),
+        gust=WeatherThresholdData(20.0, '11', 45.0, '16'),
+        thunderstorm=WeatherThresholdData('low', '12', 'high', '16'),
+        thunderstorm_plus_one=WeatherThresholdData('med', '13', 'high', '15'),
+        risks=risks,
+        risk_zonal=risk_zonal,
+    )
+
+
+class TestEncodeForBudget:
+    """Test cases for encode_for_budget."""
+
+    def test_fitting_report_is_not_compressed(self):
+        encoded = encode_for_budget(make_report("Corte"), 200)
+
+        assert encoded.fits
+        assert encoded.compressed == {}
+        assert encoded.text.startswith("Corte: N8.0 D24.0 R0.2@6(1.4@6) PR20%@11(60%@15)")
+        assert encoded.text.endswith("Z:HIGH201,204 MAX208")
+
+    def test_lossless_steps_come_first(self):
+        encoded = encode_for_budget(make_report(), 150)
+
+        assert encoded.fits
+        assert not encoded.lossy
+        assert "R.2(1.4)@6" in encoded.text
+        assert "W12.4@10(25@14)" in encoded.text
+        assert encoded.compressed['rain_mm'] == ['merge_hours', 'leading_zero']
+        assert encoded.compressed['layout'] == ['omit_empty', 'no_separator']
+
+    def test_lossy_steps_keep_rain_decimals(self):
+        encoded = encode_for_budget(make_report(), 100)
+
+        assert encoded.fits
+        assert encoded.lossy
+        assert encoded.text.startswith("Refu:")
+        assert "R.2(1.4)@6" in encoded.text
+        assert "W12@10G20@11" in encoded.text
+        assert 'drop_max' in encoded.compressed['gust']
+        assert 'risk_zonal' not in encoded.compressed
+
+    def test_budget_is_always_respected(self):
+        for budget in (80, 60, 45, 30, 10):
+            encoded = encode_for_budget(make_report(), budget)
+            assert encoded.fits, budget
+            assert encoded.septets <= budget
+
+    def test_values_missing_from_report_data_are_recorded(self):
+        report = make_report("Corte")
+        report.wind = WeatherThresholdData()
+        original = "Corte: N8 D24 R0.2@6(1.4@6) PR20%@11(60%@15) W10@10(25@14) G20@11(45@16) TH:L@12(H@16)"
+
+        encoded = encode_for_budget(report, 200, original=original)
+
+        assert "W-" in encoded.text
+        assert encoded.compressed == {'wind': ['drop_field']}
+        assert encoded.lossy
+
+    def test_extension_characters_count_twice(self):
+        report = make_report("Col [Bocca] ~ Foggiale")
+
+        encoded = encode_for_budget(report, 200)
+
+        assert encoded.septets == len(encoded.text) + 3
+
+
+class TestResultOutputBudget:
+    """The standard result output is re-encoded when over the configured budget."""
+
+    def test_over_budget_output_is_encoded(self):
+        refactor = MorningEveningRefactor({'result_output_budget': 60})
+        report = make_report()
+        long_text = "x" * 120
+
+        result = refactor._fit_budget(report, long_text)
+
+        assert len(result) <= 60
+        assert result.startswith("Refu:")
+        assert 'layout' in report.debug_info['result_output_compression']
+
+    def test_fitting_output_is_unchanged(self):
+        refactor = MorningEveningRefactor({})
+        report = make_report()
+
+        assert refactor._fit_budget(report, "Corte: N8 D24") == "Corte: N8 D24"
+        assert 'result_output_compression' not in report.debug_info
@@ -0,0 +1,73 @@
+"""
+Tests for the append-only report history store.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from src.logic.report_store import ReportStore, REPORT_STORE_FILENAME
+from src.logic.dynamic_report_comparator import DynamicReportComparator
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ReportStore(str(tmp_path / REPORT_STORE_FILENAME))
+
+
+def report(wind):
+    """Create minimal report data."""
+    return {'stage_name': 'Corte', 'wind': {'max_value': wind, 'max_time': '14'}}
+
+
+class TestReportStore:
+    """Test cases for ReportStore."""
+
+    def test_missing_database_returns_nothing(self, store):
+        assert store.last_sent('Corte', date(2025, 8, 1)) is None
+        assert store.history() == []
+
+    def test_last_sent_returns_latest_sent_report(self, store):
+        store.append('Corte', date(2025, 8, 1), 'morning', report(10))
+        store.append('Corte', date(2025, 8, 1), 'dynamic', report(20))
+        store.append('Corte', date(2025, 8, 1), 'dynamic', report(30), sent=False)
+        store.append('Vizzavona', date(2025, 8, 1), 'morning', report(40))
+
+        assert store.last_sent('Corte', date(2025, 8, 1))['wind']['max_value'] == 20
+        assert store.last_sent('Corte', '2025-08-01')['wind']['max_value'] == 20
+        assert store.last_sent('Corte', date(2025, 8, 2)) is None
+
+    def test_history_keeps_every_report(self, store):
+        store.append('Corte', date(2025, 8, 1), 'morning', report(10), generated_at=datetime(2025, 8, 1, 4))
+        store.append('Corte', date(2025, 8, 1), 'dynamic', report(20), sent=False)
+        store.append('Corte', date(2025, 8, 2), 'evening', report(30))
+
+        history = store.history('Corte')
+        assert [entry['report_type'] for entry in history] == ['morning', 'dynamic', 'evening']
+        assert history[0]['generated_at'] == datetime(2025, 8, 1, 4).isoformat()
+        assert len(store.history('Corte', start_date=date(2025, 8, 2))) == 1
+        assert len(store.history('Corte', report_type='dynamic')) == 1
+        assert len(store.history('Corte', sent_only=True)) == 2
+
+    def test_element_trend(self, store):
+        for wind in (10, 25, 15):
+            store.append('Corte', date(2025, 8, 1), 'dynamic', report(wind))
+
+        trend = store.element_trend('Corte', 'wind')
+        assert [point['value'] for point in trend] == [10, 25, 15]
+
+
+class TestComparatorWithStore:
+    """The comparator reads the last report from the store first."""
+
+    def test_store_is_preferred_over_json_file(self, tmp_path):
+        comparator = DynamicReportComparator({'delta_thresholds': {}})
+        comparator.data_dir = str(tmp_path)
+        day_dir = tmp_path / "2025-08-01"
+        day_dir.mkdir()
+        (day_dir / "Corte.json").write_text('{"wind": {"max_value": 5}}')
+
+        assert comparator.load_last_report('Corte', date(2025, 8, 1))['wind']['max_value'] == 5
+
+        ReportStore(str(tmp_path / REPORT_STORE_FILENAME)).append('Corte', date(2025, 8, 1), 'dynamic', report(20))
+        assert comparator.load_last_report('Corte', date(2025, 8, 1))['wind']['max_value'] == 20
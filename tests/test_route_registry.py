@@ -0,0 +1,142 @@
+"""
+Tests for the multi-route registry and the shared route report run.
+"""
+
+import json
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.position.route_registry import RouteRegistry, merge_config
+from src.report.batch_report_generator import generate_route_reports
+from src.weather.core.forecast_snapshot import ForecastSnapshot
+from fire.risk_block_formatter import load_fire_risk_data, shared_fire_risk_data
+
+
+GENERATE_REPORT = "src.report.batch_report_generator.MorningEveningRefactor.generate_report"
+
+BASE_CONFIG = {
+    "startdatum": "2025-08-01",
+    "thresholds": {"rain_amount": 0.5, "wind_speed": 20.0},
+    "smtp": {"host": "smtp.example.com", "to": "gr20@example.com"},
+}
+
+
+@pytest.fixture
+def route_dir(tmp_path):
+    gr20 = [
+        {"name": "Calenzana", "punkte": [{"lat": 42.5081, "lon": 8.8553}]},
+        {"name": "Ortu", "punkte": [{"lat": 42.4701, "lon": 8.9093}]},
+    ]
+    hermannsweg = [
+        {"name": "Stieghorst", "punkte": [{"lat": 42.4702, "lon": 8.9091}]},
+        {"name": "Hiddesen", "punkte": [{"lat": 51.9300, "lon": 8.8100}]},
+    ]
+    (tmp_path / "etappen.json.GR20").write_text(json.dumps(gr20), encoding="utf-8")
+    (tmp_path / "etappen.json.hermannsweg").write_text(json.dumps(hermannsweg), encoding="utf-8")
+    return tmp_path
+
+
+def routes_config():
+    return dict(BASE_CONFIG, routes=[
+        {"name": "GR20", "etappen": "etappen.json.GR20"},
+        {"name": "Hermannsweg", "etappen": "etappen.json.hermannsweg", "startdatum": "2025-08-02",
+         "smtp": {"to": "hermann@example.com"}, "thresholds": {"rain_amount": 1.0}},
+    ])
+
+
+class TestRouteRegistry:
+    """Test cases for RouteRegistry."""
+
+    def test_merge_config_is_deep_and_copies(self):
+        merged = merge_config(BASE_CONFIG, {"thresholds": {"rain_amount": 1.0}})
+
+        assert merged["thresholds"] == {"rain_amount": 1.0, "wind_speed": 20.0}
+        assert BASE_CONFIG["thresholds"]["rain_amount"] == 0.5
+
+    def test_without_routes_section(self, tmp_path):
+        registry = RouteRegistry.from_config(BASE_CONFIG, str(tmp_path))
+
+        assert len(registry) == 1
+        route = next(iter(registry))
+        assert route.etappen_path == str(tmp_path / "etappen.json")
+        assert route.config == BASE_CONFIG
+
+    def test_routes_override_base_config(self, route_dir):
+        registry = RouteRegistry.from_config(routes_config(), str(route_dir))
+
+        gr20, hermannsweg = registry.get("GR20"), registry.get("Hermannsweg")
+        assert gr20.config["startdatum"] == "2025-08-01"
+        assert hermannsweg.config["startdatum"] == "2025-08-02"
+        assert hermannsweg.config["smtp"] == {"host": "smtp.example.com", "to": "hermann@example.com"}
+        assert hermannsweg.config["thresholds"]["rain_amount"] == 1.0
+        assert "routes" not in gr20.config
+        assert hermannsweg.etappen_path == str(route_dir / "etappen.json.hermannsweg")
+
+    def test_invalid_entries(self):
+        with pytest.raises(ValueError):
+            RouteRegistry.from_config({"routes": [{"name": "GR20"}]})
+        with pytest.raises(ValueError):
+            RouteRegistry.from_config({"routes": [{"name": "A", "etappen": "x"}, {"name": "A", "etappen": "y"}]})
+
+    def test_stage_offset(self, route_dir):
+        route = RouteRegistry.from_config(routes_config(), str(route_dir)).get("GR20")
+
+        assert route.stage_offset(date(2025, 7, 31)) is None
+        assert route.stage_offset(date(2025, 8, 2)) == 1
+        assert route.stage_offset(date(2025, 8, 3)) is None
+
+
+class TestRouteReports:
+    """Test cases for generate_route_reports."""
+
+    def test_all_routes_in_one_run(self, route_dir):
+        registry = RouteRegistry.from_config(routes_config(), str(route_dir))
+        client = MagicMock()
+        seen = {}
+
+        def fake_generate(refactor, stage_name, report_type, target_date, compared_fingerprint=None, render_debug=True):
+            seen[stage_name] = (refactor.etappen_path, refactor.config["startdatum"],
+                                refactor.config["thresholds"]["rain_amount"], refactor.forecast_client)
+            return f"{stage_name}: morning", ""
+
+        snapshot = ForecastSnapshot(client, precision=2)
+        with patch(GENERATE_REPORT, fake_generate):
+            reports = generate_route_reports(registry, "morning", date(2025, 8, 2), snapshot=snapshot)
+
+        assert [(r.route, r.stage_name, r.success) for r in reports] == [
+            ("GR20", "Ortu", True),
+            ("Hermannsweg", "Stieghorst", True),
+        ]
+        assert seen["Ortu"][:3] == (str(route_dir / "etappen.json.GR20"), "2025-08-01", 0.5)
+        assert seen["Stieghorst"][:3] == (str(route_dir / "etappen.json.hermannsweg"), "2025-08-02", 1.0)
+        assert seen["Ortu"][3] is seen["Stieghorst"][3] is snapshot
+        # Stieghorst shares the grid cell of Ortu, Hiddesen is prefetched for the evening section
+        assert client.get_forecast.call_count == 2
+
+    def test_finished_route_is_skipped(self, route_dir):
+        registry = RouteRegistry.from_config(routes_config(), str(route_dir))
+
+        with patch(GENERATE_REPORT, return_value=("Hiddesen: morning", "")):
+            reports = generate_route_reports(registry, "morning", date(2025, 8, 3),
+                                             snapshot=ForecastSnapshot(MagicMock()))
+
+        assert [r.route for r in reports] == ["Hermannsweg"]
+
+
+class TestSharedFireRiskData:
+    """The daily fire risk dataset is downloaded once inside a shared block."""
+
+    def test_dataset_shared_inside_block(self):
+        response = MagicMock()
+        response.json.return_value = {"zm": {"208": 3}}
+
+        with patch("fire.risk_block_formatter.requests.get", return_value=response) as get:
+            with shared_fire_risk_data():
+                assert load_fire_risk_data("20250801") == {"zm": {"208": 3}}
+                load_fire_risk_data("20250801")
+            assert get.call_count == 1
+
+            load_fire_risk_data("20250801")
+            assert get.call_count == 2
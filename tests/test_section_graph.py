@@ -0,0 +1,108 @@
+"""
+Tests for the report section dependency graph.
+"""
+
+import threading
+import time
+from datetime import date
+
+import pytest
+
+from src.weather.core.deadline import Deadline
+from src.weather.core.morning_evening_refactor import REPORT_SECTIONS, MorningEveningRefactor
+from src.weather.core.section_graph import SectionGraph, SectionNode
+
+
+def sleeper(seconds, value=None):
+    def func(inputs):
+        time.sleep(seconds)
+        return value
+    return func
+
+
+class TestSectionGraph:
+    """Test cases for SectionGraph."""
+
+    def test_independent_nodes_run_concurrently(self):
+        graph = SectionGraph([SectionNode(name, sleeper(0.2, name)) for name in ("a", "b", "c")])
+        started = time.perf_counter()
+
+        run = graph.run(max_workers=3)
+
+        assert time.perf_counter() - started < 0.5
+        assert run.results == {"a": "a", "b": "b", "c": "c"}
+        assert set(run.timings) == {"a", "b", "c"}
+        assert all(seconds >= 0.2 for seconds in run.timings.values())
+
+    def test_upstream_runs_once_before_dependents(self):
+        calls = []
+        lock = threading.Lock()
+
+        def upstream(inputs):
+            with lock:
+                calls.append("upstream")
+            return 10
+
+        def dependent(name):
+            def func(inputs):
+                with lock:
+                    calls.append(name)
+                return inputs["upstream"] + inputs["forecast"]
+            return func
+
+        graph = SectionGraph([
+            SectionNode("upstream", upstream),
+            SectionNode("x", dependent("x"), ("upstream", "forecast")),
+            SectionNode("y", dependent("y"), ("upstream", "forecast")),
+        ])
+        run = graph.run({"forecast": 1})
+
+        assert calls[0] == "upstream" and sorted(calls[1:]) == ["x", "y"]
+        assert run.results["x"] == run.results["y"] == 11
+
+    def test_failed_node_yields_none(self):
+        def fail(inputs):
+            raise RuntimeError("boom")
+
+        graph = SectionGraph([
+            SectionNode("upstream", fail),
+            SectionNode("section", lambda inputs: inputs["upstream"] is None, ("upstream",)),
+        ])
+        run = graph.run()
+
+        assert run.errors == {"upstream": "boom"}
+        assert run.results["section"] is True
+
+    def test_deadline_cuts_unfinished_nodes(self):
+        graph = SectionGraph([
+            SectionNode("fast", sleeper(0, "ok")),
+            SectionNode("slow", sleeper(1)),
+            SectionNode("after_slow", sleeper(0), ("slow",)),
+        ])
+        started = time.perf_counter()
+
+        run = graph.run(deadline=Deadline(0.2))
+
+        assert time.perf_counter() - started < 0.8
+        assert run.results == {"fast": "ok"}
+        assert run.cut == ["slow", "after_slow"]
+
+    def test_invalid_graphs(self):
+        with pytest.raises(ValueError):
+            SectionGraph([SectionNode("a", sleeper(0), ("b",)), SectionNode("b", sleeper(0), ("a",))])
+        with pytest.raises(ValueError):
+            SectionGraph([SectionNode("a", sleeper(0)), SectionNode("a", sleeper(0))])
+        with pytest.raises(ValueError):
+            SectionGraph([SectionNode("a", sleeper(0), ("missing",))]).run()
+
+
+class TestReportSectionGraph:
+    """The report declares the upstreams of every section."""
+
+    def test_section_dependencies(self):
+        graph = MorningEveningRefactor({})._section_graph("Corte", date(2025, 8, 1), "morning")
+
+        assert set(graph.nodes) == set(REPORT_SECTIONS) | {"vigilance", "fire_risk"}
+        assert graph.nodes["night"].deps == ("forecast",)
+        assert graph.nodes["risks"].deps == ("forecast", "vigilance")
+        assert graph.nodes["risk_zonal"].deps == ("forecast", "fire_risk")
@@ -201,4 +201,24 @@ class TestSevenProvider:
             call_args = mock_post.call_args
             data = call_args[1]['data']
             assert len(data['text']) == 160
-            assert data['text'] == "A" * 160 
\ No newline at end of file
+            assert data['text'] == "A" * 160     
+    @patch('src.notification.providers.seven_provider.requests.post')
+    def test_send_bulk_single_request(self, mock_post):
+        """Test that several recipients are sent in one request."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "success": "100",
+            "messages": [
+                {"recipient": "49123456789", "success": True},
+                {"recipient": "49987654321", "success": False, "error_text": "Invalid recipient"}
+            ]
+        }
+        mock_post.return_value = mock_response
+        
+        provider = SevenProvider({"api_key": "test_api_key", "from": "GR20-Info"})
+        result = provider.send_bulk(["+49123456789", "+49987654321"], "Test message")
+        
+        assert result == {"+49123456789": True, "+49987654321": False}
+        mock_post.assert_called_once()
+        assert mock_post.call_args[1]['data']['to'] == "+49123456789,+49987654321"
@@ -12,6 +12,7 @@ import yaml
 from datetime import datetime
 from unittest.mock import patch, mock_open
 from src.config.sms_config_processor import SMSConfigProcessor
+from src.utils.file_lock import atomic_write_text
 
 
 class TestSMSConfigProcessor:
@@ -301,4 +302,81 @@ max_daily_reports: 3
         assert results[0]["success"] is True
         assert results[1]["success"] is False
         assert results[2]["success"] is False
-        assert results[3]["success"] is True 
\ No newline at end of file
+        assert results[3]["success"] is True 
+
+CONFIG_YAML = """# Start date of the tour
+startdatum: '2025-07-07'
+
+# Weather thresholds
+thresholds:
+  temperature: 30.0  # Maximum temperature in Celsius
+  wind_speed: 20.0
+
+smtp:
+  host: smtp.gmail.com
+  port: 587
+  user: test@example.com
+  to: test@example.com
+"""
+
+
+class TestConfigTransaction:
+    """Test cases for coalesced configuration writes."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.temp_dir, "config.yaml")
+        with open(self.config_file, "w") as f:
+            f.write(CONFIG_YAML)
+
+    def teardown_method(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @patch.object(SMSConfigProcessor, "_log_config_update")
+    def test_commands_are_written_once(self, mock_log):
+        processor = SMSConfigProcessor(self.config_file)
+
+        with patch("src.config.config_preserver.atomic_write_text", wraps=atomic_write_text) as mock_write:
+            with processor.transaction():
+                first = processor.process_sms_command("### thresholds.temperature: 25.0")
+                processor.process_sms_command("### thresholds.wind_speed: 35")
+                processor.process_sms_command("### startdatum: 2025-08-01")
+                processor.process_sms_command("### thresholds.temperature: 27.5")
+                assert mock_write.call_count == 0
+
+        assert first["message"] == "Configuration update queued"
+        assert mock_write.call_count == 1
+        assert mock_log.call_count == 3
+        with open(self.config_file) as f:
+            content = f.read()
+        assert "# Maximum temperature in Celsius" in content
+        config = yaml.safe_load(content)
+        assert config["thresholds"]["temperature"] == 27.5
+        assert config["thresholds"]["wind_speed"] == 35.0
+        assert str(config["startdatum"]) == "2025-08-01"
+
+    @patch.object(SMSConfigProcessor, "_log_config_update")
+    def test_commit_invalidates_config_cache(self, mock_log, monkeypatch):
+        from src.config.config_loader import load_config_cached
+        monkeypatch.setenv("GMAIL_APP_PW", "test_password")
+        processor = SMSConfigProcessor(self.config_file)
+        assert load_config_cached(self.config_file)["thresholds"]["temperature"] == 30.0
+
+        with processor.transaction():
+            processor.process_sms_command("### thresholds.temperature: 25.0")
+            assert load_config_cached(self.config_file)["thresholds"]["temperature"] == 30.0
+
+        assert load_config_cached(self.config_file)["thresholds"]["temperature"] == 25.0
+
+    @patch.object(SMSConfigProcessor, "_log_config_update")
+    def test_failed_write_leaves_file_unchanged(self, mock_log):
+        processor = SMSConfigProcessor(self.config_file)
+
+        with patch("src.config.config_preserver.atomic_write_text", side_effect=OSError("disk full")):
+            with processor.transaction():
+                processor.process_sms_command("### thresholds.temperature: 25.0")
+
+        with open(self.config_file) as f:
+            assert f.read() == CONFIG_YAML
+        mock_log.assert_called_once_with("thresholds.temperature", 25.0, False, "Failed to update configuration file")
@@ -6,6 +6,7 @@ This module tests the SMS polling functionality, including message filtering
 and ID comparison logic.
 """
 
+import asyncio
 import pytest
 import tempfile
 import os
@@ -15,7 +16,7 @@ from unittest.mock import Mock, patch
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.notification.sms_polling_client import SMSPollingClient
+from src.notification.sms_polling_client import AdaptivePollInterval, SMSPollingClient
 
 
 class TestSMSPollingClient:
@@ -117,4 +118,59 @@ class TestSMSPollingClient:
         assert not self.client._is_configuration_command("sms.enabled: true")
         assert not self.client._is_configuration_command("###")  # No key-value
         assert not self.client._is_configuration_command("Hello world")
-        assert not self.client._is_configuration_command("") 
\ No newline at end of file
+        assert not self.client._is_configuration_command("")     
+    def test_fetch_uses_date_cursor(self):
+        """Test that only messages since the last processed date are requested."""
+        self.client.last_processed_date = "2025-08-01"
+        response = Mock(status_code=200, content=b"[]")
+        response.json.return_value = [{"id": "4795954", "text": "### sms.enabled: true"}]
+        
+        with patch.object(self.client.session, "get", return_value=response) as mock_get:
+            messages = self.client._fetch_incoming_messages()
+        
+        assert messages == [{"id": "4795954", "text": "### sms.enabled: true"}]
+        params = mock_get.call_args[1]["params"]
+        assert params["date_from"] == "2025-08-01"
+        assert params["limit"] == self.client.page_limit
+    
+    def test_poll_advances_id_and_date_cursor(self):
+        """Test that the ID and date cursors follow the newest processed message."""
+        self.client.last_processed_id = "4795950"
+        messages = [
+            {"id": "4795950", "text": "old", "timestamp": "2025-07-31 20:00:00"},
+            {"id": "4795954", "text": "hello", "timestamp": "2025-08-01 07:12:00"},
+        ]
+        
+        with patch.object(self.client, "_fetch_incoming_messages", return_value=messages), \
+                patch.object(self.client, "_log_message_reception"):
+            result = self.client.poll_incoming_sms()
+        
+        assert result["success"]
+        assert self.client.last_processed_id == "4795954"
+        assert self.client.last_processed_date == "2025-08-01"
+        assert self.client._load_last_processed_date() == "2025-08-01"
+    
+    def test_adaptive_interval(self):
+        """Test that the interval resets on activity and grows while idle."""
+        interval = AdaptivePollInterval(min_interval=5, max_interval=30)
+        
+        assert [interval.next(False) for _ in range(4)] == [10, 20, 30, 30]
+        assert interval.next(True) == 5
+    
+    def test_run_forever_stops_on_event(self):
+        """Test the long-running mode polls until the stop event is set."""
+        async def run():
+            stop = asyncio.Event()
+            calls = []
+            
+            def poll():
+                calls.append(1)
+                if len(calls) == 3:
+                    stop.set()
+                return {"success": True, "messages_found": 1, "commands_processed": 1, "message": ""}
+            
+            with patch.object(self.client, "poll_incoming_sms", side_effect=poll):
+                await asyncio.wait_for(self.client.run_forever(stop, min_interval=0.01, max_interval=0.05), 5)
+            return len(calls)
+        
+        assert asyncio.run(run()) == 3
@@ -0,0 +1,98 @@
+"""
+Tests for the reusable SMTP session and EmailClient.send_many.
+"""
+
+import smtplib
+from unittest.mock import MagicMock, patch
+
+from src.notification.email_client import EmailClient
+from src.notification.smtp_session import SmtpSession
+
+
+CONFIG = {
+    "smtp": {
+        "host": "smtp.gmail.com",
+        "port": 587,
+        "user": "test@example.com",
+        "to": "recipient@example.com",
+        "password": "test_password"
+    }
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSmtpSession:
+    """Test cases for SmtpSession."""
+
+    @patch("smtplib.SMTP")
+    def test_default_closes_after_each_send(self, mock_smtp):
+        session = SmtpSession("smtp.gmail.com", 587, "user", "pw")
+
+        session.send("user", "to", "m1")
+        session.send("user", "to", "m2")
+
+        assert session.connect_count == 2
+        assert mock_smtp.return_value.quit.call_count == 2
+        assert not session.connected
+
+    @patch("smtplib.SMTP")
+    def test_connection_reused_within_idle_timeout(self, mock_smtp):
+        clock = FakeClock()
+        session = SmtpSession("smtp.gmail.com", 587, "user", "pw", idle_timeout=60, clock=clock)
+
+        session.send("user", "to", "m1")
+        clock.now = 30
+        session.send("user", "to", "m2")
+        assert session.connect_count == 1
+        mock_smtp.return_value.login.assert_called_once_with("user", "pw")
+
+        clock.now = 100
+        session.send("user", "to", "m3")
+        assert session.connect_count == 2
+
+        session.close()
+        assert not session.connected
+
+    @patch("smtplib.SMTP")
+    def test_dropped_connection_is_reconnected(self, mock_smtp):
+        first, second = MagicMock(), MagicMock()
+        mock_smtp.side_effect = [first, second]
+        first.sendmail.side_effect = [None, smtplib.SMTPServerDisconnected("gone")]
+        session = SmtpSession("smtp.gmail.com", 587, "user", "pw", idle_timeout=60)
+
+        session.send("user", "to", "m1")
+        session.send("user", "to", "m2")
+
+        assert session.connect_count == 2
+        second.sendmail.assert_called_once_with("user", "to", "m2")
+        session.close()
+
+
+class TestSendMany:
+    """Test cases for EmailClient.send_many."""
+
+    @patch("src.notification.smtp_session.smtplib.SMTP")
+    def test_batch_uses_one_connection(self, mock_smtp):
+        client = EmailClient(CONFIG)
+
+        results = client.send_many([("Report 1", "Etappe 1"), ("Report 2", None), ("Report 3", "Etappe 3")])
+
+        assert results == [True, True, True]
+        mock_smtp.assert_called_once_with("smtp.gmail.com", 587)
+        mock_smtp.return_value.login.assert_called_once()
+        assert mock_smtp.return_value.sendmail.call_count == 3
+        mock_smtp.return_value.quit.assert_called_once()
+
+    @patch("src.notification.smtp_session.smtplib.SMTP")
+    def test_failed_mail_does_not_stop_batch(self, mock_smtp):
+        mock_smtp.return_value.sendmail.side_effect = [smtplib.SMTPRecipientsRefused({}), None]
+        client = EmailClient(CONFIG)
+
+        assert client.send_many([("Report 1", None), ("Report 2", None)]) == [False, True]
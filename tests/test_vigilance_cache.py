@@ -0,0 +1,148 @@
+"""
+Unit tests for the department-level vigilance cache.
+"""
+
+import json
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from src.wetter.vigilance_cache import VigilanceCache, KIND_CURRENT
+
+
+def make_response(status_code, payload=None, headers=None):
+    """Create a fake HTTP response."""
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    response.headers = headers or {}
+    return response
+
+
+class FakeSession(requests.Session):
+    """Session returning canned responses and recording requests."""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, method, path, *args, **kwargs):
+        self.calls.append((path, kwargs.get('params'), kwargs.get('headers')))
+        return self.responses.pop(0)
+
+
+class FakeClient:
+    """Minimal MeteoFranceClient replacement exposing a session."""
+
+    def __init__(self, session):
+        self.session = session
+
+
+class Clock:
+    """Settable clock for freshness tests."""
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def bulletin(update_time, end_validity_time=None):
+    """Create a current phenomenons payload."""
+    return {
+        'update_time': update_time,
+        'end_validity_time': end_validity_time or int(datetime(2030, 1, 1).timestamp()),
+        'domain_id': '2A',
+        'phenomenons_max_colors': [{'phenomenon_id': '3', 'phenomenon_max_color_id': 2}],
+    }
+
+
+class TestVigilanceCache:
+    """Test cases for VigilanceCache."""
+
+    def test_fetches_department_once_per_bulletin(self, tmp_path):
+        """Repeated lookups between two bulletin times hit the API once."""
+        clock = Clock(datetime(2025, 8, 1, 7, 0))
+        session = FakeSession([make_response(200, bulletin(1000))])
+        cache = VigilanceCache(cache_dir=str(tmp_path), clock=clock)
+
+        first = cache.get_current_phenomenons('2A', FakeClient(session))
+        clock.now = datetime(2025, 8, 1, 15, 59)
+        second = cache.get_current_phenomenons('2A', FakeClient(session))
+
+        assert len(session.calls) == 1
+        assert first.phenomenons_max_colors == second.phenomenons_max_colors
+        assert session.calls[0][1] == {'domain': '2A'}
+
+    def test_shared_between_processes(self, tmp_path):
+        """A second cache instance on the same directory reuses the entry."""
+        clock = Clock(datetime(2025, 8, 1, 7, 0))
+        session = FakeSession([make_response(200, bulletin(1000))])
+        VigilanceCache(cache_dir=str(tmp_path), clock=clock).get_current_phenomenons('2A', FakeClient(session))
+
+        other_session = FakeSession([])
+        other = VigilanceCache(cache_dir=str(tmp_path), clock=clock)
+        result = other.get_current_phenomenons('2A', FakeClient(other_session))
+
+        assert other_session.calls == []
+        assert result.update_time == 1000
+
+    def test_refresh_after_next_bulletin_uses_conditional_request(self, tmp_path):
+        """After the next bulletin time the entry is revalidated with its ETag."""
+        clock = Clock(datetime(2025, 8, 1, 7, 0))
+        session = FakeSession([
+            make_response(200, bulletin(1000), {'ETag': '"abc"'}),
+            make_response(304, None, {'ETag': '"abc"'}),
+        ])
+        cache = VigilanceCache(cache_dir=str(tmp_path), clock=clock)
+        cache.get_current_phenomenons('2A', FakeClient(session))
+
+        clock.now = datetime(2025, 8, 1, 16, 5)
+        result = cache.get_current_phenomenons('2A', FakeClient(session))
+
+        assert len(session.calls) == 2
+        assert session.calls[1][2] == {'If-None-Match': '"abc"'}
+        assert result.update_time == 1000
+
+        with open(tmp_path / f"{KIND_CURRENT}_2A.json") as f:
+            entry = json.load(f)
+        assert entry['fetched_at'] == datetime(2025, 8, 1, 16, 5).isoformat()
+
+    def test_expired_bulletin_is_refetched(self, tmp_path):
+        """An entry past its end of validity is not served."""
+        clock = Clock(datetime(2025, 8, 1, 7, 0))
+        expiry = int(datetime(2025, 8, 1, 8, 0).timestamp())
+        session = FakeSession([
+            make_response(200, bulletin(1000, expiry)),
+            make_response(200, bulletin(2000)),
+        ])
+        cache = VigilanceCache(cache_dir=str(tmp_path), clock=clock)
+        cache.get_current_phenomenons('2A', FakeClient(session))
+
+        clock.now = datetime(2025, 8, 1, 9, 0)
+        result = cache.get_current_phenomenons('2A', FakeClient(session))
+
+        assert len(session.calls) == 2
+        assert result.update_time == 2000
+
+    def test_client_without_session_is_not_cached(self, tmp_path):
+        """Clients without raw HTTP access are called directly."""
+        client = Mock(spec=['get_warning_current_phenomenons'])
+        client.get_warning_current_phenomenons.return_value = 'bulletin'
+        cache = VigilanceCache(cache_dir=str(tmp_path))
+
+        assert cache.get_current_phenomenons('2A', client) == 'bulletin'
+        assert cache.get_current_phenomenons('2A', client) == 'bulletin'
+        assert client.get_warning_current_phenomenons.call_count == 2
+
+    def test_missing_payload_without_entry_raises(self, tmp_path):
+        """A 304 without a cached entry cannot be served."""
+        session = FakeSession([make_response(304)])
+        cache = VigilanceCache(cache_dir=str(tmp_path))
+
+        with pytest.raises(RuntimeError):
+            cache.get_current_phenomenons('2A', FakeClient(session))